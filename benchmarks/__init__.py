@@ -0,0 +1,16 @@
+import time
+
+
+def measure(function, repeat=5):
+    """Return the best wall time in seconds of calling the function `repeat` times"""
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
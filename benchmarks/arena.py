@@ -0,0 +1,125 @@
+import json
+import os
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+from benchmarks import measure
+from benchmarks.ast_memory import generate_program
+from logo.arena import parse_arena, NODE_TYPES
+from logo.nodes import AstNode
+from logo.parse import DeclareFunction
+from logo.semantic import SemanticAnalyzer
+from tests.concurrency import generate_program as generate_valid_program
+
+# Parses the program in a fresh interpreter, so the peak RSS of each form is measured on its own
+PARSE_SCRIPT = """
+import gc
+import json
+import resource
+import time
+
+from benchmarks.ast_memory import generate_program
+from logo.arena import parse_arena
+from logo.parse import parse_source
+
+source = generate_program({statements})
+gc.collect()
+
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+collections = sum(generation['collections'] for generation in gc.get_stats())
+start = time.perf_counter()
+
+program = {function}(source)
+
+elapsed = time.perf_counter() - start
+collections = sum(generation['collections'] for generation in gc.get_stats()) - collections
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+gc.collect()
+start = time.perf_counter()
+gc.collect()
+full_collection = time.perf_counter() - start
+
+print(json.dumps([elapsed, peak, collections, len(gc.get_objects()), full_collection]))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(function: str, statements: int) -> list:
+    script = PARSE_SCRIPT.format(function=function, statements=statements)
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True, capture_output=True, text=True)
+
+    return json.loads(output.stdout)
+
+
+def count_by_views(program) -> list:
+    """Nodes of each kind found walking the views, as a pass written for node objects does"""
+    counts = [0] * len(NODE_TYPES)
+    kinds = {cls.__name__: kind for kind, cls in enumerate(NODE_TYPES)}
+    pending = [program]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, AstNode):
+            counts[kinds[type(value).__name__]] += 1
+
+        if isinstance(value, (list, AstNode)):
+            pending.extend(value)
+
+    return counts
+
+
+def count_by_index(arena) -> list:
+    """Nodes of each kind found walking the columns of the arena"""
+    counts = [0] * len(NODE_TYPES)
+    kinds = arena.kinds
+
+    for index in arena.walk():
+        counts[kinds[index]] += 1
+
+    return counts
+
+
+def analyze_views(arena):
+    """Analysis of the program walking the views"""
+    SemanticAnalyzer().visit(DeclareFunction('MAIN', None, arena.program))
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for statements in [100000, 300000]:
+        for name, function in [('objects', 'parse_source'), ('arena', 'parse_arena')]:
+            elapsed, peak, collections, objects, full_collection = run(function, statements)
+
+            rows.append([
+                statements, name, f"{elapsed:.2f}", f"{peak / 1024:.1f}", collections, objects,
+                f"{full_collection * 1000:.1f}",
+            ])
+
+    print(tabulate(rows, [
+        'Statements', 'AST', 'Parse (s)', 'Peak RSS growth (MiB)', 'GC collections', 'GC tracked objects',
+        'Full collection (ms)',
+    ]))
+
+    arena = parse_arena(generate_program(100000))
+    assert count_by_views(arena.program) == count_by_index(arena)
+
+    print()
+    print(tabulate([
+        ['views', f"{measure(lambda: count_by_views(arena.program), repeat=3) * 1000:.0f}"],
+        ['walk', f"{measure(lambda: count_by_index(arena), repeat=3) * 1000:.0f}"],
+    ], ['Count the nodes of 100000 statements', 'Time (ms)']))
+
+    # The analysis needs a program whose symbols are declared
+    arena = parse_arena("\n".join(generate_valid_program(seed) for seed in range(3000)))
+
+    print()
+    print(tabulate([
+        ['views', f"{measure(lambda: analyze_views(arena), repeat=3) * 1000:.0f}"],
+        ['index', f"{measure(lambda: SemanticAnalyzer().analyze_arena(arena), repeat=3) * 1000:.0f}"],
+    ], [f'Analyze {len(arena)} nodes', 'Time (ms)']))
@@ -0,0 +1,102 @@
+import collections
+import gc
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from logo.nodes import AstNode, unpack_position
+from logo.parse import parse_source
+
+# The namedtuple classes used by logo.parse before the slotted nodes, with and without a position object
+_TUPLES_ = {}
+_POSITIONED_TUPLES_ = {}
+
+
+def generate_program(statements: int) -> str:
+    lines = []
+
+    # Three statements per group: the assignment, the IF and the PRINT in its body
+    for i in range(statements // 3):
+        lines.append(f"X{i} = :Y * {i} + 2 ^ 3")
+        lines.append(f"IF ( :X{i} > {i} AND NOT :Y < 2 ) THEN")
+        lines.append(f"  PRINT :X{i}")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+def convert(node, factory):
+    """Copy the tree, creating every node with factory(node, children)"""
+    if isinstance(node, list):
+        return [convert(child, factory) for child in node]
+    elif isinstance(node, AstNode):
+        return factory(node, [convert(child, factory) for child in node])
+
+    return node
+
+
+def as_namedtuple(node, children):
+    cls = type(node)
+
+    if cls not in _TUPLES_:
+        _TUPLES_[cls] = collections.namedtuple(cls.__name__, cls._fields)
+
+    return _TUPLES_[cls](*children)
+
+
+def as_positioned_namedtuple(node, children):
+    cls = type(node)
+
+    if cls not in _POSITIONED_TUPLES_:
+        _POSITIONED_TUPLES_[cls] = collections.namedtuple(cls.__name__, cls._fields + ('position',))
+
+    return _POSITIONED_TUPLES_[cls](*children, unpack_position(node.position))
+
+
+def as_slotted(node, children):
+    return type(node)(*children, node.position)
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, list):
+        return sum(count_nodes(child) for child in node)
+    elif isinstance(node, AstNode):
+        return 1 + sum(count_nodes(child) for child in node)
+
+    return 0
+
+
+def measure(program, factory):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        tree = convert(program, factory)
+        elapsed = time.perf_counter() - start
+
+        return tree, elapsed, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    program = parse_source(generate_program(100000))
+    nodes = count_nodes(program)
+    rows = []
+
+    # Every form is copied from the same parsed program, so the shared names and numbers are not counted by any of them
+    for name, factory in [
+        ('namedtuple', as_namedtuple),
+        ('namedtuple + (line, column)', as_positioned_namedtuple),
+        ('slotted + packed position', as_slotted),
+    ]:
+        tree, elapsed, size = measure(program, factory)
+
+        rows.append([name, f"{elapsed:.2f}", f"{size / 2 ** 20:.1f}", f"{size / nodes:.1f}"])
+
+        del tree
+
+    print(f"Top level statements: {len(program)}, nodes: {nodes}")
+    print(tabulate(rows, ['Nodes', 'Build time (s)', 'Retained memory (MiB)', 'Bytes per node']))
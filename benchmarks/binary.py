@@ -0,0 +1,80 @@
+import os
+import pickle
+import tempfile
+
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.arena import parse_arena
+from logo.binary import dump, MappedProgram
+from logo.parse import parse_source
+
+
+def generate_library(procedures: int) -> str:
+    lines = []
+
+    for i in range(procedures):
+        lines.append(f"TO SHAPE{i} :SIZE :SIDES")
+        lines.append("  I = 0")
+        lines.append("  WHILE ( :I < :SIDES AND :SIZE > 0 )")
+        lines.append(f"    STEP = :SIZE * {i % 7 + 1}")
+        lines.append("    FORWARD :STEP")
+        lines.append("    RIGHT 90")
+        lines.append("    I = :I + 1")
+        lines.append("  END")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+def load_procedure(path: str, name: str):
+    with MappedProgram(path) as arena:
+        procedure = arena.procedure(name)
+
+        # Decode the whole procedure, as a worker compiling it would
+        return procedure == procedure._replace()
+
+
+def unpickle(path: str):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+if __name__ == '__main__':
+    source = generate_library(10000)
+    program = parse_source(source)
+
+    with tempfile.TemporaryDirectory() as directory:
+        binary_path = os.path.join(directory, 'library.ast')
+        pickle_path = os.path.join(directory, 'library.pickle')
+
+        def write_binary():
+            with open(binary_path, 'wb') as f:
+                dump(program, f)
+
+        def write_pickle():
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(program, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        write_binary_time = measure(write_binary, repeat=3)
+        write_pickle_time = measure(write_pickle, repeat=3)
+
+        arena = parse_arena(source)
+
+        def write_arena():
+            with open(binary_path, 'wb') as f:
+                dump(arena, f)
+
+        write_arena_time = measure(write_arena, repeat=3)
+
+        rows = [
+            ['binary', f"{os.path.getsize(binary_path) / 2 ** 20:.2f}", f"{write_binary_time * 1000:.0f}",
+             f"{write_arena_time * 1000:.1f}", f"{measure(lambda: load_procedure(binary_path, 'SHAPE5000')) * 1000:.2f}"],
+            ['pickle', f"{os.path.getsize(pickle_path) / 2 ** 20:.2f}", f"{write_pickle_time * 1000:.0f}", '-',
+             f"{measure(lambda: unpickle(pickle_path)) * 1000:.2f}"],
+            ['parse', f"{len(source) / 2 ** 20:.2f}", '-', '-', f"{measure(lambda: parse_source(source), 1) * 1000:.0f}"],
+        ]
+
+    print(tabulate(rows, [
+        'Format', 'Size (MiB)', 'Write nodes (ms)', 'Write arena (ms)', 'Load one procedure (ms)',
+    ]))
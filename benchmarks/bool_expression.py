@@ -0,0 +1,23 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.parse import parse_source, _assert_bool_expression_
+
+
+def generate_condition(clauses: int) -> str:
+    return " AND ".join(f":X{i} > {i} OR :Y{i}" for i in range(clauses))
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for size in [100, 1000, 10000, 50000]:
+        source = f"IF ( {generate_condition(size)} ) THEN \n END"
+        condition = parse_source(source)[0].condition
+
+        validate = measure(lambda: _assert_bool_expression_(condition))
+        parse = measure(lambda: parse_source(source), repeat=3)
+
+        rows.append([size * 2, f"{validate * 1000:.2f}", f"{validate / size * 1e9 / 2:.0f}", f"{parse * 1000:.1f}"])
+
+    print(tabulate(rows, ['Clauses', 'Validation (ms)', 'ns/clause', 'Parse (ms)']))
@@ -0,0 +1,30 @@
+import tempfile
+
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.cache import ParseCache
+from logo.parse import parse_source
+
+
+def generate_library(procedures: int) -> str:
+    return "\n".join(
+        f"TO P{i} :A :B \n X = :A * {i} + :B \n IF ( :X > 10 ) THEN \n FORWARD :X \n END \nEND" for i in range(procedures)
+    )
+
+
+if __name__ == '__main__':
+    source = generate_library(2000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ParseCache(directory)
+        cache.parse(source)
+
+        rows = [
+            ['parse_source', f"{measure(lambda: parse_source(source)) * 1000:.1f}"],
+            ['ParseCache hit', f"{measure(lambda: cache.parse(source)) * 1000:.1f}"],
+        ]
+
+        print(f"Source size: {len(source)} characters")
+        print(tabulate(rows, ['Mode', 'Time (ms)']))
+        print(cache.stats)
@@ -0,0 +1,50 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from benchmarks.trace import generate_program
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.cfg import build_cfg, verify_cfg, lower_cfg
+from logo.vm.codegen import CodeGenerator
+from logo.vm.peephole import optimize, O2
+from tests.concurrency import generate_program as generate_mixed_program
+
+
+def build(functions) -> list:
+    return [build_cfg(function) for function in functions.values()]
+
+
+def verify(graphs):
+    for cfg in graphs:
+        verify_cfg(cfg)
+
+
+def lower(graphs) -> list:
+    return [lower_cfg(cfg) for cfg in graphs]
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for name, source in [
+        ('conditions', generate_program(20000)),
+        ('mixed statements', "\n".join(generate_mixed_program(seed) for seed in range(300))),
+    ]:
+        code_gen = CodeGenerator()
+        code_gen.visit(DeclareFunction('MAIN', None, parse_source(source)))
+
+        for level, functions in [('-O0', code_gen.functions), ('-O2', optimize(code_gen.functions, O2))]:
+            instructions = sum(len(function.instructions) for function in functions.values())
+            graphs = build(functions)
+            blocks = sum(len(cfg.blocks) for cfg in graphs)
+            unreachable = sum(cfg.remove_unreachable() for cfg in build(functions))
+
+            rows.append([
+                name, level, instructions, blocks, unreachable,
+                f"{measure(lambda: build(functions)) * 1000:.0f}",
+                f"{measure(lambda: verify(graphs)) * 1000:.0f}",
+                f"{measure(lambda: lower(graphs)) * 1000:.0f}",
+            ])
+
+    print(tabulate(rows, [
+        'Program', 'Level', 'Instructions', 'Blocks', 'Unreachable blocks', 'Build (ms)', 'Verify (ms)', 'Lower (ms)',
+    ]))
@@ -0,0 +1,31 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from benchmarks.trace import generate_program
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator, print_program
+from tests.traversal import nested_program
+
+
+def generate(main):
+    code_gen = CodeGenerator()
+    code_gen.visit(main)
+
+    return code_gen
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for name, main in [
+        ('mixed statements', DeclareFunction('MAIN', None, parse_source(generate_program(20000)))),
+        ('nested statements', DeclareFunction('MAIN', None, nested_program(20000))),
+    ]:
+        code_gen = generate(main)
+        rows.append([
+            name,
+            f"{measure(lambda: generate(main)) * 1000:.0f}",
+            f"{measure(lambda: print_program(code_gen, 'MAIN')) * 1000:.0f}",
+        ])
+
+    print(tabulate(rows, ['Program', 'Codegen (ms)', 'Print (ms)']))
@@ -0,0 +1,49 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.folding import parse_folded
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator
+from logo.vm.isa import Label
+from tests.concurrency import generate_program
+
+
+def instructions(program) -> int:
+    code_gen = CodeGenerator()
+    code_gen.visit(DeclareFunction('MAIN', None, program))
+
+    return sum(
+        1 for function in code_gen.functions.values() for instruction in function.instructions
+        if not isinstance(instruction, Label)
+    )
+
+
+def generate_constant_program(statements: int) -> str:
+    lines = ["X = 0"]
+
+    for i in range(statements // 3):
+        lines.append(f"Y{i} = 2 ^ 3 * {i} + 1")
+        lines.append(f"IF ( :X < {i} AND {i} > 1 ) THEN\n  X = :X + {i} / 2\nEND")
+        lines.append(f"C{i} = TRUE AND NOT {i} < 2")
+
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for name, source in [
+        ('mixed statements', "\n".join(generate_program(seed) for seed in range(300))),
+        ('constant expressions', generate_constant_program(6000)),
+    ]:
+        program = parse_source(source)
+        folded_program, folded = parse_folded(source)
+
+        rows.append([
+            name, folded, instructions(program), instructions(folded_program),
+            f"{measure(lambda: parse_source(source)) * 1000:.0f}", f"{measure(lambda: parse_folded(source)) * 1000:.0f}",
+        ])
+
+    print(tabulate(rows, [
+        'Program', 'Folded', 'Instructions', 'Folded instructions', 'Parse (ms)', 'Parse and fold (ms)',
+    ]))
@@ -0,0 +1,43 @@
+import time
+
+from tabulate import tabulate
+
+from logo.incremental import IncrementalParser
+from logo.parse import parse_source
+
+
+def generate_program(procedures: int) -> str:
+    return "".join(
+        f"TO P{i} :A :B \n X = :A * {i} + :B \n IF ( :X > 10 ) THEN \n FORWARD :X \n END \nEND\n"
+        for i in range(procedures)
+    )
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for size in [100, 1000, 10000]:
+        source = generate_program(size)
+        parser = IncrementalParser(source)
+
+        edited = source.replace(f"X = :A * {size // 2} + :B", f"X = :A * {size // 2} + :B * 2")
+
+        rows.append([
+            size,
+            len(source),
+            f"{timed(lambda: parse_source(edited)):.1f}",
+            f"{timed(lambda: parser.update(edited)):.2f}",
+            parser.reparsed_blocks,
+            f"{timed(lambda: parser.edit(0, 0, ' ')):.2f}",
+            # A new line moves the positions of the statements after it
+            f"{timed(lambda: parser.edit(0, 0, chr(10))):.2f}",
+        ])
+
+    print(tabulate(rows, ['Procedures', 'Characters', 'Full parse (ms)', 'update (ms)', 'Blocks reparsed',
+                          'edit (ms)', 'New line edit (ms)']))
@@ -0,0 +1,84 @@
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from logo.interning import parse_interned
+from logo.nodes import AstNode
+from logo.parse import parse_source, DeclareFunction
+from logo.semantic import SemanticAnalyzer
+from logo.vm.codegen import CodeGenerator
+
+
+def generate_program(statements: int) -> str:
+    """Program in the style of generated code, with few distinct expressions repeated many times"""
+    lines = [f"V{i} = {i}" for i in range(10)]
+
+    for i in range(statements // 3):
+        a, b = i % 10, (i * 7) % 10
+        lines.append(f"X{i % 50} = :V{a} * 2 + :V{b} - 1")
+        lines.append(f"IF ( :V{a} * 2 + :V{b} > 10 AND :V{b} < 5 ) THEN")
+        lines.append(f"  Y{i % 50} = :V{a} * 2 + :V{b} - 1")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+def count_nodes(program) -> tuple:
+    """Return the number of nodes and of distinct node objects"""
+    total = 0
+    unique = set()
+    pending = [program]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, AstNode):
+            total += 1
+            unique.add(id(value))
+            pending.extend(value)
+
+    return total, len(unique)
+
+
+def measure(parse, source):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        program = parse(source)
+        elapsed = time.perf_counter() - start
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    main = DeclareFunction('MAIN', None, program)
+
+    start = time.perf_counter()
+    SemanticAnalyzer().visit(main)
+    analysis = time.perf_counter() - start
+
+    start = time.perf_counter()
+    CodeGenerator().visit(main)
+    codegen = time.perf_counter() - start
+
+    return program, elapsed, retained, analysis, codegen
+
+
+if __name__ == '__main__':
+    source = generate_program(30000)
+    rows = []
+
+    for name, parse in [('plain', parse_source), ('interned', parse_interned)]:
+        program, elapsed, retained, analysis, codegen = measure(parse, source)
+        total, unique = count_nodes(program)
+
+        rows.append([
+            name, total, unique, f"{retained / 2 ** 20:.1f}", f"{elapsed:.2f}", f"{analysis:.2f}", f"{codegen:.2f}",
+        ])
+
+    print(tabulate(rows, [
+        'Parse', 'Nodes', 'Distinct nodes', 'Retained memory (MiB)', 'Parse (s)', 'Analysis (s)', 'Codegen (s)',
+    ]))
@@ -0,0 +1,37 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from benchmarks.trace import generate_program
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label
+from logo.vm.peephole import optimize, O0, O1, O2
+from tests.concurrency import generate_program as generate_mixed_program
+
+
+def count(functions):
+    instructions = [instruction for function in functions.values() for instruction in function.instructions]
+    labels = sum(1 for instruction in instructions if isinstance(instruction, Label))
+    jumps = sum(1 for instruction in instructions if type(instruction) in JUMPS)
+
+    return len(instructions) - labels, labels, jumps
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for name, source in [
+        ('conditions', generate_program(20000)),
+        ('mixed statements', "\n".join(generate_mixed_program(seed) for seed in range(300))),
+    ]:
+        code_gen = CodeGenerator()
+        code_gen.visit(DeclareFunction('MAIN', None, parse_source(source)))
+
+        for level in (O0, O1, O2):
+            functions = optimize(code_gen.functions, level)
+            elapsed = measure(lambda: optimize(code_gen.functions, level))
+
+            rows.append([name, f"-O{level}", *count(functions), f"{elapsed * 1000:.0f}"])
+
+    print(tabulate(rows, ['Program', 'Level', 'Instructions', 'Labels', 'Jumps', 'Time (ms)']))
@@ -0,0 +1,34 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.lexer import new_lexer, LEXER_BACKENDS
+from logo.parse import parse_source
+
+
+def generate_program(statements: int) -> str:
+    return "\n".join(
+        f"X{i} = :Y * {i}.5 + 2 ^ 3\nIF ( :X{i} > 2 AND TRUE ) THEN \n PRINT 'value' \n END" for i in range(statements)
+    )
+
+
+def tokenize(backend: str, source: str):
+    lexer = new_lexer(backend)
+    lexer.input(source)
+
+    for _ in iter(lexer.token, None):
+        pass
+
+
+if __name__ == '__main__':
+    source = generate_program(20000)
+    rows = []
+
+    for backend in LEXER_BACKENDS:
+        rows.append([
+            backend,
+            f"{measure(lambda: tokenize(backend, source), repeat=3) * 1000:.0f}",
+            f"{measure(lambda: parse_source(source, backend), repeat=3) * 1000:.0f}",
+        ])
+
+    print(f"Source size: {len(source)} characters")
+    print(tabulate(rows, ['Backend', 'Tokenize (ms)', 'Parse (ms)']))
@@ -0,0 +1,98 @@
+import tracemalloc
+
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.parse import parse_source, DeclareFunction
+from logo.semantic import SemanticAnalyzer, ScopedSymbolTable, VariableSymbol, built_in
+
+
+def generate_program(blocks: int) -> str:
+    """Program with many short nested scopes"""
+    lines = ["X = 0"]
+
+    for i in range(blocks):
+        lines.append(f"IF ( :X < {i} ) THEN")
+        lines.append("  WHILE ( :X > 1 )")
+        lines.append("    X = :X - 1")
+        lines.append("  END")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+class CopiedBuiltInScope(ScopedSymbolTable):
+    """Scope with its own copy of the built-ins, as every scope had before they were shared"""
+
+    def __init__(self, scope_name, scope_level, enclosing_scope=None):
+        super().__init__(scope_name, scope_level, enclosing_scope)
+        self._symbols = built_in()
+
+
+def create_scopes(scope_type, count: int) -> list:
+    global_scope = scope_type('global', 1)
+
+    return [scope_type('if', 2, global_scope) for _ in range(count)]
+
+
+def walk_chain(scope, name: str) -> str:
+    """Find the scope of the name and build its full name the way lookups did before they were cached"""
+    while name not in scope._symbols:
+        scope = scope.enclosing_scope
+
+    names = []
+
+    while scope is not None:
+        names.append(scope.scope_name)
+        scope = scope.enclosing_scope
+
+    return '_'.join(reversed(names))
+
+
+def nested_scope(depth: int):
+    scope = ScopedSymbolTable('global', 1)
+    scope.insert(VariableSymbol('X'))
+
+    for level in range(depth):
+        scope = ScopedSymbolTable('if', level + 2, scope)
+
+    return scope
+
+
+def retained_memory(scope_type, count: int) -> int:
+    tracemalloc.start()
+
+    try:
+        scopes = create_scopes(scope_type, count)
+        return tracemalloc.get_traced_memory()[0] // len(scopes)
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    count = 10000
+    rows = []
+
+    for name, scope_type in [('copied built-ins', CopiedBuiltInScope), ('shared built-ins', ScopedSymbolTable)]:
+        rows.append([
+            name, f"{measure(lambda: create_scopes(scope_type, count)) / count * 1e6:.2f}",
+            retained_memory(scope_type, count),
+        ])
+
+    print(tabulate(rows, ['Scopes', 'Creation (us/scope)', 'Retained (bytes/scope)']))
+    print()
+
+    rows = []
+
+    for depth in [1, 10, 100, 1000]:
+        scope = nested_scope(depth)
+        walk = measure(lambda: [walk_chain(scope, 'X') for _ in range(1000)])
+        cached = measure(lambda: [scope.lookup('X') for _ in range(1000)])
+
+        rows.append([depth, f"{walk * 1000:.2f}", f"{cached * 1000:.2f}"])
+
+    print(tabulate(rows, ['Depth', 'Chain walk (us/lookup)', 'Cached lookup (us/lookup)']))
+    print()
+
+    main = DeclareFunction('MAIN', None, parse_source(generate_program(5000)))
+    print(f"Analysis of 10000 nested scopes: {measure(lambda: SemanticAnalyzer().visit(main), 3) * 1000:.0f} ms")
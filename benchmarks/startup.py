@@ -0,0 +1,64 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from tabulate import tabulate
+
+# Measures the time from the first import of the parser to the end of the first parse in a fresh interpreter
+PARSE_SCRIPT = """
+import sys
+import time
+
+for table in {missing!r}:
+    sys.modules[table] = None
+
+start = time.perf_counter()
+
+from logo.lexer import lexer
+from logo.parse import parser
+
+parser.parse("X = 1 + 2", lexer=lexer)
+
+print(time.perf_counter() - start)
+"""
+
+# Measures the import time of a module used by tools that don't parse
+IMPORT_SCRIPT = """
+import time
+
+start = time.perf_counter()
+
+import {module}
+
+print(time.perf_counter() - start)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script: str, optimize=True, repeat=15) -> float:
+    env = dict(os.environ, LOGO_PLY_OPTIMIZE='1' if optimize else '0')
+    timings = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        timings.append(float(output.stdout))
+
+    return statistics.median(timings)
+
+
+if __name__ == '__main__':
+    rows = [
+        ['first parse, shipped tables, optimized', run(PARSE_SCRIPT.format(missing=[]))],
+        ['first parse, shipped tables, validated', run(PARSE_SCRIPT.format(missing=[]), optimize=False)],
+        ['first parse, no tables (grammar analysis)',
+         run(PARSE_SCRIPT.format(missing=['logo.lextab', 'logo.parsetab']), optimize=False)],
+    ]
+
+    for module in ['logo.vm.isa', 'logo.parse', 'logo.printer', 'logo.vm.codegen']:
+        rows.append([f"import {module}", run(IMPORT_SCRIPT.format(module=module))])
+
+    print(tabulate([[name, f"{value * 1000:.1f}"] for name, value in rows], ['Scenario', 'Time (ms)']))
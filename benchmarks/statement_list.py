@@ -0,0 +1,34 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.lexer import lexer
+from logo.parse import parser
+
+
+def generate_program(statements: int) -> str:
+    return "\n".join(f"X{i} = {i} + :Y * 2" for i in range(statements))
+
+
+def generate_invoke(arguments: int) -> str:
+    return "FUNC " + " ".join(str(i) for i in range(arguments))
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for size in [1000, 5000, 10000, 20000, 40000]:
+        program = generate_program(size)
+        invoke = generate_invoke(size)
+
+        program_time = measure(lambda: parser.parse(program, lexer=lexer), repeat=3)
+        invoke_time = measure(lambda: parser.parse(invoke, lexer=lexer), repeat=3)
+
+        rows.append([
+            size,
+            f"{program_time * 1000:.1f}",
+            f"{program_time / size * 1e6:.2f}",
+            f"{invoke_time * 1000:.1f}",
+            f"{invoke_time / size * 1e6:.2f}",
+        ])
+
+    print(tabulate(rows, ['N', 'statements (ms)', 'us/statement', 'arguments (ms)', 'us/argument']))
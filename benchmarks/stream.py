@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from logo.lexer import get_lexer
+from logo.stream import tokenize_file
+
+
+def generate_program(statements: int) -> str:
+    return "\n".join(f"X{i} = :Y * {i} + 2 ^ 3\nPRINT 'value {i}'" for i in range(statements))
+
+
+def tokenize_text(path: str) -> int:
+    with open(path) as f:
+        source = f.read()
+
+    lexer = get_lexer().clone()
+    lexer.input(source)
+
+    return len(list(iter(lexer.token, None)))
+
+
+def tokenize_stream(path: str) -> int:
+    return sum(1 for _ in tokenize_file(path))
+
+
+def measure_peak(function, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        count = function(path)
+        return count, time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'program.logo')
+
+        with open(path, 'w') as f:
+            f.write(generate_program(50000))
+
+        rows = []
+
+        for name, function in [('read + token list', tokenize_text), ('mmap stream', tokenize_stream)]:
+            count, elapsed, peak = measure_peak(function, path)
+            rows.append([name, count, f"{elapsed:.2f}", f"{peak / 2 ** 20:.1f}"])
+
+        print(f"Source size: {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        print(tabulate(rows, ['Mode', 'Tokens', 'Time (s)', 'Peak memory (MiB)']))
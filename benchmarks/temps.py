@@ -0,0 +1,47 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from benchmarks.trace import generate_program
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator
+from logo.vm.isa import Store, Compare
+from tests.concurrency import generate_program as generate_mixed_program
+
+
+def generate_comparisons(statements: int) -> str:
+    lines = ["X = 0", "Y = 1"]
+
+    for i in range(statements // 2):
+        lines.append(f"IF ( :X + {i} > :Y * 2 OR :X < :Y ) THEN\n  X = :X + 1\nEND")
+        lines.append(f"C{i} = :X == {i} AND :Y <= :X - 1")
+
+    return "\n".join(lines)
+
+
+def generate(main) -> CodeGenerator:
+    code_gen = CodeGenerator()
+    code_gen.visit(main)
+
+    return code_gen
+
+
+if __name__ == '__main__':
+    rows = []
+
+    for name, source in [
+        ('conditions', generate_program(20000)),
+        ('comparisons', generate_comparisons(10000)),
+        ('mixed statements', "\n".join(generate_mixed_program(seed) for seed in range(300))),
+    ]:
+        main = DeclareFunction('MAIN', None, parse_source(source))
+        code_gen = generate(main)
+        instructions = [instruction for function in code_gen.functions.values() for instruction in function.instructions]
+        comparisons = [instruction for instruction in instructions if type(instruction) is Compare]
+        scratch_stores = sum(1 for instruction in instructions if type(instruction) is Store and '_tmp_' in instruction.id)
+
+        rows.append([
+            name, len(comparisons), scratch_stores, code_gen.temps.slots, len(code_gen.variables),
+            f"{measure(lambda: generate(main)) * 1000:.0f}",
+        ])
+
+    print(tabulate(rows, ['Program', 'Comparisons', 'Scratch stores', 'Scratch slots', '.DATA entries', 'Codegen (ms)']))
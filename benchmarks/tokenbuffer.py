@@ -0,0 +1,42 @@
+import time
+import tracemalloc
+
+from tabulate import tabulate
+
+from logo.lexer import new_lexer
+from logo.tokenbuffer import tokenize_to_buffer
+
+
+def generate_program(statements: int) -> str:
+    return "\n".join(f"X{i} = :Y * {i} + 2 ^ 3\nPRINT 'value {i}'" for i in range(statements))
+
+
+def token_list(source: str):
+    lexer = new_lexer('ply')
+    lexer.input(source)
+
+    return list(iter(lexer.token, None))
+
+
+def measure(function, source):
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        result = function(source)
+        elapsed = time.perf_counter() - start
+        return len(result), elapsed, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    source = generate_program(50000)
+    rows = []
+
+    for name, function in [('LexToken list', token_list), ('TokenBuffer', tokenize_to_buffer)]:
+        count, elapsed, size = measure(function, source)
+        rows.append([name, count, f"{elapsed:.2f}", f"{size / 2 ** 20:.1f}", f"{size / count:.0f}"])
+
+    print(f"Source size: {len(source) / 2 ** 20:.1f} MiB")
+    print(tabulate(rows, ['Storage', 'Tokens', 'Time (s)', 'Retained memory (MiB)', 'Bytes per token']))
@@ -0,0 +1,39 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.parse import parse_source, DeclareFunction
+from logo.semantic import SemanticAnalyzer
+from logo.trace import Tracer, CountingTracer
+from logo.vm.codegen import CodeGenerator
+
+
+def generate_program(statements: int) -> str:
+    lines = ["X = 0", "Y = 1"]
+
+    for i in range(statements // 4):
+        lines.append(f"IF ( :X < {i} AND :Y > 0 ) THEN")
+        lines.append("  X = :X + :Y * 2")
+        lines.append("  FORWARD :X")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    main = DeclareFunction('MAIN', None, parse_source(generate_program(20000)))
+    rows = []
+
+    for name, tracer in [('disabled', None), ('no-op tracer', Tracer()), ('counting tracer', CountingTracer())]:
+        analysis = measure(lambda: SemanticAnalyzer(tracer).visit(main), 3)
+        codegen = measure(lambda: CodeGenerator(tracer).visit(main), 3)
+
+        rows.append([name, f"{analysis * 1000:.0f}", f"{codegen * 1000:.0f}"])
+
+    print(tabulate(rows, ['Tracing', 'Analysis (ms)', 'Codegen (ms)']))
+    print()
+
+    tracer = CountingTracer()
+    SemanticAnalyzer(tracer).visit(main)
+    CodeGenerator(tracer).visit(main)
+
+    print(tracer)
@@ -0,0 +1,74 @@
+from tabulate import tabulate
+
+from benchmarks import measure
+from logo.parse import parse_source
+from logo.printer import print_program
+from logo.semantic import NodeVisitor
+
+
+def generate_program(statements: int) -> str:
+    lines = ["X = 0"]
+
+    for i in range(statements // 3):
+        lines.append(f"IF ( :X < {i} AND NOT :X > 2 ) THEN")
+        lines.append("  X = :X + 2 * :X - 1")
+        lines.append("END")
+
+    return "\n".join(lines)
+
+
+class NodeCounter(NodeVisitor):
+    """Visitor doing no work besides dispatching, to measure the cost of a visit"""
+
+    def __init__(self):
+        super().__init__()
+
+        self.count = 0
+
+    def generic_visit(self, value):
+        pass
+
+    def _visit_node_(self, node):
+        self.count += 1
+
+        for value in node:
+            if isinstance(value, list):
+                for item in value:
+                    self.visit(item)
+            else:
+                self.visit(value)
+
+    visit_BinaryOperation = visit_NotOperation = visit_Identifier = visit_Assignment = visit_IfStatement = \
+        visit_WhileStatement = visit_DeclareFunction = visit_InvokeFunction = _visit_node_
+
+
+class NamedNodeCounter(NodeCounter):
+    """Same visitor dispatching by building the method name on every visit"""
+
+    def visit(self, node):
+        return getattr(self, 'visit_' + type(node).__name__, self.generic_visit)(node)
+
+
+if __name__ == '__main__':
+    program = parse_source(generate_program(60000))
+    counter = NodeCounter()
+
+    for statement in program:
+        counter.visit(statement)
+
+    visits = counter.count
+    rows = []
+
+    for name, visitor_type in [('method name', NamedNodeCounter), ('dispatch table', NodeCounter)]:
+        def walk():
+            visitor = visitor_type()
+
+            for statement in program:
+                visitor.visit(statement)
+
+        elapsed = measure(walk, 3)
+        rows.append([name, visits, f"{elapsed * 1000:.0f}", f"{elapsed / visits * 1e9:.0f}"])
+
+    print(tabulate(rows, ['Dispatch', 'Nodes', 'Walk (ms)', 'ns/node']))
+    print()
+    print(f"Printing the program: {measure(lambda: print_program(program), 3) * 1000:.0f} ms")
@@ -1,7 +1,4 @@
-from logo.parse import parser, DeclareFunction
-from logo.lexer import lexer
-
-from logo.vm.codegen import CodeGenerator, print_program
+from logo.vm.codegen import compile_source
 
 
 if __name__ == '__main__':
@@ -32,15 +29,6 @@ if __name__ == '__main__':
     END
     """
 
-    result = parser.parse(s, lexer=lexer)
-
-    main = DeclareFunction('MAIN', None, result)
-
-    code_gen = CodeGenerator()
-    code_gen.visit(main)
-
-    program = code_gen.functions[main.name]
-
     print("The compiled program: \n")
 
-    print(print_program(code_gen, main.name))
+    print(compile_source(s, 'MAIN'))
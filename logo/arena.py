@@ -0,0 +1,286 @@
+from array import array
+
+from .lexer import TokenType
+from .nodes import rebuild
+from .parse import BinaryOperation, NotOperation, WhileStatement, IfStatement, Assignment, DeclareFunction, \
+    InvokeFunction, Identifier, parse_source, _assert_bool_expression_
+
+# Node classes by kind code
+NODE_TYPES = (
+    BinaryOperation, NotOperation, WhileStatement, IfStatement, Assignment, DeclareFunction, InvokeFunction, Identifier
+)
+
+_DECLARE_FUNCTION_ = NODE_TYPES.index(DeclareFunction)
+
+# Operators by operator code
+OPERATORS = tuple(TokenType)
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+
+# Number of child references stored for every node, enough for the fields of any node class besides `op`
+CHILD_COLUMNS = 3
+
+# A reference to a value stored in the arena is an int with the kind of value in the low TAG_BITS bits and its index
+# in the table of that kind in the high bits. The reference 0 is None. References are stored as 32 bit unsigned ints,
+# so an arena holds up to 2 ** 29 nodes.
+TAG_BITS = 3
+TAG_MASK = (1 << TAG_BITS) - 1
+
+NONE = 0
+NODE = 1
+NUMBER = 2
+STRING = 3
+BOOL = 4
+LIST = 5
+
+# References that can hold nodes
+_CONTAINERS_ = (NODE, LIST)
+
+
+class Arena(object):
+    """Program stored as a struct of arrays instead of one Python object per node.
+
+    Each node is an index in the node columns: its kind, operator code, packed position and up to three child
+    references. Numbers are kept in an array of doubles, strings in an interned table and lists as ranges of references
+    in a single array.
+
+    The arena is also a node factory for the parser actions (see logo.parse.Nodes): its node methods store the node
+    and return its reference.
+
+    Nodes are read through views, lightweight subclasses of the node classes that hold the arena and the node index and
+    decode the fields when they are accessed, so the NodeVisitor passes walk the arena unchanged. Each access decodes
+    the field again. The index accessors kind_of, child, item_range and walk read the columns instead, as procedures()
+    and SemanticAnalyzer.analyze_arena do. CodeGenerator still walks the views.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.operators = array('B')
+        self.positions = array('q')
+        self.children = tuple(array('I') for _ in range(CHILD_COLUMNS))
+
+        self.numbers = array('d')
+        self.strings = []
+        self._string_indexes_ = {}
+
+        self.list_offsets = array('I', [0])
+        self.list_items = array('I')
+
+        self.root = NONE
+
+    @classmethod
+    def from_program(cls, program) -> 'Arena':
+        """Store a program made of node objects"""
+        arena = cls()
+        arena.root = arena.encode(rebuild(program, arena))
+
+        return arena
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def program(self):
+        return self.value(self.root)
+
+    def add(self, kind: int, operator, children: tuple, position: int) -> int:
+        """Store a node and return its reference"""
+        index = len(self.kinds)
+        encode = self.encode
+
+        self.kinds.append(kind)
+        self.operators.append(OPERATOR_CODES[operator] if operator is not None else 0)
+        self.positions.append(position)
+
+        for column, child in zip(self.children, children):
+            column.append(encode(child))
+
+        for column in self.children[len(children):]:
+            column.append(NONE)
+
+        return index << TAG_BITS | NODE
+
+    def encode(self, value) -> int:
+        """Return the reference of the value, storing it if needed. Ints are references to values already stored"""
+        value_type = type(value)
+
+        if value_type is int:
+            return value
+        elif value is None:
+            return NONE
+        elif value_type is bool:
+            return value << TAG_BITS | BOOL
+        elif value_type is float:
+            self.numbers.append(value)
+            return (len(self.numbers) - 1) << TAG_BITS | NUMBER
+        elif value_type is str:
+            return self.intern(value) << TAG_BITS | STRING
+        elif value_type is list:
+            items = [self.encode(item) for item in value]
+
+            self.list_items.extend(items)
+            self.list_offsets.append(len(self.list_items))
+
+            return (len(self.list_offsets) - 2) << TAG_BITS | LIST
+
+        raise Exception(f"Unexpected value for the arena: {value!r}")
+
+    def intern(self, text: str) -> int:
+        index = self._string_indexes_.get(text)
+
+        if index is None:
+            index = self._string_indexes_[text] = len(self.strings)
+            self.strings.append(text)
+
+        return index
+
+    def value(self, reference: int):
+        """Decode a reference: nodes are returned as views, lists as lists of decoded values"""
+        tag = reference & TAG_MASK
+        index = reference >> TAG_BITS
+
+        if tag == NODE:
+            return _VIEW_TYPES_[self.kinds[index]](self, index)
+        elif tag == NUMBER:
+            return self.numbers[index]
+        elif tag == STRING:
+            return self.strings[index]
+        elif tag == BOOL:
+            return bool(index)
+        elif tag == LIST:
+            return [self.value(item) for item in self.items(index)]
+
+        return None
+
+    def items(self, index: int):
+        """References stored in the list at the index"""
+        return self.list_items[self.list_offsets[index]:self.list_offsets[index + 1]]
+
+    def kind_of(self, index: int) -> type:
+        """Node class of the node at the index"""
+        return NODE_TYPES[self.kinds[index]]
+
+    def child(self, index: int, column: int) -> int:
+        """Reference of a field of the node at the index, by its column: the fields of the node class besides `op`"""
+        return self.children[column][index]
+
+    def item_range(self, reference: int) -> range:
+        """Positions in list_items of the references of the list"""
+        index = reference >> TAG_BITS
+
+        return range(self.list_offsets[index], self.list_offsets[index + 1])
+
+    def walk(self, reference: int = None):
+        """Yield the indexes of the nodes under the reference, the root by default, parents first in source order.
+
+        Only the columns are read: no view or list is created.
+        """
+        columns = self.children[::-1]
+        offsets = self.list_offsets
+        items = self.list_items
+        pending = [self.root if reference is None else reference]
+
+        while pending:
+            reference = pending.pop()
+            index = reference >> TAG_BITS
+
+            if reference & TAG_MASK == NODE:
+                yield index
+
+                for column in columns:
+                    child = column[index]
+
+                    if child & TAG_MASK in _CONTAINERS_:
+                        pending.append(child)
+            elif reference & TAG_MASK == LIST:
+                for position in range(offsets[index + 1] - 1, offsets[index] - 1, -1):
+                    child = items[position]
+
+                    if child & TAG_MASK in _CONTAINERS_:
+                        pending.append(child)
+
+    def node(self, index: int):
+        """View of the node at the index"""
+        return _VIEW_TYPES_[self.kinds[index]](self, index)
+
+    def procedures(self) -> dict:
+        """Index of the top level procedures by upper case name, found without decoding the rest of the program"""
+        procedures = {}
+
+        if self.root & TAG_MASK != LIST:
+            return procedures
+
+        for position in self.item_range(self.root):
+            reference = self.list_items[position]
+            index = reference >> TAG_BITS
+
+            if reference & TAG_MASK == NODE and self.kinds[index] == _DECLARE_FUNCTION_:
+                procedures[self.value(self.child(index, 0)).upper()] = index
+
+        return procedures
+
+    def procedure(self, name: str):
+        """View of the top level procedure with the name"""
+        return self.node(self.procedures()[name.upper()])
+
+    def assert_bool_expression(self, expression):
+        _assert_bool_expression_(self.value(expression) if type(expression) is int else expression)
+
+
+def _node_method_(kind: int, cls: type):
+    """Create the factory method of the node class, with the same arguments as its constructor"""
+    fields = cls._fields
+    children = ''.join(f"{field}, " for field in fields if field != 'op')
+    operator = 'op' if 'op' in fields else 'None'
+
+    source = (
+        f"def {cls.__name__}(self, {', '.join(fields)}, position=0):\n"
+        f"    return self.add({kind}, {operator}, ({children}), position)\n"
+    )
+
+    namespace = {}
+    exec(source, namespace)
+
+    return namespace[cls.__name__]
+
+
+def _child_property_(column: int):
+    return property(lambda self: self.arena.value(self.arena.children[column][self.index]))
+
+
+def _view_type_(cls: type) -> type:
+    """Create the view class of the node class, with the same name so NodeVisitor dispatches it in the same way"""
+    namespace = {
+        '__slots__': ('arena', 'index'),
+        '__module__': __name__,
+        '__init__': _view_init_,
+        'position': property(lambda self: self.arena.positions[self.index]),
+    }
+
+    if 'op' in cls._fields:
+        namespace['op'] = property(lambda self: OPERATORS[self.arena.operators[self.index]])
+
+    for column, field in enumerate(field for field in cls._fields if field != 'op'):
+        namespace[field] = _child_property_(column)
+
+    return type(cls.__name__, (cls,), namespace)
+
+
+def _view_init_(self, arena: Arena, index: int):
+    self.arena = arena
+    self.index = index
+
+
+for _kind_, _cls_ in enumerate(NODE_TYPES):
+    setattr(Arena, _cls_.__name__, _node_method_(_kind_, _cls_))
+
+del _kind_, _cls_
+
+_VIEW_TYPES_ = tuple(_view_type_(cls) for cls in NODE_TYPES)
+
+
+def parse_arena(source: str, backend: str = None) -> Arena:
+    """Parse the source straight into an arena, without creating the node objects"""
+    arena = Arena()
+    arena.root = arena.encode(parse_source(source, backend, arena))
+
+    return arena
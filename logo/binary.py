@@ -0,0 +1,231 @@
+import io
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from .arena import Arena, NODE_TYPES, OPERATORS, CHILD_COLUMNS
+
+# Binary format of a program: a header followed by the columns of its arena (see logo.arena), each one starting at a
+# multiple of 8 bytes, in little endian. Loading a program only reads the header and creates memoryviews over the
+# columns, so a memory mapped file is paged in as the nodes are read.
+#
+# FORMAT_VERSION must be changed whenever the layout changes. The schema hash covers the node classes and operators,
+# so files written with different node kinds or operator codes are rejected.
+MAGIC = b'LOGOAST\0'
+FORMAT_VERSION = 1
+
+# Magic, format version, schema hash, then the number of nodes, numbers, strings, string bytes, lists and list items,
+# and the reference of the program
+_HEADER_ = struct.Struct('<8sII6qq')
+
+_ALIGNMENT_ = 8
+
+
+def _schema_hash_() -> int:
+    schema = [f"{cls.__name__}({' '.join(cls._fields)})" for cls in NODE_TYPES]
+    schema.extend(operator.name for operator in OPERATORS)
+    schema.append(str(CHILD_COLUMNS))
+
+    return zlib.crc32(','.join(schema).encode())
+
+
+SCHEMA_HASH = _schema_hash_()
+
+
+def _padding_(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT_)
+
+
+def _little_endian_(column: array) -> array:
+    if sys.byteorder == 'little':
+        return column
+
+    column = array(column.typecode, column)
+    column.byteswap()
+
+    return column
+
+
+def dump(program, file):
+    """Write the program, an arena or a list of nodes, to a binary file object"""
+    arena = program if isinstance(program, Arena) else Arena.from_program(program)
+
+    encoded = [text.encode('utf-8') for text in arena.strings]
+    string_offsets = array('I', [0])
+
+    for text in encoded:
+        string_offsets.append(string_offsets[-1] + len(text))
+
+    file.write(_HEADER_.pack(
+        MAGIC, FORMAT_VERSION, SCHEMA_HASH,
+        len(arena.kinds), len(arena.numbers), len(arena.strings), string_offsets[-1],
+        len(arena.list_offsets) - 1, len(arena.list_items),
+        arena.root,
+    ))
+    file.write(_padding_(_HEADER_.size))
+
+    columns = [
+        arena.kinds, arena.operators, arena.positions, *arena.children, arena.numbers,
+        string_offsets, b''.join(encoded), arena.list_offsets, arena.list_items,
+    ]
+
+    for column in columns:
+        if isinstance(column, array):
+            column = _little_endian_(column)
+
+        file.write(column)
+        file.write(_padding_(memoryview(column).nbytes))
+
+
+def dumps(program) -> bytes:
+    buffer = io.BytesIO()
+    dump(program, buffer)
+
+    return buffer.getvalue()
+
+
+class _StringTable_(object):
+    """Strings of a loaded program, decoded when they are first read"""
+
+    def __init__(self, offsets, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+        self._decoded_ = {}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        text = self._decoded_.get(index)
+
+        if text is None:
+            if not 0 <= index < len(self):
+                raise IndexError(index)
+
+            text = self._decoded_[index] = str(self.data[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+        return text
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+
+def _layout_(nodes, numbers, strings, string_bytes, lists, list_items) -> list:
+    """Typecode and length of each column in file order"""
+    return [
+        ('B', nodes), ('B', nodes), ('q', nodes), *[('I', nodes)] * CHILD_COLUMNS, ('d', numbers),
+        ('I', strings + 1), ('B', string_bytes), ('I', lists + 1), ('I', list_items),
+    ]
+
+
+def _read_header_(buffer) -> tuple:
+    """Check the header and the size of the buffer and return the column layout and the program reference"""
+    with memoryview(buffer) as view:
+        size = view.nbytes
+
+        if size < _HEADER_.size:
+            raise ValueError("Truncated binary program")
+
+        magic, version, schema, *counts, root = _HEADER_.unpack_from(view)
+
+    if magic != MAGIC:
+        raise ValueError("Not a binary program")
+
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary program version {version}, expected {FORMAT_VERSION}")
+
+    if schema != SCHEMA_HASH:
+        raise ValueError("The binary program was written with different node classes")
+
+    layout = _layout_(*counts)
+    end = _HEADER_.size + len(_padding_(_HEADER_.size))
+
+    for typecode, length in layout:
+        column_size = length * array(typecode).itemsize
+        end += column_size + len(_padding_(column_size))
+
+    if end > size:
+        raise ValueError("Truncated binary program")
+
+    return layout, root
+
+
+def load(buffer) -> Arena:
+    """Load a program from a bytes-like object or a memory map without copying its columns.
+
+    The arena returned is read only and holds memoryviews of the buffer. Its nodes are read with views as usual
+    (see logo.arena).
+    """
+    layout, root = _read_header_(buffer)
+
+    buffer = memoryview(buffer).cast('B')
+    offset = _HEADER_.size + len(_padding_(_HEADER_.size))
+    columns = []
+
+    for typecode, length in layout:
+        end = offset + length * array(typecode).itemsize
+        column = buffer[offset:end]
+
+        if typecode == 'B':
+            pass
+        elif sys.byteorder == 'little':
+            column = column.cast(typecode)
+        else:
+            column = array(typecode, column.tobytes())
+            column.byteswap()
+
+        columns.append(column)
+        offset = end + len(_padding_(end - offset))
+
+    buffer.release()
+
+    arena = Arena()
+    arena.kinds, arena.operators, arena.positions, *children, arena.numbers, string_offsets, string_data, \
+        arena.list_offsets, arena.list_items = columns
+    arena.children = tuple(children)
+    arena.strings = _StringTable_(string_offsets, string_data)
+    arena.root = root
+
+    return arena
+
+
+class MappedProgram(object):
+    """Binary program file loaded through a read only memory map.
+
+    Only the pages of the nodes that are read are loaded from the file, so a worker can walk just the procedures it
+    needs: ``with MappedProgram(path) as arena: arena.procedure('SQUARE')``. The views of its nodes can't be used after
+    it is closed.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map_ = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self.arena = load(self._map_)
+        except BaseException:
+            self._map_.close()
+            raise
+
+    def close(self):
+        if self.arena is None:
+            return
+
+        arena = self.arena
+        self.arena = None
+
+        # The memory map can only be closed once the memoryviews over it are released
+        for column in [arena.kinds, arena.operators, arena.positions, *arena.children, arena.numbers,
+                       arena.strings.offsets, arena.strings.data, arena.list_offsets, arena.list_items]:
+            if isinstance(column, memoryview):
+                column.release()
+
+        self._map_.close()
+
+    def __enter__(self) -> Arena:
+        return self.arena
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,166 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from .parse import parse_source
+
+# Version of the stored format. Must be changed whenever the AST classes change.
+FORMAT_VERSION = 2
+
+DEFAULT_MAX_SIZE = 64 * 2 ** 20
+
+# Temporary files older than this, in seconds, were left by a writer that stopped before renaming them
+STALE_TEMPORARY_AGE = 3600
+
+_SUFFIX_ = '.ast'
+_TEMPORARY_SUFFIX_ = '.tmp'
+
+
+@functools.lru_cache(maxsize=None)
+def grammar_version() -> str:
+    """Version of the lexer and parser that produced the cached programs"""
+    import logo.lexer
+    import logo.parse
+    from .tables import lexer_hash, parser_hash
+
+    return f"{FORMAT_VERSION}:{lexer_hash(logo.lexer)}:{parser_hash(logo.parse)}"
+
+
+class ParseCache(object):
+    """Cache of parsed programs stored on disk, keyed by the hash of the source and the grammar version.
+
+    Each program is pickled to its own file. Files are written to a temporary name and renamed, so several processes
+    can share the same directory. When the total size goes over `max_size`, the least recently used files are removed.
+
+    The size of the directory is found by a scan on the first store, and then counted as files are stored, so the
+    directory is only scanned again when the count goes over `max_size`. Files stored by other processes are found by
+    that scan.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock_ = threading.Lock()
+        self._size_ = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def key(self, source: str) -> str:
+        return hashlib.sha256(f"{grammar_version()}\0{source}".encode()).hexdigest()
+
+    def _path_(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX_)
+
+    def parse(self, source: str, backend: str = None):
+        """Return the program of the source from the cache, parsing and storing it on a miss"""
+        key = self.key(source)
+
+        try:
+            program = self._load_(key)
+        except Exception:
+            # Missing, evicted by another process or unreadable: parse it again
+            self._count_(hit=False)
+        else:
+            self._count_(hit=True)
+            return program
+
+        program = parse_source(source, backend)
+        self._store_(key, program)
+
+        return program
+
+    def _count_(self, hit: bool):
+        with self._lock_:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _load_(self, key: str):
+        path = self._path_(key)
+
+        with open(path, 'rb') as f:
+            program = pickle.load(f)
+
+        # The modification time orders the files for eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return program
+
+    def _store_(self, key: str, program):
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=_TEMPORARY_SUFFIX_)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump(program, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+
+            os.replace(temporary, self._path_(key))
+        except BaseException:
+            _remove_(temporary)
+            raise
+
+        with self._lock_:
+            if self._size_ is not None:
+                self._size_ += size
+
+            scan = self._size_ is None or self._size_ > self.max_size
+
+        if scan:
+            self._evict_()
+
+    def _evict_(self):
+        """Remove the least recently used files until the size is under max_size, and the stale temporary files"""
+        entries = []
+        stale = time.time() - STALE_TEMPORARY_AGE
+
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            if entry.name.endswith(_SUFFIX_):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.endswith(_TEMPORARY_SUFFIX_) and stat.st_mtime < stale:
+                _remove_(entry.path)
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            _remove_(path)
+            total -= size
+
+        with self._lock_:
+            self._size_ = total
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX_):
+                _remove_(entry.path)
+
+        with self._lock_:
+            self._size_ = None
+
+
+def _remove_(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,153 @@
+import math
+
+from .lexer import TokenType
+from .nodes import rebuild
+from .parse import BinaryOperation, WhileStatement, IfStatement, Assignment, Nodes, parse_source
+
+_ARITHMETIC_ = {
+    TokenType.PLUS: lambda left, right: left + right,
+    TokenType.MINUS: lambda left, right: left - right,
+    TokenType.TIMES: lambda left, right: left * right,
+    TokenType.DIVIDE: lambda left, right: left / right,
+    TokenType.POW: lambda left, right: left ** right,
+}
+
+# NOT_EQUAL isn't folded: its code jumps as `<=` does, and the folded value would change what programs do. Neither is
+# NOT, whose code is listed after the jumps of its operand and doesn't run.
+_COMPARISONS_ = {
+    TokenType.GREATER_THAN: lambda left, right: left > right,
+    TokenType.GREATER_EQUAL: lambda left, right: left >= right,
+    TokenType.LESS_THAN: lambda left, right: left < right,
+    TokenType.LESS_EQUAL: lambda left, right: left <= right,
+    TokenType.IS_EQUAL: lambda left, right: left == right,
+}
+
+class FoldingNodes(Nodes):
+    """Node factory that folds the operations of literals.
+
+    Arithmetic of numbers is replaced by its result, as the VM computes it in floats, unless it divides by zero or
+    doesn't give a finite number. The value of comparisons of literals, and of AND and OR of them, is known, but the
+    node is kept until it's found where a literal can be used: the value of an assignment, the condition of IF, the
+    condition of a WHILE that never runs, and the operand of AND that only leaves the other operand. Elsewhere the
+    jumps of the node are still needed. Only what the code of the node does is folded, even where it isn't what the
+    operator means.
+
+    `folded` counts the operations removed from the program.
+    """
+
+    def __init__(self):
+        self.folded = 0
+        # Value and number of operations of the nodes with a known value, by node id. The nodes are kept so their ids
+        # aren't reused.
+        self.constants = {}
+
+    def _constant_(self, value):
+        """Known value and number of operations of a literal or node, or None if the value isn't known"""
+        if type(value) is bool:
+            return value, 0
+
+        constant = self.constants.get(id(value))
+
+        return None if constant is None else constant[1:]
+
+    def _literal_(self, value):
+        """The literal of a node with a known value, counting its operations as folded"""
+        constant = self._constant_(value)
+
+        if constant is None:
+            return value
+
+        self.folded += constant[1]
+
+        return constant[0]
+
+    def _known_(self, node, value, operations: int):
+        self.constants[id(node)] = node, value, operations
+
+        return node
+
+    def BinaryOperation(self, op, left, right, position=0):
+        if op in _ARITHMETIC_:
+            if type(left) is float and type(right) is float:
+                try:
+                    value = _ARITHMETIC_[op](left, right)
+                except (ZeroDivisionError, OverflowError):
+                    value = None
+
+                if type(value) is float and math.isfinite(value):
+                    self.folded += 1
+
+                    return value
+
+            return BinaryOperation(op, left, right, position)
+
+        node = BinaryOperation(op, left, right, position)
+
+        if op in _COMPARISONS_:
+            if type(left) is float and type(right) is float:
+                return self._known_(node, _COMPARISONS_[op](left, right), 1)
+
+            return node
+
+        if op not in (TokenType.AND, TokenType.OR):
+            return node
+
+        # Only operations with a known value are folded, as their code jumps as the value says: the code of a TRUE or
+        # FALSE operand doesn't jump at all
+        left_constant = self.constants.get(id(left))
+        right_constant = self.constants.get(id(right))
+
+        if left_constant is not None and right_constant is not None:
+            value = left_constant[1] and right_constant[1] if op is TokenType.AND else left_constant[1] or right_constant[1]
+
+            # The right operand of a false OR jumps back to itself, so the code of OR only has the value when it's true
+            if op is TokenType.OR and not value:
+                return node
+
+            return self._known_(node, value, 1 + left_constant[2] + right_constant[2])
+
+        if op is TokenType.OR:
+            return node
+
+        # `TRUE AND x` and `x AND TRUE` are `x`, when x is an operation that jumps by itself. A literal TRUE is only
+        # left out on the left, where its code is followed by the one of x.
+        if isinstance(right, BinaryOperation) and (left is True or left_constant is not None and left_constant[1]):
+            self.folded += 1 + (0 if left_constant is None else left_constant[2])
+
+            return right
+
+        if isinstance(left, BinaryOperation) and right_constant is not None and right_constant[1]:
+            self.folded += 1 + right_constant[2]
+
+            return left
+
+        return node
+
+    def WhileStatement(self, condition, body, position=0):
+        # The code of a literal TRUE condition runs the body once, so only a loop that never runs is folded
+        constant = self._constant_(condition)
+
+        if constant is not None and constant[0] is False:
+            condition = self._literal_(condition)
+
+        return WhileStatement(condition, body, position)
+
+    def IfStatement(self, condition, body, else_body, position=0):
+        return IfStatement(self._literal_(condition), body, else_body, position)
+
+    def Assignment(self, variable, value, position=0):
+        return Assignment(variable, self._literal_(value), position)
+
+
+def parse_folded(source: str, backend: str = None):
+    """Parse the source folding the constant expressions. Return the program and the number of folded operations"""
+    nodes = FoldingNodes()
+
+    return parse_source(source, backend, nodes), nodes.folded
+
+
+def fold_program(program):
+    """Return a copy of the program with the constant expressions folded, and the number of folded operations"""
+    nodes = FoldingNodes()
+
+    return rebuild(program, nodes), nodes.folded
@@ -0,0 +1,245 @@
+import bisect
+
+from .nodes import AstNode, COLUMN_BITS
+from .parse import parse_source
+from .scanner import MASTER_PATTERN, KEYWORDS
+from .lexer import t_ignore
+
+# Tokens that open a block closed by END
+_OPEN_BLOCK_ = {'TO', 'IF', 'WHILE'}
+
+# Characters that open a string
+_QUOTES_ = '"\''
+
+
+# Size of the pieces compared at once when looking for the changed text
+_CHUNK_SIZE_ = 4096
+
+
+def _common_prefix_(a: str, b: str) -> int:
+    length = min(len(a), len(b))
+    position = 0
+
+    while position + _CHUNK_SIZE_ <= length and a[position:position + _CHUNK_SIZE_] == b[position:position + _CHUNK_SIZE_]:
+        position += _CHUNK_SIZE_
+
+    end = min(position + _CHUNK_SIZE_, length)
+
+    while position < end and a[position] == b[position]:
+        position += 1
+
+    return position
+
+
+def _common_suffix_(a: str, b: str, limit: int) -> int:
+    size = 0
+
+    while size + _CHUNK_SIZE_ <= limit and \
+            a[len(a) - size - _CHUNK_SIZE_:len(a) - size] == b[len(b) - size - _CHUNK_SIZE_:len(b) - size]:
+        size += _CHUNK_SIZE_
+
+    end = min(size + _CHUNK_SIZE_, limit)
+
+    while size < end and a[len(a) - size - 1] == b[len(b) - size - 1]:
+        size += 1
+
+    return size
+
+
+def _shift_lines_(statements, lines: int):
+    """Move the nodes of the statements `lines` lines down, in place"""
+    offset = lines << COLUMN_BITS
+    pending = list(statements)
+    push = pending.extend
+
+    while pending:
+        value = pending.pop()
+
+        if type(value) is list:
+            push(child for child in value if isinstance(child, (list, AstNode)))
+            continue
+
+        if value.position:
+            value.position += offset
+
+        push(child for child in value._values_() if isinstance(child, (list, AstNode)))
+
+
+def _statement_starts_(source: str, begin: int, can_stop, quotes: list):
+    """Yield the positions of the top level statements from `begin`.
+
+    A top level statement starts with TO, IF, WHILE or an identifier that doesn't follow a colon, outside of any
+    TO, IF or WHILE block. The scan stops at the first statement start for which `can_stop` is true, unless an illegal
+    character was found, in which case the rest of the source is scanned. The positions of the quotes that aren't
+    closed are appended to `quotes`.
+    """
+    match = MASTER_PATTERN.match
+    position = begin
+    length = len(source)
+    depth = 0
+    previous = None
+    error = False
+
+    while position < length:
+        if source[position] in t_ignore:
+            position += 1
+            continue
+
+        m = match(source, position)
+
+        if m is None:
+            if source[position] in _QUOTES_:
+                quotes.append(position)
+
+            error = True
+            position += 1
+            continue
+
+        kind = m.lastgroup
+
+        if kind == 'newline':
+            position = m.end()
+            continue
+
+        if kind == 'ID':
+            kind = KEYWORDS.get(m.group(), 'ID')
+
+        if depth == 0 and (kind in _OPEN_BLOCK_ or kind == 'ID' and previous != 'COLON'):
+            if not error and can_stop(position):
+                return
+
+            yield position
+
+        if kind in _OPEN_BLOCK_:
+            depth += 1
+        elif kind == 'END':
+            depth -= 1
+
+        previous = kind
+        position = m.end()
+
+
+class IncrementalParser(object):
+    """Parser that keeps the program of a source and reparses only the top level statements changed by an edit.
+
+    The source is split in blocks, each one holding one top level statement and the text up to the next one. After an
+    edit, only the blocks overlapping the changed text, plus the block before them, are scanned and parsed again, until
+    the scan reaches the start of an unchanged block in a clean state. As an edit can close a quote left open before
+    it, the scan starts instead at the first block holding a quote that isn't closed, if there is one before the edit.
+    """
+
+    def __init__(self, source: str = '', backend: str = None):
+        self.backend = backend
+        self.source = ''
+        self.program = []
+        self.reparsed_blocks = 0
+
+        self._starts_ = []
+        # For each block, whether it holds a quote that isn't closed
+        self._open_quotes_ = []
+
+        self.update(source)
+
+    def update(self, source: str):
+        """Replace the source by a new version and return the updated program"""
+        prefix = _common_prefix_(self.source, source)
+        suffix = _common_suffix_(self.source, source, min(len(self.source), len(source)) - prefix)
+
+        return self.edit(prefix, len(self.source) - suffix, source[prefix:len(source) - suffix])
+
+    def edit(self, start: int, end: int, text: str):
+        """Replace the text between the positions `start` and `end` and return the updated program"""
+        if start == end and not text:
+            return self.program
+
+        source = self.source[:start] + text + self.source[end:]
+        delta = len(text) - (end - start)
+        starts = self._starts_
+        open_quotes = self._open_quotes_
+
+        # The scan starts at the block before the one containing the edit, as the edit may turn the beginning of a
+        # statement into arguments of the previous one
+        first = max(bisect.bisect_right(starts, start) - 2, 0)
+
+        if True in open_quotes[:first]:
+            first = open_quotes.index(True)
+
+        begin = starts[first] if starts else 0
+
+        # Index of the first block after the edit that is known to be unchanged
+        last = len(starts)
+        candidates = bisect.bisect_left(starts, end)
+
+        def can_stop(position):
+            nonlocal last
+
+            # A block on the same line as the edit is parsed again, as its columns may have changed
+            if position < start + len(text) or source.find('\n', start + len(text), position) == -1:
+                return False
+
+            index = bisect.bisect_left(starts, position - delta, candidates)
+
+            if index < len(starts) and starts[index] == position - delta:
+                last = index
+                return True
+
+            return False
+
+        quotes = []
+        new_starts = list(_statement_starts_(source, begin, can_stop, quotes))
+        stop = starts[last] + delta if last < len(starts) else len(source)
+
+        # The first block also holds any text before the first statement
+        if first == 0:
+            if new_starts:
+                new_starts[0] = 0
+            elif source[:stop].strip():
+                new_starts = [0]
+
+        statements = []
+        blocks = []
+        new_open_quotes = []
+        line = source.count('\n', 0, new_starts[0]) + 1 if new_starts else 1
+
+        for block_start, block_end in zip(new_starts, new_starts[1:] + [stop]):
+            statement = self._parse_block_(source, block_start, block_end, line)
+            line += source.count('\n', block_start, block_end)
+
+            # Only a block made of illegal characters has no statement
+            if statement is None:
+                continue
+
+            index = bisect.bisect_left(quotes, block_start)
+
+            statements.append(statement)
+            blocks.append(block_start)
+            new_open_quotes.append(index < len(quotes) and quotes[index] < block_end)
+
+        # The blocks after the edit are kept, but the edit may have moved them to other lines
+        lines = text.count('\n') - self.source.count('\n', start, end)
+
+        if lines:
+            _shift_lines_(self.program[last:], lines)
+
+        self.source = source
+        self.program[first:last] = statements
+        self._starts_ = starts[:first] + blocks + [position + delta for position in starts[last:]]
+        self._open_quotes_ = open_quotes[:first] + new_open_quotes + open_quotes[last:]
+        self.reparsed_blocks = len(statements)
+
+        return self.program
+
+    def _parse_block_(self, source: str, start: int, end: int, line: int):
+        """Parse the block of the source between `start` and `end`, which starts at the line `line`. Return its
+        statement, or None if it has none.
+        """
+        # The text before the block in its first line is replaced by spaces, so the columns are the ones in the source
+        line_start = source.rfind('\n', 0, start) + 1
+        text = ' ' * (start - line_start) + source[start:end]
+
+        program = parse_source(text, self.backend, line=line) or []
+
+        if len(program) > 1:
+            raise Exception(f"Expected one top level statement, found {len(program)}")
+
+        return program[0] if program else None
@@ -0,0 +1,97 @@
+import struct
+
+from .nodes import AstNode, rebuild
+from .parse import BinaryOperation, NotOperation, WhileStatement, IfStatement, Assignment, DeclareFunction, \
+    InvokeFunction, Identifier, Nodes, parse_source
+
+
+class InterningNodes(Nodes):
+    """Node factory that shares the expressions that are structurally equal.
+
+    Expressions (identifiers, operations and the literals in them) are immutable, so every expression equal to one
+    created before is replaced by it. As the parser builds the nodes bottom up, the children of a new expression are
+    already shared and the lookup key only needs their identity. Statements hold lists and are never shared.
+
+    A shared expression keeps the position of its first occurrence.
+    """
+
+    def __init__(self):
+        self.table = {}
+
+    def _key_(self, value):
+        if isinstance(value, AstNode):
+            return id(value)
+
+        # The type is part of the key so TRUE and 1.0, which are equal, are kept apart. Numbers are keyed by their bits,
+        # as -0.0 is equal to 0.0 too.
+        if type(value) is float:
+            return float, struct.pack('d', value)
+
+        return type(value), value
+
+    def _value_(self, value):
+        """Shared copy of a literal or expression given to a node"""
+        if value is None or isinstance(value, AstNode):
+            return value
+
+        return self.table.setdefault(self._key_(value), value)
+
+    def BinaryOperation(self, op, left, right, position=0):
+        left = self._value_(left)
+        right = self._value_(right)
+
+        key = BinaryOperation, op, self._key_(left), self._key_(right)
+        shared = self.table.get(key)
+
+        if shared is None:
+            shared = self.table[key] = BinaryOperation(op, left, right, position)
+
+        return shared
+
+    def NotOperation(self, expression, position=0):
+        expression = self._value_(expression)
+
+        key = NotOperation, self._key_(expression)
+        shared = self.table.get(key)
+
+        if shared is None:
+            shared = self.table[key] = NotOperation(expression, position)
+
+        return shared
+
+    def Identifier(self, value, position=0):
+        key = Identifier, value
+        shared = self.table.get(key)
+
+        if shared is None:
+            shared = self.table[key] = Identifier(value, position)
+
+        return shared
+
+    def WhileStatement(self, condition, body, position=0):
+        return WhileStatement(self._value_(condition), body, position)
+
+    def IfStatement(self, condition, body, else_body, position=0):
+        return IfStatement(self._value_(condition), body, else_body, position)
+
+    def Assignment(self, variable, value, position=0):
+        return Assignment(variable, self._value_(value), position)
+
+    def InvokeFunction(self, name, args, position=0):
+        if args is not None:
+            args = [self._value_(arg) for arg in args]
+
+        return InvokeFunction(name, args, position)
+
+    def DeclareFunction(self, name, args, body, position=0):
+        return DeclareFunction(name, args, body, position)
+
+
+def parse_interned(source: str, backend: str = None):
+    """Parse the source sharing the equal expressions"""
+    return parse_source(source, backend, InterningNodes())
+
+
+def intern_program(program, nodes: InterningNodes = None):
+    """Return a copy of the program that shares the equal expressions"""
+    return rebuild(program, nodes if nodes is not None else InterningNodes())
@@ -1,7 +1,8 @@
+import functools
+import os
+import sys
 from enum import Enum, auto
 
-import ply.lex as lex
-
 
 reserved_words = {
    'IF': 'IF',
@@ -112,6 +113,7 @@ def t_ID(t):
 
 def t_STRING(t):
     r"""("[^"]*"|'[^']*')"""
+    t.lexer.lineno += t.value.count('\n')
     t.value = t.value[1:-1]
     return t
 
@@ -132,11 +134,45 @@ def t_error(t):
     t.lexer.skip(1)
 
 
-lexer = lex.lex()
+@functools.lru_cache(maxsize=None)
+def get_lexer():
+    """Return the lexer shared by the module, building it on first use"""
+    from .tables import build_lexer
+
+    return build_lexer(sys.modules[__name__])
+
+
+# Lexer used by the thread safe entry points, such as parse_source: 'ply' or the hand written 'scanner'
+LEXER_BACKEND = os.environ.get('LOGO_LEXER_BACKEND', 'ply')
+
+LEXER_BACKENDS = ['ply', 'scanner']
+
+
+def new_lexer(backend: str = None):
+    """Return a new lexer of the backend, or of LEXER_BACKEND if none is given"""
+    backend = backend or LEXER_BACKEND
+
+    if backend == 'ply':
+        return get_lexer().clone()
+    elif backend == 'scanner':
+        from .scanner import Scanner
+
+        return Scanner()
+
+    raise ValueError(f"Unknown lexer backend '{backend}', expected one of {LEXER_BACKENDS}")
+
+
+def __getattr__(name):
+    # The module level lexer is only built when it is first accessed
+    if name == 'lexer':
+        return get_lexer()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
     # Build the lexer
+    lexer = get_lexer()
 
     # Test it out
     data = '''
@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'COLON', 'DIVIDE', 'ELSE', 'END', 'EQUAL', 'FALSE', 'GREATER_EQUAL', 'GREATER_THAN', 'ID', 'IF', 'IS_EQUAL', 'LESS_EQUAL', 'LESS_THAN', 'LPAREN', 'MINUS', 'NOT', 'NOT_EQUAL', 'NUMBER', 'OR', 'PLUS', 'POW', 'RPAREN', 'SET', 'STRING', 'THEN', 'TIMES', 'TO', 'TRUE', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NUMBER>(-)?[0-9]+(\\.[0-9]+)?)|(?P<t_ID>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_STRING>("[^"]*"|\'[^\']*\'))|(?P<t_newline>\\n+)|(?P<t_GREATER_EQUAL>>=)|(?P<t_IS_EQUAL>==)|(?P<t_LESS_EQUAL><=)|(?P<t_LPAREN>\\()|(?P<t_NOT_EQUAL><>)|(?P<t_PLUS>\\+)|(?P<t_POW>\\^)|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_COLON>:)|(?P<t_DIVIDE>/)|(?P<t_EQUAL>=)|(?P<t_GREATER_THAN>>)|(?P<t_LESS_THAN><)|(?P<t_MINUS>-)', [None, ('t_NUMBER', 'NUMBER'), None, None, ('t_ID', 'ID'), ('t_STRING', 'STRING'), None, ('t_newline', 'newline'), (None, 'GREATER_EQUAL'), (None, 'IS_EQUAL'), (None, 'LESS_EQUAL'), (None, 'LPAREN'), (None, 'NOT_EQUAL'), (None, 'PLUS'), (None, 'POW'), (None, 'RPAREN'), (None, 'TIMES'), (None, 'COLON'), (None, 'DIVIDE'), (None, 'EQUAL'), (None, 'GREATER_THAN'), (None, 'LESS_THAN'), (None, 'MINUS')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_grammar_hash = 'e1c22fba89d78d3c477b079fb7c4467e5a4f2c81587274cbe526e1c625db5541'
@@ -0,0 +1,148 @@
+import sys
+
+# Source positions are packed in a single int: the line in the high bits and the column in the low COLUMN_BITS bits.
+# Position 0 means the node wasn't created from source, e.g. it was built by hand.
+COLUMN_BITS = 16
+COLUMN_MASK = (1 << COLUMN_BITS) - 1
+
+
+def pack_position(line: int, column: int) -> int:
+    """Pack a line and column in one int. Columns that don't fit in COLUMN_BITS are clamped"""
+    return line << COLUMN_BITS | min(column, COLUMN_MASK)
+
+
+def unpack_position(position: int) -> tuple:
+    """Return the line and column packed by pack_position"""
+    return position >> COLUMN_BITS, position & COLUMN_MASK
+
+
+class AstNode(object):
+    """Base class of the AST nodes.
+
+    Nodes keep their fields in slots plus the packed source position, so they take less memory than a namedtuple with
+    a separate position object. They still behave like the namedtuples they replace: they can be unpacked, indexed and
+    compared, and the position is ignored by the comparison.
+    """
+    __slots__ = ('position',)
+
+    _fields = ()
+
+    # Node class created by node_type. Subclasses that read the fields from elsewhere, like the arena views, compare
+    # equal to the nodes of this class.
+    _type_ = None
+
+    def _values_(self) -> tuple:
+        raise NotImplementedError
+
+    @property
+    def line(self) -> int:
+        return self.position >> COLUMN_BITS
+
+    @property
+    def column(self) -> int:
+        return self.position & COLUMN_MASK
+
+    def __eq__(self, other):
+        if getattr(other, '_type_', None) is not self._type_:
+            return NotImplemented
+
+        return self._values_() == other._values_()
+
+    def __ne__(self, other):
+        if getattr(other, '_type_', None) is not self._type_:
+            return NotImplemented
+
+        return self._values_() != other._values_()
+
+    def __hash__(self):
+        return hash(self._values_())
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __iter__(self):
+        return iter(self._values_())
+
+    def __getitem__(self, index):
+        return self._values_()[index]
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={value!r}" for name, value in zip(self._fields, self._values_()))
+
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        return self._type_, self._values_() + (self.position,)
+
+    def _replace(self, **fields):
+        values = dict(zip(self._fields, self._values_()), position=self.position)
+        values.update(fields)
+
+        return self._type_(**values)
+
+
+def node_type(name: str, field_names: str, module: str = None) -> type:
+    """Create an AST node class, declared like a namedtuple: ``node_type('Assignment', 'variable value')``.
+
+    The constructor takes the fields in order and an optional packed `position`.
+    """
+    fields = tuple(field_names.split())
+    arguments = ', '.join(fields)
+
+    # As with namedtuple, the constructor is compiled for the fields instead of looping over them on every node
+    source = (
+        f"def __init__(self, {arguments}, position=0):\n"
+        + ''.join(f"    self.{field} = {field}\n" for field in fields)
+        + "    self.position = position\n"
+        f"def _values_(self):\n"
+        f"    return ({''.join(f'self.{field}, ' for field in fields)})\n"
+    )
+
+    namespace = {}
+    exec(source, namespace)
+
+    if module is None:
+        module = sys._getframe(1).f_globals.get('__name__', '__main__')
+
+    cls = type(name, (AstNode,), {
+        '__slots__': fields,
+        '__module__': module,
+        '_fields': fields,
+        '__init__': namespace['__init__'],
+        '_values_': namespace['_values_'],
+    })
+    cls._type_ = cls
+
+    return cls
+
+
+def rebuild(program, nodes):
+    """Create the program again with the node factory `nodes` (see logo.parse.Nodes), bottom up like the parser.
+
+    The tree is walked with an explicit stack, so deep expressions don't reach the recursion limit.
+    """
+    results = []
+    pending = [(program, False)]
+
+    while pending:
+        value, children_done = pending.pop()
+
+        if not isinstance(value, (list, AstNode)):
+            results.append(value)
+            continue
+
+        if not children_done:
+            pending.append((value, True))
+            pending.extend((child, False) for child in reversed(list(value)))
+            continue
+
+        start = len(results) - len(value)
+        children = results[start:]
+        del results[start:]
+
+        if isinstance(value, list):
+            results.append(children)
+        else:
+            results.append(getattr(nodes, value._type_.__name__)(*children, position=value.position))
+
+    return results[0]
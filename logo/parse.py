@@ -1,23 +1,27 @@
 import collections
+import contextlib
+import copy
+import functools
 import itertools
+import sys
+import threading
 
-import ply.yacc as yacc
+from .lexer import TokenType, tokens, new_lexer, LEXER_BACKEND, ARITHMETIC_OPERATORS, BOOL_CONDITION_OPERATORS
+from .nodes import node_type, pack_position
 
-from .lexer import TokenType, lexer, tokens, ARITHMETIC_OPERATORS, BOOL_CONDITION_OPERATORS
+BinaryOperation = node_type('BinaryOperation', 'op left right')
 
-BinaryOperation = collections.namedtuple('BinaryOperation', 'op left right')
+NotOperation = node_type('NotOperation', 'expression')
 
-NotOperation = collections.namedtuple('NotOperation', 'expression')
+WhileStatement = node_type('WhileStatement', 'condition body')
+IfStatement = node_type('IfStatement', 'condition body else_body')
 
-WhileStatement = collections.namedtuple('WhileStatement', 'condition body')
-IfStatement = collections.namedtuple('IfStatement', 'condition body else_body')
+Assignment = node_type('Assignment', 'variable value')
 
-Assignment = collections.namedtuple('Assignment', 'variable value')
+DeclareFunction = node_type('DeclareFunction', 'name args body')
+InvokeFunction = node_type('InvokeFunction', 'name args')
 
-DeclareFunction = collections.namedtuple('DeclareFunction', 'name args body')
-InvokeFunction = collections.namedtuple('InvokeFunction', 'name args')
-
-Identifier = collections.namedtuple('Identifier', 'value')
+Identifier = node_type('Identifier', 'value')
 
 Node = collections.namedtuple('Node', 'children')
 Leaf = collections.namedtuple('Leaf', 'value')
@@ -31,13 +35,32 @@ def filter_none(elements):
     return list(filter(lambda x: x is not None, elements))
 
 
+def _position_(p, index: int) -> int:
+    """Packed line and column of the token at `index` of the production"""
+    token = p.slice[index]
+
+    # Lexers that don't keep the whole source, like the stream lexer, compute the column of each token
+    column = getattr(token, 'column', None)
+
+    if column is None:
+        column = token.lexpos - p.lexer.lexdata.rfind('\n', 0, token.lexpos)
+
+    return pack_position(token.lineno, column)
+
+
 def to_list(p):
+    """Append the new element to the list built by the left recursive rule.
+
+    The list is created once by the first element and then extended in place,
+    so building a list of N elements is linear and keeps the parser stack flat.
+    An empty list is represented by None.
+    """
     if len(p) > 2:
-        if p[2] is None:
-            p[0] = [p[1]]
+        if p[1] is None:
+            p[0] = [p[2]]
         else:
-            p[0] = [p[1]]
-            p[0].extend(p[2])
+            p[0] = p[1]
+            p[0].append(p[2])
 
 
 def p_program(p):
@@ -46,7 +69,7 @@ def p_program(p):
 
 
 def p_statement_list(p):
-    """statement_list : statement statement_list
+    """statement_list : statement_list statement
                       |
     """
     to_list(p)
@@ -64,11 +87,11 @@ def p_statement(p):
 
 def p_invoke_function(p):
     """invoke_function : ID function_args"""
-    p[0] = InvokeFunction(p[1], args=p[2])
+    p[0] = p.parser.nodes.InvokeFunction(p[1], args=p[2], position=_position_(p, 1))
 
 
 def p_function_args(p):
-    """function_args : function_arg function_args
+    """function_args : function_args function_arg
                      |
     """
     to_list(p)
@@ -85,11 +108,11 @@ def p_function_arg(p):
 
 def p_declare_func(p):
     'declare_func : TO ID declare_func_args statement_list END'
-    p[0] = DeclareFunction(p[2], p[3], p[4])
+    p[0] = p.parser.nodes.DeclareFunction(p[2], p[3], p[4], _position_(p, 1))
 
 
 def p_declare_func_args(p):
-    """declare_func_args : declare_func_arg declare_func_args
+    """declare_func_args : declare_func_args declare_func_arg
                          |
     """
     to_list(p)
@@ -102,38 +125,38 @@ def p_declare_func_arg(p):
 
 def p_if(p):
     """if : IF LPAREN expression RPAREN THEN statement_list  END"""
-    _assert_bool_expression_(p[3])
+    p.parser.nodes.assert_bool_expression(p[3])
 
-    p[0] = IfStatement(p[3], p[6], else_body=None)
+    p[0] = p.parser.nodes.IfStatement(p[3], p[6], else_body=None, position=_position_(p, 1))
 
 
 def p_if_else(p):
     """if : IF LPAREN expression RPAREN THEN statement_list ELSE statement_list END"""
-    _assert_bool_expression_(p[3])
+    p.parser.nodes.assert_bool_expression(p[3])
 
-    p[0] = IfStatement(p[3], p[6], p[8])
+    p[0] = p.parser.nodes.IfStatement(p[3], p[6], p[8], _position_(p, 1))
 
 
 def p_while(p):
     """while : WHILE LPAREN expression RPAREN statement_list END"""
-    _assert_bool_expression_(p[3])
+    p.parser.nodes.assert_bool_expression(p[3])
 
-    p[0] = WhileStatement(p[3], p[5])
+    p[0] = p.parser.nodes.WhileStatement(p[3], p[5], _position_(p, 1))
 
 
 def p_assignment(p):
     """assignment : ID EQUAL expression"""
-    p[0] = Assignment(p[1], p[3])
+    p[0] = p.parser.nodes.Assignment(p[1], p[3], _position_(p, 1))
 
 
 def p_expression_and(p):
     'expression : expression AND expression'
-    p[0] = BinaryOperation(TokenType.AND, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.AND, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_or(p):
     'expression : expression OR expression'
-    p[0] = BinaryOperation(TokenType.OR, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.OR, p[1], p[3], _position_(p, 2))
 
 
 def p_expression_string(p):
@@ -147,7 +170,7 @@ def p_bool_expression(p):
 
 def p_bool_expression_not(p):
     'expression_not : NOT bool_expression_eq'
-    p[0] = NotOperation(p[2])
+    p[0] = p.parser.nodes.NotOperation(p[2], _position_(p, 1))
 
 
 def p_bool_expression_not_e(p):
@@ -157,32 +180,32 @@ def p_bool_expression_not_e(p):
 
 def p_bool_expression_gt(p):
     'bool_expression_eq : math_expression GREATER_THAN math_expression'
-    p[0] = BinaryOperation(TokenType.GREATER_THAN, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.GREATER_THAN, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_gte(p):
     'bool_expression_eq : math_expression GREATER_EQUAL math_expression'
-    p[0] = BinaryOperation(TokenType.GREATER_EQUAL, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.GREATER_EQUAL, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_lt(p):
     'bool_expression_eq : math_expression LESS_THAN math_expression'
-    p[0] = BinaryOperation(TokenType.LESS_THAN, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.LESS_THAN, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_lte(p):
     'bool_expression_eq : math_expression LESS_EQUAL math_expression'
-    p[0] = BinaryOperation(TokenType.LESS_EQUAL, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.LESS_EQUAL, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_eq(p):
     'bool_expression_eq : math_expression IS_EQUAL math_expression'
-    p[0] = BinaryOperation(TokenType.IS_EQUAL, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.IS_EQUAL, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_neq(p):
     'bool_expression_eq : math_expression NOT_EQUAL math_expression'
-    p[0] = BinaryOperation(TokenType.NOT_EQUAL, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.NOT_EQUAL, p[1], p[3], _position_(p, 2))
 
 
 def p_bool_expression_m(p):
@@ -209,12 +232,12 @@ def p_expression_p(p):
 
 def p_math_expression_plus(p):
     'math_expression : math_expression PLUS term'
-    p[0] = BinaryOperation(TokenType.PLUS, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.PLUS, p[1], p[3], _position_(p, 2))
 
 
 def p_math_expression_minus(p):
     'math_expression : math_expression MINUS term'
-    p[0] = BinaryOperation(TokenType.MINUS, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.MINUS, p[1], p[3], _position_(p, 2))
 
 
 def p_math_expression_term(p):
@@ -224,12 +247,12 @@ def p_math_expression_term(p):
 
 def p_term_times(p):
     'term : term TIMES pow'
-    p[0] = BinaryOperation(TokenType.TIMES, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.TIMES, p[1], p[3], _position_(p, 2))
 
 
 def p_term_div(p):
     'term : term DIVIDE pow'
-    p[0] = BinaryOperation(TokenType.DIVIDE, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.DIVIDE, p[1], p[3], _position_(p, 2))
 
 
 def p_term_factor(p):
@@ -239,7 +262,7 @@ def p_term_factor(p):
 
 def p_pow(p):
     'pow : factor POW factor'
-    p[0] = BinaryOperation(TokenType.POW, p[1], p[3])
+    p[0] = p.parser.nodes.BinaryOperation(TokenType.POW, p[1], p[3], _position_(p, 2))
 
 
 def p_pow_factor(p):
@@ -258,31 +281,59 @@ def p_factor_id(p):
 
 def p_id(p):
     """id : COLON ID"""
-    p[0] = Identifier(p[2])
+    p[0] = p.parser.nodes.Identifier(p[2], _position_(p, 1))
 
 def p_factor_expr(p):
     'factor : LPAREN math_expression RPAREN'
     p[0] = p[2]
 
 
-def _assert_bool_expression_(p):
-    if isinstance(p, (Identifier, bool)):
-        return
-    elif isinstance(p, BinaryOperation):
-        _assert_bool_condition_(p)
-    elif isinstance(p, NotOperation):
-        _assert_bool_condition_(p.expression)
-    else:
-        raise Exception(f"Unexpected token for boolean expression: {p}")
+def _assert_bool_expression_(expression):
+    """Raise an exception if the expression can't be used as a boolean condition.
+
+    The operands of AND and OR are kept in an explicit stack, so long chains of conditions don't reach the recursion
+    limit.
+    """
+    pending = [expression]
 
+    while pending:
+        p = pending.pop()
 
-def _assert_bool_condition_(p: BinaryOperation):
-    if p.op in ARITHMETIC_OPERATORS:
-        raise Exception(f"Unexpected math operator in bool expression: Line {p}")
+        if isinstance(p, (Identifier, bool)):
+            continue
+        elif isinstance(p, NotOperation):
+            # The operand of NOT is checked as an operation, whatever it is
+            p = p.expression
+        elif not isinstance(p, BinaryOperation):
+            raise Exception(f"Unexpected token for boolean expression: {p}")
 
-    if p.op in BOOL_CONDITION_OPERATORS:
-        _assert_bool_expression_(p.left)
-        _assert_bool_expression_(p.right)
+        if p.op in ARITHMETIC_OPERATORS:
+            raise Exception(f"Unexpected math operator in bool expression: Line {p}")
+
+        if p.op in BOOL_CONDITION_OPERATORS:
+            pending.append(p.right)
+            pending.append(p.left)
+
+
+class Nodes(object):
+    """Node factory used by the parser actions, found in the `nodes` attribute of the parser.
+
+    This one creates the node classes of this module. Other factories with the same methods can store the nodes in a
+    different form, like logo.arena.Arena.
+    """
+    BinaryOperation = BinaryOperation
+    NotOperation = NotOperation
+    WhileStatement = WhileStatement
+    IfStatement = IfStatement
+    Assignment = Assignment
+    DeclareFunction = DeclareFunction
+    InvokeFunction = InvokeFunction
+    Identifier = Identifier
+
+    assert_bool_expression = staticmethod(_assert_bool_expression_)
+
+
+NODES = Nodes()
 
 
 def to_bool(bool_str):
@@ -307,4 +358,62 @@ def p_error(token):
     raise Exception("Syntax error at EOF.")
 
 
-parser = yacc.yacc()
+@functools.lru_cache(maxsize=None)
+def get_parser():
+    """Return the parser shared by the module, building it on first use"""
+    from .tables import build_parser
+
+    return build_parser(sys.modules[__name__])
+
+
+# Lexer and parser pairs that are not being used by any thread, by lexer backend
+_idle_instances_ = collections.defaultdict(list)
+_idle_instances_lock_ = threading.Lock()
+
+
+@contextlib.contextmanager
+def parser_instance(backend: str = None):
+    """Borrow a lexer and parser pair for the exclusive use of the caller.
+
+    The shared lexer and parser keep the state of the input being parsed, so they can't be used by two threads at once.
+    The pairs are copies of them that are returned to a pool after use.
+    """
+    backend = backend or LEXER_BACKEND
+
+    with _idle_instances_lock_:
+        idle = _idle_instances_[backend]
+        instance = idle.pop() if idle else None
+
+    if instance is None:
+        instance = new_lexer(backend), copy.copy(get_parser())
+
+    try:
+        yield instance
+    finally:
+        with _idle_instances_lock_:
+            _idle_instances_[backend].append(instance)
+
+
+def parse_source(source: str, backend: str = None, nodes: Nodes = NODES, line: int = 1):
+    """Parse the source and return the program. Safe to be called from several threads.
+
+    The lexer backend defaults to LEXER_BACKEND. The nodes are created by the factory `nodes`. `line` is the number of
+    the first line of the source, for sources cut from a larger text.
+    """
+    with parser_instance(backend) as (lexer, parser):
+        lexer.lineno = line
+        parser.nodes = nodes
+
+        try:
+            return parser.parse(source, lexer=lexer)
+        finally:
+            parser.nodes = NODES
+
+
+def __getattr__(name):
+    # The module level parser is only built when it is first accessed
+    if name == 'parser':
+        return get_parser()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
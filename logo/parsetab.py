@@ -0,0 +1,83 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AND COLON DIVIDE ELSE END EQUAL FALSE GREATER_EQUAL GREATER_THAN ID IF IS_EQUAL LESS_EQUAL LESS_THAN LPAREN MINUS NOT NOT_EQUAL NUMBER OR PLUS POW RPAREN SET STRING THEN TIMES TO TRUE WHILEprogram : statement_liststatement_list : statement_list statement\n                      |\n    statement : invoke_function\n                 | assignment\n                 | declare_func\n                 | if\n                 | while\n    invoke_function : ID function_argsfunction_args : function_args function_arg\n                     |\n    function_arg : NUMBER\n                    | STRING\n                    | bool_literal\n                    | id\n    declare_func : TO ID declare_func_args statement_list ENDdeclare_func_args : declare_func_args declare_func_arg\n                         |\n    declare_func_arg : COLON IDif : IF LPAREN expression RPAREN THEN statement_list  ENDif : IF LPAREN expression RPAREN THEN statement_list ELSE statement_list ENDwhile : WHILE LPAREN expression RPAREN statement_list ENDassignment : ID EQUAL expressionexpression : expression AND expressionexpression : expression OR expressionexpression : STRINGexpression : expression_notexpression_not : NOT bool_expression_eqexpression_not : bool_expression_eqbool_expression_eq : math_expression GREATER_THAN math_expressionbool_expression_eq : math_expression GREATER_EQUAL math_expressionbool_expression_eq : math_expression LESS_THAN math_expressionbool_expression_eq : math_expression LESS_EQUAL math_expressionbool_expression_eq : math_expression IS_EQUAL math_expressionbool_expression_eq : math_expression NOT_EQUAL math_expressionbool_expression_eq : math_expressionbool_expression_eq : bool_literalbool_literal : TRUE\n                    | FALSE\n    bool_expression_eq : LPAREN expression RPARENmath_expression : math_expression PLUS termmath_expression : math_expression MINUS termmath_expression : termterm : term TIMES powterm : term DIVIDE powterm : powpow : factor POW factorpow : factorfactor : NUMBERfactor : idid : COLON IDfactor : LPAREN math_expression RPAREN'
+    
+_lr_action_items = {'ID':([0,2,3,4,5,6,7,8,9,10,13,15,18,19,20,21,22,23,24,25,26,27,28,30,31,32,34,35,36,37,38,39,42,45,59,60,61,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,85,86,87,88,89,90,],[-3,9,-2,-4,-5,-6,-7,-8,-11,15,-9,-18,-10,-12,-13,-14,-15,-38,-39,42,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-3,-51,-28,9,-17,81,-3,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-19,-3,9,9,-22,-20,-3,9,-21,]),'TO':([0,2,3,4,5,6,7,8,9,13,15,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,39,42,45,59,60,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,85,86,87,88,89,90,],[-3,10,-2,-4,-5,-6,-7,-8,-11,-9,-18,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-3,-51,-28,10,-17,-3,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-19,-3,10,10,-22,-20,-3,10,-21,]),'IF':([0,2,3,4,5,6,7,8,9,13,15,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,39,42,45,59,60,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,85,86,87,88,89,90,],[-3,11,-2,-4,-5,-6,-7,-8,-11,-9,-18,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-3,-51,-28,11,-17,-3,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-19,-3,11,11,-22,-20,-3,11,-21,]),'WHILE':([0,2,3,4,5,6,7,8,9,13,15,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,39,42,45,59,60,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,85,86,87,88,89,90,],[-3,12,-2,-4,-5,-6,-7,-8,-11,-9,-18,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-3,-51,-28,12,-17,-3,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-19,-3,12,12,-22,-20,-3,12,-21,]),'$end':([0,1,2,3,4,5,6,7,8,9,13,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,42,45,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,86,87,90,],[-3,0,-1,-2,-4,-5,-6,-7,-8,-11,-9,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-51,-28,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-22,-20,-21,]),'END':([3,4,5,6,7,8,9,13,15,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,39,42,45,59,60,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,85,86,87,88,89,90,],[-2,-4,-5,-6,-7,-8,-11,-9,-18,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-3,-51,-28,80,-17,-3,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-19,-3,86,87,-22,-20,-3,90,-21,]),'ELSE':([3,4,5,6,7,8,9,13,18,19,20,21,22,23,24,26,27,28,30,31,32,34,35,36,37,38,42,45,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,82,85,86,87,90,],[-2,-4,-5,-6,-7,-8,-11,-9,-10,-12,-13,-14,-15,-38,-39,-23,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,-51,-28,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,-16,-3,88,-22,-20,-21,]),'EQUAL':([9,],[14,]),'NUMBER':([9,13,14,16,17,18,19,20,21,22,23,24,29,33,42,43,44,46,47,48,49,50,51,52,53,56,57,58,67,],[-11,19,37,37,37,-10,-12,-13,-14,-15,-38,-39,37,37,-51,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),'STRING':([9,13,14,16,17,18,19,20,21,22,23,24,33,42,43,44,],[-11,20,27,27,27,-10,-12,-13,-14,-15,-38,-39,27,-51,27,27,]),'TRUE':([9,13,14,16,17,18,19,20,21,22,23,24,29,33,42,43,44,],[-11,23,23,23,23,-10,-12,-13,-14,-15,-38,-39,23,23,-51,23,23,]),'FALSE':([9,13,14,16,17,18,19,20,21,22,23,24,29,33,42,43,44,],[-11,24,24,24,24,-10,-12,-13,-14,-15,-38,-39,24,24,-51,24,24,]),'COLON':([9,13,14,15,16,17,18,19,20,21,22,23,24,29,33,39,42,43,44,46,47,48,49,50,51,52,53,56,57,58,60,67,81,],[-11,25,25,-18,25,25,-10,-12,-13,-14,-15,-38,-39,25,25,61,-51,25,25,25,25,25,25,25,25,25,25,25,25,25,-17,25,-19,]),'LPAREN':([11,12,14,16,17,29,33,43,44,46,47,48,49,50,51,52,53,56,57,58,67,],[16,17,33,33,33,33,33,33,33,67,67,67,67,67,67,67,67,67,67,67,67,]),'NOT':([14,16,17,33,43,44,],[29,29,29,29,29,29,]),'AND':([23,24,26,27,28,30,31,32,34,35,36,37,38,40,41,42,45,54,55,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,],[-38,-39,43,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,43,43,-51,-28,43,-36,43,43,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,]),'OR':([23,24,26,27,28,30,31,32,34,35,36,37,38,40,41,42,45,54,55,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,],[-38,-39,44,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,44,44,-51,-28,44,-36,44,44,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,]),'RPAREN':([23,24,27,28,30,31,32,34,35,36,37,38,40,41,42,45,54,55,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,84,],[-38,-39,-26,-27,-29,-36,-37,-43,-46,-48,-49,-50,62,63,-51,-28,75,76,-24,-25,-30,-31,-32,-33,-34,-35,-41,-42,-40,-52,-44,-45,-47,76,]),'GREATER_THAN':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[46,-43,-46,-48,-49,-50,-51,46,-41,-42,-52,-44,-45,-47,]),'GREATER_EQUAL':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[47,-43,-46,-48,-49,-50,-51,47,-41,-42,-52,-44,-45,-47,]),'LESS_THAN':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[48,-43,-46,-48,-49,-50,-51,48,-41,-42,-52,-44,-45,-47,]),'LESS_EQUAL':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[49,-43,-46,-48,-49,-50,-51,49,-41,-42,-52,-44,-45,-47,]),'IS_EQUAL':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[50,-43,-46,-48,-49,-50,-51,50,-41,-42,-52,-44,-45,-47,]),'NOT_EQUAL':([31,34,35,36,37,38,42,55,73,74,76,77,78,79,],[51,-43,-46,-48,-49,-50,-51,51,-41,-42,-52,-44,-45,-47,]),'PLUS':([31,34,35,36,37,38,42,55,66,68,69,70,71,72,73,74,76,77,78,79,84,],[52,-43,-46,-48,-49,-50,-51,52,52,52,52,52,52,52,-41,-42,-52,-44,-45,-47,52,]),'MINUS':([31,34,35,36,37,38,42,55,66,68,69,70,71,72,73,74,76,77,78,79,84,],[53,-43,-46,-48,-49,-50,-51,53,53,53,53,53,53,53,-41,-42,-52,-44,-45,-47,53,]),'TIMES':([34,35,36,37,38,42,73,74,76,77,78,79,],[56,-46,-48,-49,-50,-51,56,56,-52,-44,-45,-47,]),'DIVIDE':([34,35,36,37,38,42,73,74,76,77,78,79,],[57,-46,-48,-49,-50,-51,57,57,-52,-44,-45,-47,]),'POW':([36,37,38,42,76,],[58,-49,-50,-51,-52,]),'THEN':([62,],[82,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,39,63,82,88,],[2,59,83,85,89,]),'statement':([2,59,83,85,89,],[3,3,3,3,3,]),'invoke_function':([2,59,83,85,89,],[4,4,4,4,4,]),'assignment':([2,59,83,85,89,],[5,5,5,5,5,]),'declare_func':([2,59,83,85,89,],[6,6,6,6,6,]),'if':([2,59,83,85,89,],[7,7,7,7,7,]),'while':([2,59,83,85,89,],[8,8,8,8,8,]),'function_args':([9,],[13,]),'function_arg':([13,],[18,]),'bool_literal':([13,14,16,17,29,33,43,44,],[21,32,32,32,32,32,32,32,]),'id':([13,14,16,17,29,33,43,44,46,47,48,49,50,51,52,53,56,57,58,67,],[22,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,]),'expression':([14,16,17,33,43,44,],[26,40,41,54,64,65,]),'expression_not':([14,16,17,33,43,44,],[28,28,28,28,28,28,]),'bool_expression_eq':([14,16,17,29,33,43,44,],[30,30,30,45,30,30,30,]),'math_expression':([14,16,17,29,33,43,44,46,47,48,49,50,51,67,],[31,31,31,31,55,31,31,66,68,69,70,71,72,84,]),'term':([14,16,17,29,33,43,44,46,47,48,49,50,51,52,53,67,],[34,34,34,34,34,34,34,34,34,34,34,34,34,73,74,34,]),'pow':([14,16,17,29,33,43,44,46,47,48,49,50,51,52,53,56,57,67,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,77,78,35,]),'factor':([14,16,17,29,33,43,44,46,47,48,49,50,51,52,53,56,57,58,67,],[36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,79,36,]),'declare_func_args':([15,],[39,]),'declare_func_arg':([39,],[60,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> statement_list','program',1,'p_program','parse.py',50),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parse.py',55),
+  ('statement_list -> <empty>','statement_list',0,'p_statement_list','parse.py',56),
+  ('statement -> invoke_function','statement',1,'p_statement','parse.py',62),
+  ('statement -> assignment','statement',1,'p_statement','parse.py',63),
+  ('statement -> declare_func','statement',1,'p_statement','parse.py',64),
+  ('statement -> if','statement',1,'p_statement','parse.py',65),
+  ('statement -> while','statement',1,'p_statement','parse.py',66),
+  ('invoke_function -> ID function_args','invoke_function',2,'p_invoke_function','parse.py',72),
+  ('function_args -> function_args function_arg','function_args',2,'p_function_args','parse.py',77),
+  ('function_args -> <empty>','function_args',0,'p_function_args','parse.py',78),
+  ('function_arg -> NUMBER','function_arg',1,'p_function_arg','parse.py',84),
+  ('function_arg -> STRING','function_arg',1,'p_function_arg','parse.py',85),
+  ('function_arg -> bool_literal','function_arg',1,'p_function_arg','parse.py',86),
+  ('function_arg -> id','function_arg',1,'p_function_arg','parse.py',87),
+  ('declare_func -> TO ID declare_func_args statement_list END','declare_func',5,'p_declare_func','parse.py',93),
+  ('declare_func_args -> declare_func_args declare_func_arg','declare_func_args',2,'p_declare_func_args','parse.py',98),
+  ('declare_func_args -> <empty>','declare_func_args',0,'p_declare_func_args','parse.py',99),
+  ('declare_func_arg -> COLON ID','declare_func_arg',2,'p_declare_func_arg','parse.py',105),
+  ('if -> IF LPAREN expression RPAREN THEN statement_list END','if',7,'p_if','parse.py',110),
+  ('if -> IF LPAREN expression RPAREN THEN statement_list ELSE statement_list END','if',9,'p_if_else','parse.py',117),
+  ('while -> WHILE LPAREN expression RPAREN statement_list END','while',6,'p_while','parse.py',124),
+  ('assignment -> ID EQUAL expression','assignment',3,'p_assignment','parse.py',131),
+  ('expression -> expression AND expression','expression',3,'p_expression_and','parse.py',136),
+  ('expression -> expression OR expression','expression',3,'p_bool_expression_or','parse.py',141),
+  ('expression -> STRING','expression',1,'p_expression_string','parse.py',146),
+  ('expression -> expression_not','expression',1,'p_bool_expression','parse.py',150),
+  ('expression_not -> NOT bool_expression_eq','expression_not',2,'p_bool_expression_not','parse.py',155),
+  ('expression_not -> bool_expression_eq','expression_not',1,'p_bool_expression_not_e','parse.py',160),
+  ('bool_expression_eq -> math_expression GREATER_THAN math_expression','bool_expression_eq',3,'p_bool_expression_gt','parse.py',165),
+  ('bool_expression_eq -> math_expression GREATER_EQUAL math_expression','bool_expression_eq',3,'p_bool_expression_gte','parse.py',170),
+  ('bool_expression_eq -> math_expression LESS_THAN math_expression','bool_expression_eq',3,'p_bool_expression_lt','parse.py',175),
+  ('bool_expression_eq -> math_expression LESS_EQUAL math_expression','bool_expression_eq',3,'p_bool_expression_lte','parse.py',180),
+  ('bool_expression_eq -> math_expression IS_EQUAL math_expression','bool_expression_eq',3,'p_bool_expression_eq','parse.py',185),
+  ('bool_expression_eq -> math_expression NOT_EQUAL math_expression','bool_expression_eq',3,'p_bool_expression_neq','parse.py',190),
+  ('bool_expression_eq -> math_expression','bool_expression_eq',1,'p_bool_expression_m','parse.py',195),
+  ('bool_expression_eq -> bool_literal','bool_expression_eq',1,'p_bool_expression_value','parse.py',200),
+  ('bool_literal -> TRUE','bool_literal',1,'p_bool_literal','parse.py',205),
+  ('bool_literal -> FALSE','bool_literal',1,'p_bool_literal','parse.py',206),
+  ('bool_expression_eq -> LPAREN expression RPAREN','bool_expression_eq',3,'p_expression_p','parse.py',212),
+  ('math_expression -> math_expression PLUS term','math_expression',3,'p_math_expression_plus','parse.py',217),
+  ('math_expression -> math_expression MINUS term','math_expression',3,'p_math_expression_minus','parse.py',222),
+  ('math_expression -> term','math_expression',1,'p_math_expression_term','parse.py',227),
+  ('term -> term TIMES pow','term',3,'p_term_times','parse.py',232),
+  ('term -> term DIVIDE pow','term',3,'p_term_div','parse.py',237),
+  ('term -> pow','term',1,'p_term_factor','parse.py',242),
+  ('pow -> factor POW factor','pow',3,'p_pow','parse.py',247),
+  ('pow -> factor','pow',1,'p_pow_factor','parse.py',252),
+  ('factor -> NUMBER','factor',1,'p_factor_num','parse.py',256),
+  ('factor -> id','factor',1,'p_factor_id','parse.py',261),
+  ('id -> COLON ID','id',2,'p_id','parse.py',266),
+  ('factor -> LPAREN math_expression RPAREN','factor',3,'p_factor_expr','parse.py',270),
+]
+_grammar_hash = 'daa38112ffdabb61c8ea531dc2dee6c167e2cddaf84d0d71641893b2bbbb9649'
@@ -3,139 +3,108 @@ from typing import Any, List
 
 from logo.parse import BinaryOperation, IfStatement, Assignment, WhileStatement, DeclareFunction, NotOperation, \
     InvokeFunction, Identifier
+from logo.semantic import NodeVisitor
 
 
-def print_binary_operation(bop: BinaryOperation, buffer: StringIO):
-    def print_bop_value(value):
-        if isinstance(value, BinaryOperation):
-            print_binary_operation(value, buffer)
-        elif isinstance(value, Identifier):
-            print_identifier(value, buffer)
-        else:
-            buffer.write(f"{value} ")
-
-    print_bop_value(bop.left)
-
-    buffer.write(f"{bop.op.value} ")
-
-    print_bop_value(bop.right)
+class ProgramPrinter(NodeVisitor):
+    """Write the source of the nodes to the buffer. Values that aren't nodes are written as literals."""
 
+    def __init__(self, buffer: StringIO):
+        super().__init__()
 
-def print_not_op(op: NotOperation, buffer: StringIO):
-    buffer.write(f"NOT (")
-    print_bool_expression(op.expression, buffer)
-    buffer.write(") ")
-
-
-def print_if_statement(if_statement: IfStatement, buffer: StringIO):
-    buffer.write("IF (")
-    print_bool_expression(if_statement.condition, buffer)
-    buffer.write(") ")
-    buffer.write("THEN \n")
-
-    for op in if_statement.body or []:
-        print_statement(op, buffer)
-        buffer.write("\n")
+        self.buffer = buffer
 
-    if if_statement.else_body is not None:
-        buffer.write("ELSE \n")
+    def generic_visit(self, value):
+        self.buffer.write(f"{value} ")
 
-        for if_statement in if_statement.else_body or []:
-            print_statement(if_statement, buffer)
-            buffer.write("\n")
+    def _print_operand_(self, value):
+        if isinstance(value, (BinaryOperation, Identifier)):
+            yield value
+        else:
+            self.buffer.write(f"{value} ")
 
-    buffer.write("END")
+    def _print_body_(self, statements):
+        for statement in statements or []:
+            yield statement
+            self.buffer.write("\n")
 
+    def visit_BinaryOperation(self, bop: BinaryOperation):
+        yield from self._print_operand_(bop.left)
 
-def print_assignment(op: Assignment, buffer: StringIO):
-    buffer.write(f"{op.variable} = ")
+        self.buffer.write(f"{bop.op.value} ")
 
-    if isinstance(op.value, BinaryOperation):
-        print_binary_operation(op.value, buffer)
-    elif isinstance(op.value, Identifier):
-        print_identifier(op.value, buffer)
-    elif isinstance(op.value, NotOperation):
-        print_not_op(op.value, buffer)
-    else:
-        buffer.write(f"{op.value} ")
+        yield from self._print_operand_(bop.right)
 
+    def visit_NotOperation(self, op: NotOperation):
+        self.buffer.write(f"NOT (")
+        yield op.expression
+        self.buffer.write(") ")
 
-def print_while_statement(statement: WhileStatement, buffer: StringIO):
-    buffer.write("WHILE ( ")
-    print_bool_expression(statement.condition, buffer)
-    buffer.write(" )")
+    def visit_IfStatement(self, if_statement: IfStatement):
+        self.buffer.write("IF (")
+        yield if_statement.condition
+        self.buffer.write(") ")
+        self.buffer.write("THEN \n")
 
-    for op in statement.body or []:
-        print_statement(op, buffer)
-        buffer.write("\n")
+        yield from self._print_body_(if_statement.body)
 
-    buffer.write("END")
+        if if_statement.else_body is not None:
+            self.buffer.write("ELSE \n")
 
+            yield from self._print_body_(if_statement.else_body)
 
-def print_declare_function(func: DeclareFunction, buffer: StringIO):
-    buffer.write(f"TO {func.name} ")
+        self.buffer.write("END")
 
-    for arg in func.args or []:
-        buffer.write(f":{arg} ")
+    def visit_Assignment(self, op: Assignment):
+        self.buffer.write(f"{op.variable} = ")
+        yield op.value
 
-    buffer.write("\n")
+    def visit_WhileStatement(self, statement: WhileStatement):
+        self.buffer.write("WHILE ( ")
+        yield statement.condition
+        self.buffer.write(" )")
 
-    for op in func.body or []:
-        print_statement(op, buffer)
-        buffer.write("\n")
+        yield from self._print_body_(statement.body)
 
-    buffer.write("END")
+        self.buffer.write("END")
 
+    def visit_DeclareFunction(self, func: DeclareFunction):
+        self.buffer.write(f"TO {func.name} ")
 
-def print_invoke_function(func: InvokeFunction, buffer: StringIO):
-    buffer.write(f"{func.name} ")
+        for arg in func.args or []:
+            self.buffer.write(f":{arg} ")
 
-    for arg in func.args or []:
-        if isinstance(arg, Identifier):
-            print_identifier(arg, buffer)
-        else:
-            buffer.write(f":{arg} ")
+        self.buffer.write("\n")
 
-    buffer.write("\n")
+        yield from self._print_body_(func.body)
 
+        self.buffer.write("END")
 
-def print_statement(op, buffer: StringIO):
-    if isinstance(op, Assignment):
-        print_assignment(op, buffer)
-    elif isinstance(op, IfStatement):
-        print_if_statement(op, buffer)
-    elif isinstance(op, WhileStatement):
-        print_while_statement(op, buffer)
-    elif isinstance(op, DeclareFunction):
-        print_declare_function(op, buffer)
-    elif isinstance(op, InvokeFunction):
-        print_invoke_function(op, buffer)
+    def visit_InvokeFunction(self, func: InvokeFunction):
+        self.buffer.write(f"{func.name} ")
 
+        for arg in func.args or []:
+            if isinstance(arg, Identifier):
+                yield arg
+            else:
+                self.buffer.write(f":{arg} ")
 
-def print_bool_expression(op, buffer: StringIO):
-    if isinstance(op, Identifier):
-        print_identifier(op, buffer)
-    elif isinstance(op, NotOperation):
-        print_not_op(op, buffer)
-    elif isinstance(op, BinaryOperation):
-        print_binary_operation(op, buffer)
-    else:
-        buffer.write(f"{op} ")
+        self.buffer.write("\n")
 
-
-def print_identifier(op, buffer):
-    buffer.write(f":{op.value} ")
+    def visit_Identifier(self, op: Identifier):
+        self.buffer.write(f":{op.value} ")
 
 
 def print_program(ast: List[Any]) -> str:
     buffer = StringIO()
 
-    for op in ast:
-        print_statement(op, buffer)
+    printer = ProgramPrinter(buffer)
+
+    for statement in ast or []:
+        printer.visit(statement)
         buffer.write("\n")
 
     try:
         return buffer.getvalue()
     finally:
         buffer.close()
-
@@ -0,0 +1,134 @@
+import itertools
+import re
+
+from . import lexer as rules
+
+
+def _function_rules_():
+    functions = [value for name, value in vars(rules).items() if name.startswith('t_') and callable(value)]
+    functions = [f for f in functions if f.__name__ not in ['t_error']]
+
+    return sorted(functions, key=lambda f: f.__code__.co_firstlineno)
+
+
+def _string_rules_():
+    strings = [(name, value) for name, value in vars(rules).items() if name.startswith('t_') and isinstance(value, str)]
+    strings = [(name, value) for name, value in strings if name != 't_ignore']
+
+    return sorted(strings, key=lambda rule: len(rule[1]), reverse=True)
+
+
+def _master_pattern_():
+    """Join the token rules of logo.lexer in the same order used by PLY: functions first, then strings by length"""
+    patterns = [f"(?P<{f.__name__[2:]}>{f.__doc__})" for f in _function_rules_()]
+    patterns.extend(f"(?P<{name[2:]}>{regex})" for name, regex in _string_rules_())
+
+    return re.compile('|'.join(patterns), re.VERBOSE)
+
+
+def _keywords_():
+    """Map every spelling of the reserved words to their token type, so identifiers don't need to be upper cased"""
+    keywords = {}
+
+    for word, token_type in rules.reserved_words.items():
+        for letters in itertools.product(*[(c.lower(), c.upper()) for c in word]):
+            keywords[''.join(letters)] = token_type
+
+    return keywords
+
+
+MASTER_PATTERN = _master_pattern_()
+
+KEYWORDS = _keywords_()
+
+
+class Token(object):
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer', 'column')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __str__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __repr__ = __str__
+
+
+class Scanner(object):
+    """Lexer producing the same tokens as the PLY lexer of logo.lexer with a single precompiled regular expression.
+
+    It implements the part of the PLY lexer interface used by the parser, so it can be given to ``parser.parse``.
+    """
+
+    def __init__(self):
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+
+    def clone(self):
+        scanner = Scanner()
+        scanner.lineno = self.lineno
+
+        return scanner
+
+    def input(self, data: str):
+        self.lexdata = data
+        self.lexpos = 0
+        self.lexlen = len(data)
+
+    def skip(self, n: int):
+        self.lexpos += n
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+    def token(self):
+        data = self.lexdata
+        length = self.lexlen
+        position = self.lexpos
+        match = MASTER_PATTERN.match
+
+        while position < length:
+            if data[position] in rules.t_ignore:
+                position += 1
+                continue
+
+            m = match(data, position)
+
+            if m is None:
+                error = Token('error', data[position:], self.lineno, position)
+                error.lexer = self
+
+                self.lexpos = position
+                rules.t_error(error)
+                position = self.lexpos
+
+                continue
+
+            kind = m.lastgroup
+            end = m.end()
+
+            if kind == 'ID':
+                text = m.group()
+                token = Token(KEYWORDS.get(text, 'ID'), text, self.lineno, position)
+            elif kind == 'NUMBER':
+                token = Token(kind, float(m.group()), self.lineno, position)
+            elif kind == 'newline':
+                self.lineno += end - position
+                position = end
+                continue
+            elif kind == 'STRING':
+                token = Token(kind, data[position + 1:end - 1], self.lineno, position)
+                self.lineno += data.count('\n', position, end)
+            else:
+                token = Token(kind, m.group(), self.lineno, position)
+
+            self.lexpos = end
+            return token
+
+        self.lexpos = position
+        return None
@@ -1,9 +1,12 @@
-import logging
+import itertools
+import sys
 from io import StringIO
-from tabulate import tabulate
+from types import GeneratorType, MappingProxyType
 
+from logo.arena import NODE, BOOL, LIST, TAG_BITS, TAG_MASK
 from logo.parse import BinaryOperation, NotOperation, WhileStatement, IfStatement, Assignment, DeclareFunction, \
     InvokeFunction, Identifier
+from logo.nodes import AstNode
 
 
 # Scoped symbol table implementation based on
@@ -70,15 +73,55 @@ def built_in():
     }
 
 
+class BuiltInScope(object):
+    """Root scope with the built-in symbols, created once and shared by every ScopedSymbolTable. It can't be changed."""
+
+    def __init__(self):
+        self.symbols = MappingProxyType(built_in())
+
+    def insert(self, symbol):
+        raise Exception(f"Can't declare {symbol.name} in the built-in scope")
+
+    def lookup(self, name):
+        return self.symbols.get(name)
+
+
+BUILT_IN_SCOPE = BuiltInScope()
+
+
 class ScopedSymbolTable(object):
-    def __init__(self, scope_name, scope_level, enclosing_scope=None):
-        self._symbols = built_in()
+    tracer = None
+
+    def __init__(self, scope_name, scope_level, enclosing_scope=None, tracer=None):
+        # Only the symbols declared in this scope. The built-ins are looked up in BUILT_IN_SCOPE.
+        self._symbols = {}
         self.scope_name = scope_name
         self.scope_level = scope_level
         self.enclosing_scope = enclosing_scope
         self.children_scopes = []
 
+        if enclosing_scope is None:
+            self._full_name_ = sys.intern(scope_name)
+            # Number of times each name was declared in any scope of the tree, see resolve()
+            self._declarations_ = {}
+        else:
+            # Built by full_name(), as the names of deeply nested scopes are long
+            self._full_name_ = None
+            self._declarations_ = enclosing_scope._declarations_
+
+        self._resolved_ = {}
+
+        if tracer is None and enclosing_scope is not None:
+            tracer = enclosing_scope.tracer
+
+        if tracer is not None:
+            self.tracer = tracer
+            self.insert = self._traced_insert_
+            self.resolve = self._traced_resolve_
+
     def __str__(self):
+        from tabulate import tabulate
+
         buffer = StringIO()
 
         buffer.write("Scoped Symbol Table \n")
@@ -91,7 +134,9 @@ class ScopedSymbolTable(object):
         buffer.write("\n")
         buffer.write("Symbols: \n")
 
-        buffer.write(tabulate(self._symbols.items(), ['Name', 'Value'], tablefmt="grid"))
+        symbols = {**BUILT_IN_SCOPE.symbols, **self._symbols}
+
+        buffer.write(tabulate(symbols.items(), ['Name', 'Value'], tablefmt="grid"))
 
         try:
             return buffer.getvalue()
@@ -101,29 +146,92 @@ class ScopedSymbolTable(object):
     __repr__ = __str__
 
     def insert(self, symbol):
-        logging.debug('Inserting symbol with name: %s' % symbol.name)
-
         self._symbols[symbol.name] = symbol
+        self._declarations_[symbol.name] = self._declarations_.get(symbol.name, 0) + 1
 
     def full_name(self):
-        if self.enclosing_scope:
-            return f"{self.enclosing_scope.full_name()}_{self.scope_name}"
-        else:
-            return self.scope_name
+        if self._full_name_ is None:
+            scopes = []
+            scope = self
 
-    def lookup(self, name, current_scope_only=False):
-        logging.debug('Lookup for symbol: %s. (Scope name: %s)' % (name, self.scope_name))
+            while scope._full_name_ is None:
+                scopes.append(scope)
+                scope = scope.enclosing_scope
+
+            name = scope._full_name_
+
+            for scope in reversed(scopes):
+                name = scope._full_name_ = sys.intern(f"{name}_{scope.scope_name}")
+
+        return self._full_name_
+
+    def resolve(self, name, current_scope_only=False):
+        """Return the symbol with the name and the scope where it is found, or (None, None).
+
+        Names found in an enclosing scope are cached. A cached scope is used while no scope of the tree declares the
+        name again, so a reference inside deeply nested scopes doesn't walk the chain every time.
+        """
         symbol = self._symbols.get(name)
 
+        # The built-ins are visible in every scope as if they were declared in it, unless the scope declares the name
+        if symbol is None:
+            symbol = BUILT_IN_SCOPE.lookup(name)
+
         if symbol is not None:
-            return symbol, self.full_name()
+            return symbol, self
 
         if current_scope_only:
             return None, None
 
-        # recursively go up the chain and lookup the name
-        if self.enclosing_scope is not None:
-            return self.enclosing_scope.lookup(name)
+        declarations = self._declarations_.get(name, 0)
+        resolved = self._resolved_.get(name)
+
+        if resolved is not None and resolved[0] == declarations:
+            return resolved[1], resolved[2]
+
+        scope = self.enclosing_scope
+
+        while scope is not None:
+            symbol = scope._symbols.get(name)
+
+            if symbol is not None:
+                break
+
+            resolved = scope._resolved_.get(name)
+
+            if resolved is not None and resolved[0] == declarations:
+                symbol, scope = resolved[1], resolved[2]
+                break
+
+            scope = scope.enclosing_scope
+
+        if symbol is None:
+            return None, None
+
+        self._resolved_[name] = (declarations, symbol, scope)
+
+        return symbol, scope
+
+    def lookup(self, name, current_scope_only=False):
+        symbol, scope = self.resolve(name, current_scope_only)
+
+        if symbol is not None:
+            return symbol, scope.full_name()
+
+        if current_scope_only:
+            return None, None
+
+    def _traced_insert_(self, symbol):
+        self.tracer.insert(self, symbol)
+
+        ScopedSymbolTable.insert(self, symbol)
+
+    def _traced_resolve_(self, name, current_scope_only=False):
+        symbol, scope = ScopedSymbolTable.resolve(self, name, current_scope_only)
+
+        self.tracer.lookup(self, name, symbol)
+
+        return symbol, scope
 
 
 class RedeclaredSymbolException(Exception):
@@ -143,57 +251,163 @@ class TypeMismatchException(Exception):
 
 
 class NodeVisitor(object):
-    def visit(self, node):
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
+    # Name of the pass given to the tracer (see logo.trace)
+    phase = None
+    tracer = None
+
+    # Visit method of each node class, found the first time a node of the class is visited. Every subclass has its own
+    # table, so the method name is only built once per visitor and node class.
+    _visitors_ = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-        logging.debug(f"Visiting method '{method_name}'")
+        cls._visitors_ = {}
 
-        return visitor(node)
+    def __init__(self, tracer=None):
+        if tracer is not None:
+            self.tracer = tracer
+
+    def visit(self, node):
+        """Visit the node and return the result of its visit method.
+
+        Visit methods can be generators: every node they yield is visited and its result is sent back, so
+        ``value = yield child`` works like ``value = self.visit(child)``. The visits in progress are kept in a list
+        instead of the call stack, so programs nested to any depth can be visited.
+        """
+        tracer = self.tracer
+        phase = self.phase
+        visitors = self._visitors_
+        pending = []
+        value = error = None
+
+        while True:
+            if tracer is not None:
+                tracer.visit(phase, node)
+
+            visitor = visitors.get(type(node))
+
+            if visitor is None:
+                visitor = self._dispatch_(type(node))
+
+            try:
+                value = visitor(self, node)
+            except BaseException as exc:
+                value, error = None, exc
+
+            if error is None and type(value) is GeneratorType:
+                pending.append((value, node))
+                value = None
+            elif tracer is not None:
+                tracer.visited(phase, node)
+
+            # Resume the visits in progress until one of them yields the next node
+            while pending:
+                generator, parent = pending[-1]
+
+                try:
+                    node = generator.send(value) if error is None else generator.throw(error)
+                except StopIteration as stop:
+                    value, error = stop.value, None
+                except BaseException as exc:
+                    value, error = None, exc
+                else:
+                    error = None
+                    break
+
+                pending.pop()
+
+                if tracer is not None:
+                    tracer.visited(phase, parent)
+            else:
+                if error is not None:
+                    raise error
+
+                return value
+
+    @classmethod
+    def _dispatch_(cls, node_type: type):
+        visitor = cls._visitors_[node_type] = getattr(cls, 'visit_' + node_type.__name__, cls.generic_visit)
+
+        return visitor
 
     def generic_visit(self, node):
         raise Exception('No visit_{} method'.format(type(node).__name__))
 
 
 class SemanticAnalyzer(NodeVisitor):
-    def __init__(self):
+    phase = 'analysis'
+
+    def __init__(self, tracer=None):
+        super().__init__(tracer)
+
         self.current_scope = ScopedSymbolTable(
             scope_name='global',
             scope_level=1,
             enclosing_scope=None,
+            tracer=tracer,
         )
 
+        # Serial of the scope where each operation was last checked, by node id. Symbols are never removed, so the
+        # check holds while that scope is open, and operations shared by several statements (see logo.interning) are
+        # checked once. Scopes are numbered instead of kept, so closed scopes can be freed, and the checked nodes are
+        # kept so their ids aren't reused.
+        self._checked_scopes_ = {}
+        self._checked_nodes_ = []
+        self._scope_serials_ = itertools.count()
+        self._open_scopes_ = [next(self._scope_serials_)]
+        self._open_scope_set_ = set(self._open_scopes_)
+
+    def _is_checked_(self, expression) -> bool:
+        """Whether the expression was checked in an open scope, marking it as checked in the current scope if not"""
+        checked_scope = self._checked_scopes_.get(id(expression))
+
+        if checked_scope is None:
+            self._checked_nodes_.append(expression)
+        elif checked_scope in self._open_scope_set_:
+            return True
+
+        self._checked_scopes_[id(expression)] = self._open_scopes_[-1]
+
+        return False
+
     def visit_BinaryOperation(self, op: BinaryOperation):
-        if isinstance(op.left, tuple):
-            self.visit(op.left)
+        if self._is_checked_(op):
+            return
+
+        if isinstance(op.left, AstNode):
+            yield op.left
 
-        if isinstance(op.right, tuple):
-            self.visit(op.right)
+        if isinstance(op.right, AstNode):
+            yield op.right
 
     def visit_NotOperation(self, op: NotOperation):
-        self.visit(op.expression)
+        if self._is_checked_(op):
+            return
+
+        yield op.expression
 
     def visit_WhileStatement(self, statement: WhileStatement):
         if not isinstance(statement.condition, bool):
-            self.visit(statement.condition)
+            yield statement.condition
 
         self.__enter_scope__("WHILE")
 
         if statement.body:
             for st in statement.body or []:
-                self.visit(st)
+                yield st
 
         self.__exit_scope__()
 
     def visit_IfStatement(self, statement: IfStatement):
         if not isinstance(statement.condition, bool):
-            self.visit(statement.condition)
+            yield statement.condition
 
         self.__enter_scope__("IF")
 
         if statement.body:
             for st in statement.body or []:
-                self.visit(st)
+                yield st
 
         self.__exit_scope__()
 
@@ -201,15 +415,15 @@ class SemanticAnalyzer(NodeVisitor):
 
         if statement.else_body:
             for st in statement.else_body or []:
-                self.visit(st)
+                yield st
 
         self.__exit_scope__()
 
     def visit_Assignment(self, assignment: Assignment):
         self._expect_not_declared_(assignment.variable, VariableSymbol)
 
-        if isinstance(assignment.value, tuple):
-            self.visit(assignment.value)
+        if isinstance(assignment.value, AstNode):
+            yield assignment.value
 
         self.current_scope.insert(VariableSymbol(assignment.variable))
 
@@ -227,21 +441,125 @@ class SemanticAnalyzer(NodeVisitor):
                 self.current_scope.insert(VariableSymbol(arg))
 
             for statement in function.body or []:
-                self.visit(statement)
+                yield statement
 
         self.__exit_scope__()
 
-    def __enter_scope__(self, name: str):
-        logging.debug(f"Entering scope '{name}'")
+    def analyze_arena(self, arena, start: str = 'MAIN'):
+        """Check the program of the arena (see logo.arena) as the body of the function `start`, like visiting
+        DeclareFunction(start, None, arena.program) does.
+
+        The nodes are read by index with kind_of, child and item_range, so no view is created, but the ones given to
+        the tracer if there is one. The pending nodes and the steps to take after them are kept in a list.
+        """
+        name = start.upper()
+
+        self._expect_not_declared_(name)
+        self.current_scope.insert(FunctionSymbol(name, None))
+        self.__enter_scope__(name)
+
+        tracer = self.tracer
+        child = arena.child
+        items = arena.list_items
+        pending = [(self.__exit_scope__,)]
+
+        if arena.root & TAG_MASK == LIST:
+            pending.append(arena.root)
 
+        while pending:
+            reference = pending.pop()
+
+            if type(reference) is tuple:
+                reference[0](*reference[1:])
+                continue
+
+            tag = reference & TAG_MASK
+
+            if tag == LIST:
+                statements = arena.item_range(reference)
+                pending.extend(reversed(items[statements.start:statements.stop]))
+                continue
+            elif tag != NODE:
+                self.generic_visit(arena.value(reference))
+
+            index = reference >> TAG_BITS
+            kind = arena.kind_of(index)
+
+            if tracer is not None:
+                node = arena.node(index)
+                tracer.visit(self.phase, node)
+                pending.append((tracer.visited, self.phase, node))
+
+            if kind is BinaryOperation:
+                for column in (1, 0):
+                    if child(index, column) & TAG_MASK == NODE:
+                        pending.append(child(index, column))
+            elif kind is NotOperation:
+                pending.append(child(index, 0))
+            elif kind is WhileStatement or kind is IfStatement:
+                bodies = [child(index, 1)] if kind is WhileStatement else [child(index, 1), child(index, 2)]
+
+                for body in reversed(bodies):
+                    pending.append((self.__exit_scope__,))
+
+                    if body & TAG_MASK == LIST:
+                        pending.append(body)
+
+                    pending.append((self.__enter_scope__, "WHILE" if kind is WhileStatement else "IF"))
+
+                if child(index, 0) & TAG_MASK != BOOL:
+                    pending.append(child(index, 0))
+            elif kind is Assignment:
+                variable = arena.value(child(index, 0))
+
+                self._expect_not_declared_(variable, VariableSymbol)
+
+                pending.append((self.current_scope.insert, VariableSymbol(variable)))
+
+                if child(index, 1) & TAG_MASK == NODE:
+                    pending.append(child(index, 1))
+            elif kind is DeclareFunction:
+                function_name = arena.value(child(index, 0)).upper()
+                args = arena.value(child(index, 1))
+                body = child(index, 2)
+
+                self._expect_not_declared_(function_name)
+                self.current_scope.insert(FunctionSymbol(function_name, args))
+                self.__enter_scope__(function_name)
+
+                pending.append((self.__exit_scope__,))
+
+                if body & TAG_MASK == LIST and arena.item_range(body):
+                    for arg in args or []:
+                        self.current_scope.insert(VariableSymbol(arg))
+
+                    pending.append(body)
+            elif kind is InvokeFunction:
+                symbol: FunctionSymbol = self._expect_symbol_(arena.value(child(index, 0)).upper(), FunctionSymbol)
+                args = child(index, 1)
+
+                if (len(arena.item_range(args)) if args & TAG_MASK == LIST else 0) != len(symbol.params or []):
+                    args = arena.value(args)
+                    raise Exception(f"Expected {len(symbol.params)} but {len(args)} were informed")
+            elif kind is Identifier:
+                self._expect_symbol_(arena.value(child(index, 0)))
+
+    def __enter_scope__(self, name: str):
         self.current_scope = ScopedSymbolTable(
             scope_name=name,
             scope_level=self.current_scope.scope_level,
             enclosing_scope=self.current_scope,
         )
 
+        if self.tracer is not None:
+            self.tracer.enter_scope(self.phase, self.current_scope)
+
+        serial = next(self._scope_serials_)
+        self._open_scopes_.append(serial)
+        self._open_scope_set_.add(serial)
+
     def _expect_not_declared_(self, name: str, type=None, current_scope_only=True):
-        symbol, _ = self.current_scope.lookup(name, current_scope_only)
+        symbol, _ = self.current_scope.resolve(name, current_scope_only)
 
         def throw():
             raise RedeclaredSymbolException(
@@ -255,9 +573,11 @@ class SemanticAnalyzer(NodeVisitor):
             throw()
 
     def __exit_scope__(self):
-        logging.debug(f"Exiting scope '{self.current_scope.scope_name}'")
+        if self.tracer is not None:
+            self.tracer.exit_scope(self.phase, self.current_scope)
 
         self.current_scope = self.current_scope.enclosing_scope
+        self._open_scope_set_.discard(self._open_scopes_.pop())
 
     def visit_InvokeFunction(self, function: InvokeFunction):
         symbol: FunctionSymbol = self._expect_symbol_(function.name.upper(), FunctionSymbol)
@@ -270,7 +590,7 @@ class SemanticAnalyzer(NodeVisitor):
                 self._expect_symbol_(param.value, VariableSymbol)
 
     def _expect_symbol_(self, name: str, symbol_type=None, current_scope_only=False):
-        symbol, _ = self.current_scope.lookup(name, current_scope_only)
+        symbol, _ = self.current_scope.resolve(name, current_scope_only)
 
         if symbol:
             if not symbol_type:
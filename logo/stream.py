@@ -0,0 +1,116 @@
+import codecs
+import mmap
+import os
+import re
+
+from .lexer import new_lexer
+from .parse import parser_instance
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Tokens never contain a newline, except for strings. The text read so far can be tokenized up to the last newline that
+# is not inside a string, so only the quotes and the newlines are needed to find where to split it.
+_SPLIT_CHARACTERS_ = re.compile(r"""["'\n]""")
+
+
+class StreamLexer(object):
+    """Tokenize a file object or a memory map incrementally using the token rules of logo.lexer.
+
+    The source is read in chunks and only the text after the last complete line is kept between chunks. Tokens have
+    the same type, value, line number and position as if the whole source had been given to the lexer.
+
+    Besides being iterable, it implements token() so it can be given to the parser:
+    ``parser.parse(lexer=StreamLexer(f))``.
+    """
+
+    def __init__(self, stream, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = 'utf-8', lexer=None):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.lexer = lexer if lexer is not None else new_lexer()
+        self.lexer.lineno = 1
+
+        self._tokens_ = self._generate_tokens_()
+
+    @property
+    def lineno(self):
+        return self.lexer.lineno
+
+    def __iter__(self):
+        return self._tokens_
+
+    def token(self):
+        return next(self._tokens_, None)
+
+    def _read_(self):
+        """Return the text of the next chunk and whether the end of the stream was reached"""
+        chunk = self.stream.read(self.chunk_size)
+
+        if isinstance(chunk, str):
+            return chunk, not chunk
+
+        return self.decoder.decode(chunk, final=not chunk), not chunk
+
+    def _generate_tokens_(self):
+        pending = ''
+        offset = 0
+        scanned = 0
+        quote = None
+
+        while True:
+            chunk, end = self._read_()
+            pending += chunk
+
+            if not end:
+                split = 0
+
+                for match in _SPLIT_CHARACTERS_.finditer(pending, scanned):
+                    character = match.group()
+
+                    if quote:
+                        if character == quote:
+                            quote = None
+                    elif character == '\n':
+                        split = match.end()
+                    else:
+                        quote = character
+
+                scanned = len(pending)
+            else:
+                split = len(pending)
+
+            if split:
+                yield from self._tokenize_(pending[:split], offset)
+
+                pending = pending[split:]
+                offset += split
+                scanned -= split
+
+            if end:
+                return
+
+    def _tokenize_(self, data: str, offset: int):
+        lexer = self.lexer
+        lexer.input(data)
+
+        # The data always starts at the beginning of a line, so the columns can be found without the previous text
+        for token in iter(lexer.token, None):
+            token.column = token.lexpos - data.rfind('\n', 0, token.lexpos)
+            token.lexpos += offset
+            yield token
+
+
+def tokenize_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = 'utf-8'):
+    """Yield the tokens of the file, reading it through a memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+            yield from StreamLexer(source, chunk_size, encoding)
+
+
+def parse_stream(stream, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = 'utf-8', backend: str = None):
+    """Parse the program read from a file object or memory map without loading the whole source"""
+    with parser_instance(backend) as (lexer, parser):
+        return parser.parse(lexer=StreamLexer(stream, chunk_size, encoding, lexer=lexer))
@@ -0,0 +1,121 @@
+import hashlib
+import importlib
+import logging
+import os
+import sys
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+# Load the lexer and parser from the tables shipped in the package. Set LOGO_PLY_OPTIMIZE=0 to always
+# build them from the grammar instead.
+OPTIMIZE = os.environ.get('LOGO_PLY_OPTIMIZE', '1') != '0'
+
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LEXTAB = 'logo.lextab'
+PARSETAB = 'logo.parsetab'
+
+
+def _hash_(parts) -> str:
+    digest = hashlib.sha256()
+
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+
+    return digest.hexdigest()
+
+
+def lexer_hash(module) -> str:
+    """Hash of the tokens and the token rules defined in the lexer module"""
+    parts = [lex.__tabversion__, ' '.join(module.tokens)]
+
+    for name, value in vars(module).items():
+        if name.startswith('t_'):
+            parts.append(f"{name}={value.__doc__ if callable(value) else value}")
+
+    return _hash_(parts)
+
+
+def parser_hash(module) -> str:
+    """Hash of the grammar defined in the parser module"""
+    pinfo = yacc.ParserReflect(vars(module), log=yacc.NullLogger())
+    pinfo.get_all()
+
+    return _hash_([yacc.__tabversion__, pinfo.signature()])
+
+
+def _table_hash_(tabmodule: str):
+    try:
+        return getattr(importlib.import_module(tabmodule), '_grammar_hash', None)
+    except ImportError:
+        return None
+
+
+def build_lexer(module, optimize=OPTIMIZE):
+    """Build the lexer of the module, loading the shipped lextab when it matches the token rules"""
+    if optimize:
+        if _table_hash_(LEXTAB) == lexer_hash(module):
+            return lex.lex(module=module, optimize=True, lextab=LEXTAB)
+
+        logging.warning(f"The table '{LEXTAB}' is missing or out of date, run 'python -m logo.tables' to regenerate it")
+
+    return lex.lex(module=module)
+
+
+def build_parser(module, optimize=OPTIMIZE):
+    """Build the parser of the module, loading the shipped parsetab when it matches the grammar.
+
+    The parser actions create the nodes with the factory of the module NODES attribute.
+    """
+    parser = None
+
+    if optimize:
+        if _table_hash_(PARSETAB) == parser_hash(module):
+            parser = yacc.yacc(module=module, optimize=True, tabmodule=PARSETAB, write_tables=False, debug=False)
+        else:
+            logging.warning(
+                f"The table '{PARSETAB}' is missing or out of date, run 'python -m logo.tables' to regenerate it"
+            )
+
+    if parser is None:
+        parser = yacc.yacc(module=module, tabmodule=PARSETAB, write_tables=False, debug=False, errorlog=yacc.NullLogger())
+
+    parser.nodes = module.NODES
+
+    return parser
+
+
+def _append_hash_(tabmodule: str, grammar_hash: str):
+    filename = os.path.join(TABLES_DIR, tabmodule.split('.')[-1] + '.py')
+
+    with open(filename, 'a') as f:
+        f.write(f"_grammar_hash = {grammar_hash!r}\n")
+
+    sys.modules.pop(tabmodule, None)
+
+
+def write_tables():
+    """Regenerate the lextab and parsetab modules shipped in the package"""
+    import logo.lexer
+    import logo.parse
+
+    for tabmodule in [LEXTAB, PARSETAB]:
+        filename = os.path.join(TABLES_DIR, tabmodule.split('.')[-1] + '.py')
+
+        if os.path.exists(filename):
+            os.remove(filename)
+
+        sys.modules.pop(tabmodule, None)
+
+    lexer = lex.lex(module=logo.lexer)
+    lexer.writetab(LEXTAB, TABLES_DIR)
+    _append_hash_(LEXTAB, lexer_hash(logo.lexer))
+
+    yacc.yacc(module=logo.parse, tabmodule=PARSETAB, outputdir=TABLES_DIR, debug=False)
+    _append_hash_(PARSETAB, parser_hash(logo.parse))
+
+
+if __name__ == '__main__':
+    write_tables()
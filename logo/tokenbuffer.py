@@ -0,0 +1,97 @@
+from array import array
+
+from .lexer import tokens
+from .parse import parser_instance
+from .scanner import Scanner, Token
+
+# Code stored in the buffer for each token type
+KIND_CODES = {name: code for code, name in enumerate(tokens)}
+
+
+class TokenBuffer(object):
+    """Tokens of a source stored in parallel arrays with the kind, offset, length and line number of each token.
+
+    Token values are decoded from the source only when they are requested.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.kinds = array('i')
+        self.offsets = array('i')
+        self.lengths = array('i')
+        self.lines = array('i')
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return map(self.token, range(len(self)))
+
+    def append(self, kind: str, offset: int, length: int, lineno: int):
+        self.kinds.append(KIND_CODES[kind])
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.lines.append(lineno)
+
+    def type(self, index: int) -> str:
+        return tokens[self.kinds[index]]
+
+    def text(self, index: int) -> str:
+        offset = self.offsets[index]
+
+        return self.source[offset:offset + self.lengths[index]]
+
+    def value(self, index: int):
+        kind = tokens[self.kinds[index]]
+
+        if kind == 'NUMBER':
+            return float(self.text(index))
+        elif kind == 'STRING':
+            return self.text(index)[1:-1]
+
+        return self.text(index)
+
+    def token(self, index: int) -> Token:
+        return Token(self.type(index), self.value(index), self.lines[index], self.offsets[index])
+
+
+def tokenize_to_buffer(source: str) -> TokenBuffer:
+    """Tokenize the source with the scanner backend into a token buffer"""
+    buffer = TokenBuffer(source)
+    scanner = Scanner()
+    scanner.input(source)
+
+    for token in scanner:
+        buffer.append(token.type, token.lexpos, scanner.lexpos - token.lexpos, token.lineno)
+
+    return buffer
+
+
+class BufferLexer(object):
+    """Feed the parser from a token buffer, creating each token only when the parser asks for it"""
+
+    def __init__(self, buffer: TokenBuffer):
+        self.buffer = buffer
+        self.index = 0
+        self.lineno = 1
+
+    @property
+    def lexdata(self):
+        return self.buffer.source
+
+    def token(self):
+        if self.index >= len(self.buffer):
+            return None
+
+        token = self.buffer.token(self.index)
+
+        self.index += 1
+        self.lineno = token.lineno
+
+        return token
+
+
+def parse_buffer(buffer: TokenBuffer):
+    """Parse the program stored in the token buffer"""
+    with parser_instance() as (_, parser):
+        return parser.parse(lexer=BufferLexer(buffer))
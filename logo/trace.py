@@ -0,0 +1,112 @@
+import time
+from collections import Counter
+
+# Instrumentation of the compiler passes. A tracer is given to SemanticAnalyzer or CodeGenerator (or compile_source) and
+# receives their events. Without one, the passes and scopes don't check for it on every call: the traced methods are
+# only installed on the objects created with a tracer.
+
+
+class Tracer(object):
+    """Events of the compiler passes, ignored by default. Subclasses override the ones they need."""
+
+    def visit(self, phase: str, node):
+        pass
+
+    def visited(self, phase: str, node):
+        pass
+
+    def lookup(self, scope, name: str, symbol):
+        pass
+
+    def insert(self, scope, symbol):
+        pass
+
+    def enter_scope(self, phase: str, scope):
+        pass
+
+    def exit_scope(self, phase: str, scope):
+        pass
+
+    def emit(self, phase: str, function):
+        pass
+
+
+class PhaseCounters(object):
+    """Counters and time of one compiler phase"""
+
+    def __init__(self):
+        self.visits = Counter()
+        self.lookups = 0
+        self.missing_symbols = 0
+        self.inserts = 0
+        self.scopes = 0
+        self.functions = 0
+        self.instructions = 0
+        self.time = 0.0
+
+
+class CountingTracer(Tracer):
+    """Tracer that counts the events and measures the time of each phase ('analysis', 'codegen')"""
+
+    def __init__(self):
+        self.phases = {}
+        self._active_ = []
+        self._starts_ = []
+
+    def counters(self, phase: str) -> PhaseCounters:
+        counters = self.phases.get(phase)
+
+        if counters is None:
+            counters = self.phases[phase] = PhaseCounters()
+
+        return counters
+
+    def visit(self, phase: str, node):
+        self.counters(phase).visits[type(node).__name__] += 1
+
+        if not self._active_ or self._active_[-1] != phase:
+            self._starts_.append(time.perf_counter())
+
+        self._active_.append(phase)
+
+    def visited(self, phase: str, node):
+        self._active_.pop()
+
+        if not self._active_ or self._active_[-1] != phase:
+            self.counters(phase).time += time.perf_counter() - self._starts_.pop()
+
+    def _current_(self) -> PhaseCounters:
+        return self.counters(self._active_[-1] if self._active_ else None)
+
+    def lookup(self, scope, name: str, symbol):
+        counters = self._current_()
+        counters.lookups += 1
+
+        if symbol is None:
+            counters.missing_symbols += 1
+
+    def insert(self, scope, symbol):
+        self._current_().inserts += 1
+
+    def enter_scope(self, phase: str, scope):
+        self.counters(phase).scopes += 1
+
+    def emit(self, phase: str, function):
+        counters = self.counters(phase)
+        counters.functions += 1
+        counters.instructions += len(function.instructions)
+
+    def __str__(self):
+        from tabulate import tabulate
+
+        rows = []
+
+        for phase, counters in self.phases.items():
+            rows.append([
+                phase, sum(counters.visits.values()), counters.lookups, counters.missing_symbols, counters.inserts,
+                counters.scopes, counters.functions, counters.instructions, f"{counters.time * 1000:.2f}",
+            ])
+
+        return tabulate(rows, [
+            'Phase', 'Visits', 'Lookups', 'Missing', 'Inserts', 'Scopes', 'Functions', 'Instructions', 'Time (ms)',
+        ])
@@ -0,0 +1,19 @@
+import argparse
+import sys
+
+from logo.vm.codegen import compile_source
+from logo.vm.peephole import O0, O1, O2
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='python -m logo.vm', description='Compile a LOGO program to logovm code')
+    parser.add_argument('source', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+                        help='file with the program, the standard input by default')
+    parser.add_argument('--start', default='MAIN', help='name of the entry point')
+    parser.add_argument('-O', dest='level', type=int, choices=[O0, O1, O2], default=O0,
+                        help='optimization level: -O0 lists the code as generated, -O1 folds constant expressions, '
+                             'drops unused labels, unreachable code and jumps to the next label, -O2 also threads '
+                             'jumps, inverts branches over jumps and compares with the operands')
+
+    args = parser.parse_args()
+
+    print(compile_source(args.source.read(), args.start, level=args.level), end='')
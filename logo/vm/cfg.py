@@ -0,0 +1,254 @@
+from io import StringIO
+from typing import Dict, List
+
+from logo.vm.codegen import _print_operation_
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label, Jump, Return, DefineFunction
+
+# Control flow graph of a function, the middle end between the code generator and the listing. A function is split in
+# basic blocks, which are entered at their first instruction and left at their last one, with the edges between them
+# explicit. build_cfg creates the graph of a DefineFunction, verify_cfg checks it and lower_cfg lists it again.
+
+TERMINATORS = JUMPS + (Return,)
+
+
+class BasicBlock(object):
+    """Instructions that run one after the other.
+
+    `labels` are the names the jumps to the block use. `terminator` is the jump or RET that ends the block, None if it
+    only falls through to the next block. `successors` are the blocks that can run after it: the target of the jump
+    first, then the block it falls through to.
+    """
+
+    def __init__(self, id: int, labels: List[str] = None, instructions: List = None, terminator=None):
+        self.id = id
+        self.labels = labels or []
+        self.instructions = instructions or []
+        self.terminator = terminator
+        self.successors = []
+
+    @property
+    def falls_through(self) -> bool:
+        return self.terminator is None or type(self.terminator) not in (Jump, Return)
+
+    def __repr__(self):
+        return f"BasicBlock(B{self.id}, labels={self.labels})"
+
+
+class ControlFlowGraph(object):
+    """Basic blocks of a function in the order they are listed. The first block is the entry."""
+
+    def __init__(self, name: str, blocks: List[BasicBlock]):
+        self.name = name
+        self.blocks = blocks
+
+    @property
+    def entry(self) -> BasicBlock:
+        return self.blocks[0]
+
+    def predecessors(self) -> Dict[int, List[BasicBlock]]:
+        """Blocks that can run before each block, by block id"""
+        predecessors = {block.id: [] for block in self.blocks}
+
+        for block in self.blocks:
+            for successor in block.successors:
+                predecessors[successor.id].append(block)
+
+        return predecessors
+
+    def reachable(self) -> List[BasicBlock]:
+        """Blocks that can run from the entry, in the order they are listed"""
+        seen = {self.entry.id}
+        pending = [self.entry]
+
+        while pending:
+            for successor in pending.pop().successors:
+                if successor.id not in seen:
+                    seen.add(successor.id)
+                    pending.append(successor)
+
+        return [block for block in self.blocks if block.id in seen]
+
+    def remove_unreachable(self) -> int:
+        """Remove the blocks that can't run, returning how many were removed"""
+        reachable = self.reachable()
+        removed = len(self.blocks) - len(reachable)
+        self.blocks = reachable
+
+        return removed
+
+
+def build_cfg(function: DefineFunction) -> ControlFlowGraph:
+    """Split the instructions of the function in basic blocks.
+
+    A block starts at the first instruction, at the labels and after the jumps and RET. The label markers of the
+    listing are kept as the labels of the block that follows them.
+    """
+    blocks = []
+    block = None
+
+    for instruction in function.instructions:
+        kind = type(instruction)
+
+        if kind is Label:
+            if block is None or block.instructions or block.terminator is not None:
+                block = BasicBlock(len(blocks))
+                blocks.append(block)
+
+            block.labels.append(instruction.name)
+            continue
+
+        if block is None:
+            block = BasicBlock(len(blocks))
+            blocks.append(block)
+
+        if kind in TERMINATORS:
+            block.terminator = instruction
+            block = None
+        else:
+            block.instructions.append(instruction)
+
+    by_label = {label: block for block in blocks for label in block.labels}
+
+    for position, block in enumerate(blocks):
+        terminator = block.terminator
+
+        if type(terminator) in JUMPS:
+            target = by_label.get(terminator.label)
+
+            if target is None:
+                raise Exception(f"Jump to the unknown label {terminator.label} in {function.id}")
+
+            block.successors.append(target)
+
+        if block.falls_through and position + 1 < len(blocks):
+            block.successors.append(blocks[position + 1])
+
+    return ControlFlowGraph(function.id, blocks)
+
+
+def verify_cfg(cfg: ControlFlowGraph):
+    """Raise an exception if the graph isn't one lower_cfg can list"""
+    if not cfg.blocks:
+        raise Exception(f"{cfg.name} has no blocks")
+
+    ids = set()
+    labels = {}
+
+    for block in cfg.blocks:
+        if block.id in ids:
+            raise Exception(f"B{block.id} is listed twice in {cfg.name}")
+
+        ids.add(block.id)
+
+        for label in block.labels:
+            if label in labels:
+                raise Exception(f"Label {label} of B{block.id} is also in B{labels[label].id}")
+
+            labels[label] = block
+
+    for block in cfg.blocks:
+        for instruction in block.instructions:
+            if instruction is None or type(instruction) in TERMINATORS or type(instruction) is Label:
+                raise Exception(f"B{block.id} has {instruction} in the middle")
+
+        for successor in block.successors:
+            if successor.id not in ids:
+                raise Exception(f"B{block.id} continues in B{successor.id}, which isn't in {cfg.name}")
+
+        terminator = block.terminator
+        kind = type(terminator)
+
+        if terminator is None:
+            expected = 1
+        elif kind is Return:
+            expected = 0
+        elif kind is Jump:
+            expected = 1
+        elif kind in JUMPS:
+            expected = 2
+        else:
+            raise Exception(f"B{block.id} ends with {terminator}, which isn't a jump or RET")
+
+        if len(block.successors) != expected:
+            raise Exception(f"B{block.id} ends with {terminator} but has {len(block.successors)} successors")
+
+        if kind in JUMPS and terminator.label not in block.successors[0].labels:
+            raise Exception(f"B{block.id} jumps to {terminator.label}, which isn't a label of B{block.successors[0].id}")
+
+
+def _block_label_(cfg: ControlFlowGraph, block: BasicBlock) -> str:
+    """Name to jump to the block, named after the function and the block if it has no label"""
+    if not block.labels:
+        block.labels.append(f"{cfg.name}_block_{block.id}")
+
+    return block.labels[0]
+
+
+def lower_cfg(cfg: ControlFlowGraph) -> DefineFunction:
+    """List the blocks in their order, jumping to the blocks that don't follow the ones that fall through to them"""
+    blocks = cfg.blocks
+    listed = []
+
+    # The code of every block is found before it's listed, as a jump can name a block that is listed before it
+    for position, block in enumerate(blocks):
+        code = list(block.instructions)
+        terminator = block.terminator
+
+        if type(terminator) in JUMPS:
+            target = block.successors[0]
+
+            if terminator.label not in target.labels:
+                terminator = type(terminator)(_block_label_(cfg, target))
+
+            code.append(terminator)
+        elif terminator is not None:
+            code.append(terminator)
+
+        if block.falls_through and block.successors:
+            following = block.successors[-1]
+
+            if position + 1 >= len(blocks) or blocks[position + 1] is not following:
+                code.append(Jump(_block_label_(cfg, following)))
+
+        listed.append(code)
+
+    instructions = []
+
+    for block, code in zip(blocks, listed):
+        end = len(instructions) + len(block.labels) + len(code)
+        instructions.extend(Label(label, end) for label in block.labels)
+        instructions.extend(code)
+
+    return DefineFunction(cfg.name, instructions)
+
+
+def print_cfg(cfg: ControlFlowGraph, buffer: StringIO):
+    """Write the blocks of the graph, with their labels, predecessors and successors, for debugging"""
+    predecessors = cfg.predecessors()
+
+    buffer.write(f"CFG {cfg.name}: \n")
+
+    for block in cfg.blocks:
+        sources = ', '.join(f"B{source.id}" for source in predecessors[block.id])
+        labels = ''.join(f" :{label}" for label in block.labels)
+
+        buffer.write(f"B{block.id}{labels}")
+        buffer.write(f"  <- {sources}\n" if sources else ("  <- entry\n" if block is cfg.entry else "\n"))
+
+        for instruction in block.instructions + ([block.terminator] if block.terminator is not None else []):
+            buffer.write("    ")
+            _print_operation_(instruction, buffer)
+            buffer.write("\n")
+
+        targets = ', '.join(f"B{successor.id}" for successor in block.successors)
+        buffer.write(f"  -> {targets or 'exit'}\n")
+
+    buffer.write("\n")
+
+
+def dump_cfg(cfg: ControlFlowGraph) -> str:
+    buffer = StringIO()
+    print_cfg(cfg, buffer)
+
+    return buffer.getvalue()
@@ -1,18 +1,20 @@
-
-
-
-import logging
+import sys
 from io import StringIO
 from typing import Any, List
 
-from logo.lexer import TokenType, COMPARISON_OPERATORS, BOOL_CONDITION_OPERATORS
+from logo.folding import parse_folded
+from logo.lexer import TokenType, ARITHMETIC_OPERATORS, COMPARISON_OPERATORS, BOOL_CONDITION_OPERATORS
 from logo.parse import BinaryOperation, NotOperation, WhileStatement, IfStatement, Assignment, DeclareFunction, \
-    InvokeFunction, Identifier
+    InvokeFunction, Identifier, parse_source
+from logo.nodes import AstNode
 from logo.semantic import NodeVisitor, ScopedSymbolTable, VariableSymbol, FunctionSymbol, \
     RedeclaredSymbolException, TypeMismatchException
 from logo.vm.built_in import built_in_functions, BuiltInFunctions, BuiltInVars, GlobalVariables
+from logo.vm.emitter import Emitter, JUMPS
 from logo.vm.isa import Load, Not, Compare, Store, Push, Label, Add, JumpZ, Jump, JumpLess, Return, Subtract, \
     Multiply, Divide, Pow, DefineFunction, JumpNZ, JumpMore, Call, Set, Truncate, Unset, Random
+from logo.vm.peephole import optimize, O0, O1
+from logo.vm.temps import TempAllocator
 
 
 def mangle_variable(scope: str, variable: str) -> str:
@@ -23,39 +25,94 @@ def mangle_label(scope: str, name: str) -> str:
     return f"{scope}_label_{name}"
 
 
+def _is_pure_(expression) -> bool:
+    """Whether the code of the expression doesn't create labels or variables"""
+    if isinstance(expression, Identifier):
+        return True
+
+    return isinstance(expression, BinaryOperation) and expression.op in ARITHMETIC_OPERATORS
+
+
 class CodeGenerator(NodeVisitor):
-    def __init__(self):
+    phase = 'codegen'
+
+    def __init__(self, tracer=None):
+        super().__init__(tracer)
+
         self.current_scope = ScopedSymbolTable(
             scope_name='global',
             scope_level=1,
             enclosing_scope=None,
+            tracer=tracer,
         )
         self.functions, self.variables = built_in_functions()
+        self.temps = TempAllocator(self.variables, self.current_scope.full_name())
+        self.emitter = None
+        self._labels_ = []
         self._label_counter_ = 0
+        self._pure_scopes_ = {}
+        self._pure_code_ = {}
+        self._pure_nodes_ = []
+        self._variable_names_ = {}
+
+        # The code of a condition is listed before the bodies of its statement, but its labels and variables are
+        # declared after them, so they are numbered and listed in .DATA in the order of the source. While a condition
+        # is generated, the declarations are kept in this list.
+        self._deferred_ = None
 
         self.false_label = None
         self.true_label = None
 
+    def _declare_(self, declaration, *args):
+        if self._deferred_ is None:
+            declaration(*args)
+        else:
+            self._deferred_.append((declaration, args))
+
+    def _declare_deferred_(self, deferred: list):
+        for declaration, args in deferred:
+            declaration(*args)
+
     def _new_variable_(self, name: str, value: Any):
-        variable_name = mangle_variable(self.current_scope.full_name(), name)
+        variable_name = sys.intern(mangle_variable(self.current_scope.full_name(), name))
+
+        self._declare_(self._declare_variable_, name, variable_name, value)
+
+        return variable_name
+
+    def _declare_variable_(self, name: str, variable_name: str, value: Any):
         self.variables[variable_name] = value
 
         if not self.current_scope.lookup(name):
             self.current_scope.insert(VariableSymbol(name))
 
-        return variable_name
-
-    def _new_label_(self, name: str, instructions: list) -> Label:
-        label = Label(self._new_label_name_(name), instructions)
+    def _new_label_(self, name: str, symbol: bool = True):
+        """Return the name of a new label, or its id in a condition, until the label is declared"""
+        if self._deferred_ is None:
+            return self._name_label_(name, symbol)
 
-        self.current_scope.insert(label)
+        label = self._reserve_label_(name)
+        self._deferred_.append((self._name_reserved_label_, (label, symbol)))
 
         return label
 
-    def _new_label_name_(self, name: str) -> str:
+    def _reserve_label_(self, name: str) -> int:
+        self._labels_.append(name)
+
+        return len(self._labels_) - 1
+
+    def _name_reserved_label_(self, label: int, symbol: bool = True):
+        self._labels_[label] = self._name_label_(self._labels_[label], symbol)
+
+    def _name_label_(self, name: str, symbol: bool = True) -> str:
         self._label_counter_ += 1
 
-        return mangle_label(self.current_scope.full_name(), name) + f"_{self._label_counter_}"
+        name = mangle_label(self.current_scope.full_name(), name) + f"_{self._label_counter_}"
+
+        if symbol:
+            self.current_scope.insert(Label(name, None))
+
+        return name
 
     def _load_variable_(self, name: str):
         variable_name = self._get_variable_name_(name)
@@ -65,17 +122,44 @@ class CodeGenerator(NodeVisitor):
         return Store(self._get_variable_name_(variable))
 
     def _push_value_(self, expression):
-        instructions = []
+        if not _is_pure_(expression):
+            return (yield from self._generate_push_(expression))
+
+        # Identifiers and arithmetic only depend on the scope, so their code is kept from the second time a node is
+        # found in the same scope. Programs that share equal expressions (see logo.interning) reuse it for every
+        # occurrence. The nodes are kept in a list, so their ids aren't reused.
+        key = id(expression)
+        scope = self._pure_scopes_.get(key)
+
+        if scope is self.current_scope:
+            code = self._pure_code_.get(key)
+
+            if code is None:
+                start = len(self.emitter.instructions)
+                yield from self._generate_push_(expression)
+                self._pure_code_[key] = self.emitter.instructions[start:]
+            else:
+                self.emitter.extend(code)
 
-        if isinstance(expression, Identifier):
-            instructions = self._built_in_variable_(expression.value)
+            return
+
+        if scope is None:
+            self._pure_nodes_.append(expression)
+        else:
+            self._pure_code_.pop(key, None)
+
+        self._pure_scopes_[key] = self.current_scope
 
-            if instructions:
-                return instructions
+        yield from self._generate_push_(expression)
 
-            instructions = [self._load_variable_(expression.value)]
-        elif isinstance(expression, tuple):
-            instructions.extend(self.visit(expression))
+    def _generate_push_(self, expression):
+        if isinstance(expression, Identifier):
+            if self._built_in_variable_(expression.value):
+                return
+
+            self.emitter.emit(self._load_variable_(expression.value))
+        elif isinstance(expression, AstNode):
+            yield expression
         else:
             value = expression
 
@@ -84,185 +168,262 @@ class CodeGenerator(NodeVisitor):
             elif isinstance(value, str):
                 value = '"' + value + '"'
 
-            instructions.append(Push(value))
-
-        return instructions
+            self.emitter.emit(Push(value))
 
     def visit_BinaryOperation(self, op: BinaryOperation):
-        instructions = []
-
         if op.op in COMPARISON_OPERATORS or op.op in BOOL_CONDITION_OPERATORS:
-            instructions.extend(self._visit_bool_expression_(op))
+            yield from self._visit_bool_expression_(op)
         else:
-            instructions.extend(self._push_value_(op.left))
-            instructions.extend(self._push_value_(op.right))
+            yield from self._push_value_(op.left)
+            yield from self._push_value_(op.right)
 
             if op.op is TokenType.MINUS:
-                instructions.append(Subtract())
+                self.emitter.emit(Subtract())
             elif op.op is TokenType.PLUS:
-                instructions.append(Add())
+                self.emitter.emit(Add())
             elif op.op is TokenType.TIMES:
-                instructions.append(Multiply())
+                self.emitter.emit(Multiply())
             elif op.op is TokenType.DIVIDE:
-                instructions.append(Divide())
+                self.emitter.emit(Divide())
             elif op.op is TokenType.POW:
-                instructions.append(Pow())
-
-        return instructions
+                self.emitter.emit(Pow())
 
     def _visit_bool_expression_(self, op: BinaryOperation):
-        instructions = []
+        emitter = self.emitter
 
         original_true_label = self.true_label
         original_false_label = self.false_label
 
         if op.op is TokenType.AND:
-            true_label = self._new_label_name_("and_true")
+            true_label = self._new_label_("and_true", symbol=False)
             self.true_label = true_label
 
-            instructions.extend(self._push_value_(op.left))
+            yield from self._push_value_(op.left)
 
             self.true_label = original_true_label
 
-            true_label = Label(true_label, self._push_value_(op.right))
-
-            instructions.extend([true_label])
+            position = emitter.open()
+            yield from self._push_value_(op.right)
+            emitter.close(position, true_label)
         elif op.op is TokenType.OR:
-            false_label = self._new_label_name_("or_false")
+            false_label = self._new_label_("or_false", symbol=False)
 
             self.false_label = false_label
 
-            instructions.extend(self._push_value_(op.left))
-
-            false_label = Label(false_label, self._push_value_(op.right))
+            yield from self._push_value_(op.left)
 
-            instructions.extend([false_label])
+            position = emitter.open()
+            yield from self._push_value_(op.right)
+            emitter.close(position, false_label)
         elif op.op in COMPARISON_OPERATORS:
-            variable = self._new_variable_("cmp", 0)
+            yield from self._push_value_(op.left)
+
+            # CMP reads a number or a variable, so only the values that are computed are stored in a scratch variable
+            operand = self._compare_operand_(op.right)
+            temp = None
+
+            if operand is None:
+                yield from self._push_value_(op.right)
 
-            instructions.extend(self._push_value_(op.left))
-            instructions.extend(self._push_value_(op.right))
+                operand = temp = self.temps.acquire()
+                emitter.emit(Store(temp))
 
-            instructions.append(Store(variable))
-            instructions.append(Compare(variable))
+            emitter.emit(Compare(operand))
+
+            if temp is not None:
+                self.temps.release(temp)
 
             if op.op is TokenType.GREATER_THAN:
-                instructions.extend([JumpMore(self.true_label), Jump(self.false_label)])
+                emitter.extend([JumpMore(self.true_label), Jump(self.false_label)])
             elif op.op is TokenType.GREATER_EQUAL:
-                instructions.extend([JumpMore(self.true_label), JumpZ(self.true_label), Jump(self.false_label)])
+                emitter.extend([JumpMore(self.true_label), JumpZ(self.true_label), Jump(self.false_label)])
             elif op.op is TokenType.LESS_EQUAL:
-                instructions.extend([JumpLess(self.true_label), JumpZ(self.true_label), Jump(self.false_label)])
+                emitter.extend([JumpLess(self.true_label), JumpZ(self.true_label), Jump(self.false_label)])
             elif op.op is TokenType.IS_EQUAL:
-                instructions.extend([JumpZ(self.true_label), Jump(self.false_label)])
+                emitter.extend([JumpZ(self.true_label), Jump(self.false_label)])
             elif op.op is TokenType.NOT_EQUAL:
-                instructions.extend([JumpMore(self.false_label), Jump(self.true_label)])
+                emitter.extend([JumpMore(self.false_label), Jump(self.true_label)])
             elif op.op is TokenType.LESS_THAN:
-                instructions.extend([JumpLess(self.true_label), Jump(self.false_label)])
+                emitter.extend([JumpLess(self.true_label), Jump(self.false_label)])
 
         self.true_label = original_true_label
         self.false_label = original_false_label
 
-        return instructions
+    def _compare_operand_(self, expression):
+        """The number or variable CMP can read for the expression, or None if its value has to be computed"""
+        if type(expression) is float:
+            return expression
+
+        if isinstance(expression, Identifier) and expression.value.upper() != BuiltInVars.RANDOM.value:
+            return self._load_variable_(expression.value).id
+
+        return None
 
     def visit_NotOperation(self, op: NotOperation):
-        instructions = self.visit(op.expression)
-        instructions.append(Not())
-        return instructions
+        yield op.expression
+        self.emitter.emit(Not())
+
+    def _condition_(self, condition, true_label, false_label):
+        """Generate the condition of an IF or WHILE statement, jumping to one of the labels"""
+        if isinstance(condition, Identifier):
+            self.emitter.extend([
+                self._load_variable_(condition.value), Compare(1), JumpZ(true_label), Jump(false_label),
+            ])
+        else:
+            original_labels = [self.true_label, self.false_label]
+
+            self.true_label = true_label
+            self.false_label = false_label
+
+            yield condition
+
+            self.true_label, self.false_label = original_labels
+
+    def _body_(self, statements):
+        for statement in statements or []:
+            instructions = yield statement
+
+            # Functions declared in a block are listed in it too
+            if instructions is not None:
+                self.emitter.splice(instructions)
 
     def visit_WhileStatement(self, statement: WhileStatement):
-        condition_instructions = []
-        body_instructions = []
+        emitter = self.emitter
+        deferred = self._deferred_ = []
+
+        end_label = self._new_label_("end_while")
+        body_label = self._new_label_("body_while")
+
+        if isinstance(statement.condition, AstNode):
+            while_label = self._reserve_label_("while")
+
+            position = emitter.open()
+            yield from self._condition_(statement.condition, body_label, end_label)
 
-        if statement.body:
-            for st in statement.body or []:
-                body_instructions.extend(self.visit(st))
+            self._declare_(self._name_reserved_label_, while_label)
+            self._deferred_ = None
 
-        end_label = self._new_label_("end_while", [])
-        body_label = self._new_label_("body_while", body_instructions)
+            while_end = body_position = emitter.open()
+            yield from self._body_(statement.body)
+            body_end = len(emitter.instructions)
 
-        self.true_label = body_label.name
-        self.false_label = end_label.name
+            self._declare_deferred_(deferred)
 
-        if isinstance(statement.condition, Identifier):
-            condition_instructions.append(self._load_variable_(statement.condition.value))
-            condition_instructions.extend([Compare(1), JumpZ(body_label.name), Jump(end_label.name)])
-        elif isinstance(statement.condition, tuple):
-            condition_instructions.extend(self.visit(statement.condition))
+            # The labels of the condition are named once declared
+            labels = self._labels_
+            emitter.resolve(labels, position + 1, while_end)
+            emitter.close(position, labels[while_label], while_end)
+            emitter.close(body_position, labels[body_label], body_end)
+
+            emitter.emit(Jump(labels[while_label]))
+            emitter.label(labels[end_label])
         else:
-            if statement.condition:
-                return body_instructions
-            else:
-                return []
+            # The body of a constant condition is listed without labels, or generated and dropped
+            self._deferred_ = None
+
+            position = len(emitter.instructions)
+            yield from self._body_(statement.body)
 
-        while_label = self._new_label_("while", condition_instructions)
+            if not statement.condition:
+                emitter.truncate(position)
 
-        return [while_label, body_label, Jump(while_label.name), end_label]
+            self._declare_deferred_(deferred)
 
     def visit_IfStatement(self, statement: IfStatement):
-        instructions = []
-        body_instructions = []
-        else_instructions = []
-        end_label = self._new_label_("end_if", [])
-
-        if statement.body:
-            for st in statement.body or []:
-                body_instructions.extend(self.visit(st))
-                
-            body_instructions.append(Jump(end_label.name))    
-        if statement.else_body:
-            for st in statement.else_body or []:
-                else_instructions.extend(self.visit(st))
-
-        body_label = self._new_label_("body", body_instructions)
-        else_label = self._new_label_("else_body", else_instructions)
-
-        self.true_label = body_label.name
-        self.false_label = else_label.name
-
-        if isinstance(statement.condition, Identifier):
-            instructions.append(self._load_variable_(statement.condition.value))
-            instructions.extend([Compare(1), JumpZ(body_label.name), Jump(else_label.name)])
-        elif isinstance(statement.condition, tuple):
-            instructions.extend(self.visit(statement.condition))
-        elif isinstance(statement.condition, bool):
+        emitter = self.emitter
+        end_label = self._new_label_("end_if")
+
+        deferred = self._deferred_ = []
+
+        body_label = self._new_label_("body")
+        else_label = self._new_label_("else_body")
+
+        if isinstance(statement.condition, bool):
+            # Both bodies are generated, and only the one of the condition is listed
+            self._deferred_ = None
+
+            position = len(emitter.instructions)
+            yield from self._body_(statement.body)
+
             if statement.condition:
-                return body_instructions
+                position = len(emitter.instructions)
             else:
-                return else_instructions
-        
-        instructions.extend([body_label, else_label, end_label])
+                emitter.truncate(position)
 
-        return instructions
+            yield from self._body_(statement.else_body)
+
+            if statement.condition:
+                emitter.truncate(position)
+
+            self._declare_deferred_(deferred)
+        else:
+            start = len(emitter.instructions)
+
+            if isinstance(statement.condition, AstNode):
+                yield from self._condition_(statement.condition, body_label, else_label)
+
+            self._deferred_ = None
+
+            body_position = emitter.open()
+            yield from self._body_(statement.body)
+
+            if statement.body:
+                emitter.emit(Jump(end_label))
+
+            else_position = emitter.open()
+            yield from self._body_(statement.else_body)
+            else_end = len(emitter.instructions)
+
+            self._declare_deferred_(deferred)
+
+            # The labels of the condition are named once declared
+            labels = self._labels_
+            emitter.resolve(labels, start, body_position)
+            emitter.close(body_position, labels[body_label], else_position)
+            emitter.close(else_position, labels[else_label], else_end)
+
+            emitter.label(end_label)
 
     def visit_Assignment(self, assignment: Assignment):
+        emitter = self.emitter
+
         self._expect_not_declared_(assignment.variable, VariableSymbol)
 
         self._new_variable_(assignment.variable, 0)
 
-        store_label = self._new_label_("assign_store", [self._store_(assignment.variable)])
+        store = self._store_(assignment.variable)
+        store_label = self._new_label_("assign_store")
 
-        true_label = self._new_label_("assign_true", [Push(1), Jump(store_label.name)])
-        false_label = self._new_label_("assign_false", [Push(0), Jump(store_label.name)])
+        true_label = self._new_label_("assign_true")
+        false_label = self._new_label_("assign_false")
 
         original_labels = [self.true_label, self.false_label]
 
-        self.true_label = true_label.name
-        self.false_label = false_label.name
+        self.true_label = true_label
+        self.false_label = false_label
 
-        instructions = []
-
-        instructions.extend(self._push_value_(assignment.value))
-        instructions.append(Jump(store_label.name))
+        yield from self._push_value_(assignment.value)
+        emitter.emit(Jump(store_label))
 
         self.true_label, self.false_label = original_labels
 
-        instructions.extend([true_label, false_label, store_label])
-
-        return instructions
+        emitter.label(true_label, Push(1), Jump(store_label))
+        emitter.label(false_label, Push(0), Jump(store_label))
+        emitter.label(store_label, store)
 
     def _get_variable_name_(self, identifier: str):
-        _, scope_name = self.current_scope.lookup(identifier)
-        var_name = mangle_variable(scope_name, identifier)
+        _, scope = self.current_scope.resolve(identifier)
+
+        if scope is None and self._deferred_ is not None:
+            # A condition can use the variables declared in the body of its statement, which is generated after it
+            self._declare_(self._expect_symbol_, identifier)
+            scope = self.current_scope
+
+        key = (scope.full_name(), identifier)
+        var_name = self._variable_names_.get(key)
+
+        if var_name is None:
+            var_name = self._variable_names_[key] = sys.intern(mangle_variable(*key))
 
         return var_name
 
@@ -273,58 +434,54 @@ class CodeGenerator(NodeVisitor):
 
         self.current_scope.insert(FunctionSymbol(function_name, function.args))
 
-        instructions = []
+        enclosing_emitter = self.emitter
+        emitter = self.emitter = Emitter()
 
         if function.body:
             for arg in function.args or []:
                 self._new_variable_(arg, 0)
-                instructions.append(self._store_(arg))
+                emitter.emit(self._store_(arg))
 
             for statement in function.body or []:
-                if isinstance(statement, DeclareFunction):
-                    self.visit(statement)
-                else:
-                    instructions.extend(self.visit(statement))
+                yield statement
+
+        emitter.emit(Return())
 
-        instructions.append(Return())
+        self.emitter = enclosing_emitter
 
+        instructions = emitter.instructions
         self.functions[function_name] = DefineFunction(function_name, instructions)
 
+        if self.tracer is not None:
+            self.tracer.emit(self.phase, self.functions[function_name])
+
         return instructions
 
     def visit_InvokeFunction(self, function: InvokeFunction):
         function_name = function.name.upper()
         symbol: FunctionSymbol = self._expect_symbol_(function_name, FunctionSymbol)
 
-        instructions = self._built_in_function_(function)
-
-        if instructions:
-            return instructions
-
-        instructions = []
+        if (yield from self._built_in_function_(function)):
+            return
 
         if len(function.args or []) != len(symbol.params or []):
             raise Exception(f"Expected {len(symbol.params)} but {len(function.args)} were informed")
 
-        self._function_parameters_(function, instructions)
-
-        instructions.append(Call(function.name))
+        yield from self._function_parameters_(function)
 
-        return instructions
+        self.emitter.emit(Call(function.name))
 
-    def _function_parameters_(self, function, instructions):
+    def _function_parameters_(self, function):
         for param in function.args or []:
             if param is Identifier:
                 self._expect_symbol_(param.value, VariableSymbol)
 
-            instructions.extend(self._push_value_(param))
+            yield from self._push_value_(param)
 
     def visit_Identifier(self, id: Identifier):
         self._expect_symbol_(id.value)
 
     def __enter_scope__(self, name: str):
-        logging.debug(f"Entering scope '{name}'")
-
         scope = ScopedSymbolTable(
             scope_name=name,
             scope_level=self.current_scope.scope_level,
@@ -334,8 +491,11 @@ class CodeGenerator(NodeVisitor):
         self.current_scope.children_scopes.append(scope)
         self.current_scope = scope
 
+        if self.tracer is not None:
+            self.tracer.enter_scope(self.phase, scope)
+
     def _expect_not_declared_(self, name: str, type=None, current_scope_only=True):
-        symbol, _ = self.current_scope.lookup(name, current_scope_only)
+        symbol, _ = self.current_scope.resolve(name, current_scope_only)
 
         def throw():
             raise RedeclaredSymbolException(
@@ -349,12 +509,13 @@ class CodeGenerator(NodeVisitor):
             throw()
 
     def __exit_scope__(self):
-        logging.debug(f"Exiting scope '{self.current_scope.scope_name}'")
+        if self.tracer is not None:
+            self.tracer.exit_scope(self.phase, self.current_scope)
 
         self.current_scope = self.current_scope.enclosing_scope
 
     def _expect_symbol_(self, name: str, symbol_type=None, current_scope_only=False):
-        symbol, _ = self.current_scope.lookup(name, current_scope_only)
+        symbol, _ = self.current_scope.resolve(name, current_scope_only)
 
         if symbol:
             if not symbol_type:
@@ -367,30 +528,51 @@ class CodeGenerator(NodeVisitor):
 
         return symbol
 
-    def _built_in_function_(self, function) -> List[Any]:
-        instructions = []
-
+    def _built_in_function_(self, function) -> bool:
         if function.name.upper() == BuiltInFunctions.WRITE.value:
-            self._function_parameters_(function, instructions)
+            yield from self._function_parameters_(function)
 
-            instructions.extend([
+            self.emitter.extend([
                 Push(len(function.args or [])),
                 Call(BuiltInFunctions.WRITE.value)
             ])
 
-            return instructions
+            return True
 
-    def _built_in_variable_(self, variable) -> List[Any]:
-        instructions = []
+        return False
 
+    def _built_in_variable_(self, variable) -> bool:
         if variable.upper() == BuiltInVars.RANDOM.value:
-            instructions.extend([Random(), Push(9), Multiply(), Truncate()])
+            self.emitter.extend([Random(), Push(9), Multiply(), Truncate()])
 
-            return instructions
+            return True
         elif variable.upper == BuiltInVars.HEADING.value:
-            instructions.extend([Load(GlobalVariables.Angle.value)])
+            self.emitter.emit(Load(GlobalVariables.Angle.value))
+
+            return True
+
+        return False
+
+
+def compile_source(source: str, start: str = 'MAIN', tracer=None, level: int = O0) -> str:
+    """Compile the source to a logovm program whose entry point is the function `start`.
 
-            return instructions
+    Each call uses its own lexer, parser and code generator, so sources can be compiled from several threads. The
+    tracer, if any, receives the events of the code generator (see logo.trace). `level` is the optimization level of
+    the code (see logo.vm.peephole), from O1 the constant expressions are folded too (see logo.folding).
+    """
+    if level >= O1:
+        program, _ = parse_folded(source)
+    else:
+        program = parse_source(source)
+
+    main = DeclareFunction(start, None, program)
+
+    code_gen = CodeGenerator(tracer)
+    code_gen.visit(main)
+    code_gen.functions = optimize(code_gen.functions, level, tracer)
+
+    return print_program(code_gen, main.name)
 
 
 def print_program(code: CodeGenerator, start: str) -> str:
@@ -420,14 +602,33 @@ def print_variables(variables: dict, buffer: StringIO):
 def print_function(func: DefineFunction, buffer: StringIO):
     buffer.write(f"DEF {func.id}: \n")
 
-    for instruction in func.instructions:
+    # Ends of the labels whose instructions are being written
+    ends = []
+
+    for position, instruction in enumerate(func.instructions):
+        while ends and ends[-1] == position:
+            ends.pop()
+            buffer.write("\n")
+
         buffer.write("  ")
         print_instruction(instruction, buffer)
 
+        if isinstance(instruction, Label):
+            ends.append(instruction.end)
+
+    buffer.write("\n" * len(ends))
     buffer.write("\n\n")
 
 
 def print_instruction(ins: Any, buffer: StringIO):
+    if isinstance(ins, Label):
+        buffer.write(f"\n:{ins.name}\n")
+    else:
+        _print_operation_(ins, buffer)
+        buffer.write("\n")
+
+
+def _print_operation_(ins: Any, buffer: StringIO):
     instruction_name = type(ins).__name__
 
     if isinstance(ins, Load):
@@ -438,19 +639,11 @@ def print_instruction(ins: Any, buffer: StringIO):
         buffer.write(f"{instruction_name} {ins.id}")
     elif isinstance(ins, Compare):
         buffer.write(f"{instruction_name} {ins.value}")
-    elif type(ins) in [Jump, JumpZ, JumpLess, JumpMore, JumpNZ]:
+    elif type(ins) in JUMPS:
         buffer.write(f"{instruction_name} :{ins.label}")
     elif isinstance(ins, Call):
         buffer.write(f"{instruction_name} {ins.function}")
     elif type(ins) in [Set, Unset]:
         buffer.write(f"{instruction_name} {ins.number}")
-    elif isinstance(ins, Label):
-        buffer.write(f"\n:{ins.name}\n")
-
-        for instruction in ins.instructions:
-            buffer.write("  ")
-            print_instruction(instruction, buffer)
     else:
-        buffer.write(f"{instruction_name}")
-
-    buffer.write("\n")
\ No newline at end of file
+        buffer.write(f"{instruction_name}")
\ No newline at end of file
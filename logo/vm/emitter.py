@@ -0,0 +1,63 @@
+from typing import Any, List
+
+from logo.vm.isa import Label, Jump, JumpZ, JumpNZ, JumpMore, JumpLess
+
+JUMPS = (Jump, JumpZ, JumpNZ, JumpMore, JumpLess)
+
+_LABELED_ = frozenset((Label,) + JUMPS)
+
+
+class Emitter(object):
+    """Instructions of one function in a flat list, appended in the order they are listed.
+
+    A label is a marker in the list, Label(name, end), where `end` is the position after the last instruction listed
+    under it. Labels and jumps can refer to a label by id until it's named, and `resolve` replaces the ids by the names.
+    """
+
+    def __init__(self):
+        self.instructions = []
+        self.emit = self.instructions.append
+        self.extend = self.instructions.extend
+
+    def open(self) -> int:
+        """Reserve the position of a label. The instructions emitted until it's closed are listed under it."""
+        self.instructions.append(None)
+
+        return len(self.instructions) - 1
+
+    def close(self, position: int, label, end: int = None):
+        """List the label at the position, with the instructions until `end`, by default the ones emitted since"""
+        self.instructions[position] = Label(label, len(self.instructions) if end is None else end)
+
+    def label(self, label, *instructions):
+        """List the label with its instructions"""
+        listing = self.instructions
+        listing.append(Label(label, len(listing) + len(instructions) + 1))
+        listing.extend(instructions)
+
+    def truncate(self, position: int):
+        """Drop the instructions emitted from the position"""
+        del self.instructions[position:]
+
+    def splice(self, instructions: List[Any]):
+        """Append the instructions of another function, moving the ends of its labels"""
+        offset = len(self.instructions)
+
+        for instruction in instructions:
+            if isinstance(instruction, Label):
+                instruction = Label(instruction.name, instruction.end + offset)
+
+            self.instructions.append(instruction)
+
+    def resolve(self, names: List[str], start: int, stop: int):
+        """Replace the ids of the labels by their names in the instructions between the positions"""
+        instructions = self.instructions
+
+        for position in range(start, stop):
+            instruction = instructions[position]
+
+            if type(instruction) in _LABELED_:
+                label = instruction[0]
+
+                if type(label) is int:
+                    instructions[position] = tuple.__new__(type(instruction), (names[label],) + instruction[1:])
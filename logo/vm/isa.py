@@ -9,7 +9,7 @@ Store = namedtuple("STOR", "id")
 
 Compare = namedtuple("CMP", "value")
 
-Label = namedtuple("Label", "name instructions")
+Label = namedtuple("Label", "name end")
 Jump = namedtuple("JP", "label")
 JumpZ = namedtuple("JZ", "label")
 JumpNZ = namedtuple("JNZ", "label")
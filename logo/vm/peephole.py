@@ -0,0 +1,271 @@
+from collections import namedtuple, Counter
+from typing import Any, Dict, List, Optional
+
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label, Jump, JumpZ, JumpNZ, Push, Load, Store, Compare, DefineFunction
+
+# Levels of optimization, as the -O options of the compilers. O0 lists the code as generated.
+O0, O1, O2 = 0, 1, 2
+
+# A rule rewrites a window of instructions, the last one being the instruction just added. `pattern` has the types that
+# each instruction of the window can have. `rewrite` returns None if the window doesn't match, or the instructions in
+# place of the window, None for the ones that are dropped.
+Rule = namedtuple("Rule", "name level pattern rewrite")
+
+# Pattern of an instruction of any type
+_ANY_ = None
+
+
+class ProgramFacts(object):
+    """What the rules need to know about the whole program: the number of jumps to each label, the place of each label
+    (the labels between the same instructions share it), the first instruction listed under each label, and the
+    scratch variables that are only compared right after being stored."""
+
+    def __init__(self, functions: Dict[str, DefineFunction]):
+        self.labels = Counter()
+        self.places = {}
+        self.targets = {}
+        self.scratch = set()
+
+        read = set()
+        place = 0
+
+        for function in functions.values():
+            pending = []
+            previous = None
+
+            for instruction in function.instructions:
+                if instruction is None:
+                    continue
+
+                kind = type(instruction)
+
+                if kind is Label:
+                    self.places[instruction.name] = place
+                    pending.append(instruction.name)
+                    continue
+
+                for name in pending:
+                    self.targets[name] = instruction
+
+                pending = []
+                place += 1
+
+                if kind in JUMPS:
+                    self.labels[instruction.label] += 1
+                elif kind is Load:
+                    read.add(instruction.id)
+                elif kind is Compare and isinstance(instruction.value, str):
+                    if type(previous) is Store and previous.id == instruction.value:
+                        self.scratch.add(instruction.value)
+                    else:
+                        read.add(instruction.value)
+
+                previous = instruction
+
+        self.scratch -= read
+
+    def replace(self, instruction, replacement):
+        """Count the jumps of a rewritten instruction"""
+        if type(instruction) in JUMPS:
+            self.labels[instruction.label] -= 1
+
+        if type(replacement) in JUMPS:
+            self.labels[replacement.label] += 1
+
+    def final_target(self, label: str) -> str:
+        """The label a jump to `label` ends up at, following the labels that only jump to another one. Jumps in a loop
+        of such labels are left as they are."""
+        final = label
+        seen = {label}
+        target = self.targets.get(label)
+
+        while type(target) is Jump:
+            if target.label in seen:
+                return label
+
+            final = target.label
+            seen.add(final)
+            target = self.targets.get(final)
+
+        return final
+
+
+def _unused_label_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    label, = window
+
+    if not facts.labels[label.name]:
+        return [None]
+
+
+def _jump_to_next_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    jump, label = window
+
+    if facts.places.get(jump.label) == facts.places[label.name]:
+        return [None, label]
+
+
+def _unreachable_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    jump, instruction = window
+
+    if type(instruction) is not Label:
+        return [jump, None]
+
+
+def _thread_jump_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    jump, = window
+
+    target = facts.final_target(jump.label)
+
+    if target != jump.label:
+        return [type(jump)(target)]
+
+
+def _invert_branch_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    branch, jump, label = window
+
+    if facts.places.get(branch.label) == facts.places[label.name]:
+        inverse = JumpNZ if type(branch) is JumpZ else JumpZ
+
+        return [inverse(jump.label), None, label]
+
+
+def _compare_operand_(window: List[Any], facts: ProgramFacts) -> Optional[List[Any]]:
+    push, store, compare = window
+
+    if store.id != compare.value or compare.value not in facts.scratch:
+        return None
+
+    if type(push) is Load:
+        return [None, None, Compare(push.id)]
+    elif type(push) is Push and type(push.value) in (int, float):
+        return [None, None, Compare(push.value)]
+
+
+RULES = [
+    Rule("unused label", O1, [(Label,)], _unused_label_),
+    Rule("jump to the next label", O1, [JUMPS, (Label,)], _jump_to_next_),
+    Rule("unreachable code", O1, [(Jump,), _ANY_], _unreachable_),
+    Rule("jump to a jump", O2, [JUMPS], _thread_jump_),
+    Rule("branch over a jump", O2, [(JumpZ, JumpNZ), (Jump,), (Label,)], _invert_branch_),
+    Rule("compare with the operand", O2, [(Push, Load), (Store,), (Compare,)], _compare_operand_),
+]
+
+
+def _rewrite_(instructions: List[Any], rules: List[Rule], facts: ProgramFacts) -> bool:
+    """Apply the rules to the instructions in place, dropping instructions by setting them to None"""
+    changed = False
+    # Instructions kept so far and their positions, the windows are taken from their end
+    stack = []
+    positions = []
+    # Rules that can match, by the type of the last instruction
+    table = {}
+
+    for position, instruction in enumerate(instructions):
+        if instruction is None:
+            continue
+
+        stack.append(instruction)
+        positions.append(position)
+
+        while stack:
+            last = type(stack[-1])
+            candidates = table.get(last)
+
+            if candidates is None:
+                candidates = table[last] = [
+                    rule for rule in rules if rule.pattern[-1] is _ANY_ or last in rule.pattern[-1]
+                ]
+
+            for rule in candidates:
+                pattern = rule.pattern
+                size = len(pattern)
+
+                if size > len(stack):
+                    continue
+
+                # The instruction before the last one rules out most windows
+                if size > 1:
+                    types = pattern[-2]
+
+                    if types is not _ANY_ and type(stack[-2]) not in types:
+                        continue
+
+                window = stack[-size:]
+
+                if size > 2 and not all(types is _ANY_ or type(kept) in types for types, kept in zip(pattern, window)):
+                    continue
+
+                replacement = rule.rewrite(window, facts)
+
+                if replacement is None:
+                    continue
+
+                indexes = positions[-size:]
+
+                del stack[-size:]
+                del positions[-size:]
+
+                for index, kept, replaced in zip(indexes, window, replacement):
+                    if replaced is not kept:
+                        facts.replace(kept, replaced)
+                        instructions[index] = replaced
+
+                    if replaced is not None:
+                        stack.append(replaced)
+                        positions.append(index)
+
+                changed = True
+                break
+            else:
+                break
+
+    return changed
+
+
+def _compact_(instructions: List[Any]) -> List[Any]:
+    """Remove the dropped instructions, moving the ends of the labels"""
+    kept = []
+    # Number of instructions kept before each position
+    positions = []
+
+    for instruction in instructions:
+        positions.append(len(kept))
+
+        if instruction is not None:
+            kept.append(instruction)
+
+    positions.append(len(kept))
+
+    return [
+        Label(instruction.name, positions[instruction.end]) if type(instruction) is Label else instruction
+        for instruction in kept
+    ]
+
+
+def optimize(functions: Dict[str, DefineFunction], level: int = O1, tracer=None) -> Dict[str, DefineFunction]:
+    """Return the functions with the rules of the optimization level applied until none matches"""
+    rules = [rule for rule in RULES if rule.level <= level]
+
+    if not rules:
+        return functions
+
+    working = {name: DefineFunction(name, list(function.instructions)) for name, function in functions.items()}
+    changed = True
+
+    while changed:
+        facts = ProgramFacts(working)
+        changed = False
+
+        for function in working.values():
+            changed = _rewrite_(function.instructions, rules, facts) or changed
+
+    optimized = {}
+
+    for name, function in working.items():
+        optimized[name] = DefineFunction(name, _compact_(function.instructions))
+
+        if tracer is not None:
+            tracer.emit('peephole', optimized[name])
+
+    return optimized
@@ -0,0 +1,34 @@
+import sys
+
+
+def mangle_temp(scope: str, slot: int) -> str:
+    """Name of a scratch variable. Variables of the program are named `<scope>_var_<name>`, so they can't take it."""
+    return f"{scope}_tmp_{slot}"
+
+
+class TempAllocator(object):
+    """Scratch variables of the generated code in a scope.
+
+    A slot is acquired to hold a value until it's read, and released after it, so the next value reuses it. The
+    program only needs as many slots as values that are held at the same time, whatever the number of expressions.
+    The slots are added to `variables` the first time they are given.
+    """
+
+    def __init__(self, variables: dict, scope: str):
+        self.variables = variables
+        self.scope = scope
+        self.slots = 0
+        self._free_ = []
+
+    def acquire(self) -> str:
+        if self._free_:
+            return self._free_.pop()
+
+        name = sys.intern(mangle_temp(self.scope, self.slots))
+        self.slots += 1
+        self.variables[name] = 0
+
+        return name
+
+    def release(self, name: str):
+        self._free_.append(name)
@@ -1,5 +1,4 @@
-from logo.parse import parser, DeclareFunction
-from logo.lexer import lexer
+from logo.parse import parse_source, DeclareFunction
 from printree import ptree
 
 from logo.semantic import SemanticAnalyzer
@@ -32,7 +31,7 @@ if __name__ == '__main__':
     END
     """
 
-    result = parser.parse(s, lexer=lexer)
+    result = parse_source(s)
 
     analyzer = SemanticAnalyzer()
     analyzer.visit(DeclareFunction('main', None, result))
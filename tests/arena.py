@@ -0,0 +1,175 @@
+import pickle
+import re
+import unittest
+
+from logo.arena import parse_arena, Arena, NODE, TAG_BITS, TAG_MASK
+from logo.binary import load, dumps
+from logo.lexer import LEXER_BACKENDS
+from logo.nodes import AstNode
+from logo.parse import parse_source, DeclareFunction, Assignment, Identifier, parser
+from logo.semantic import SemanticAnalyzer, RedeclaredSymbolException
+from logo.vm.codegen import CodeGenerator, print_program
+from tests.concurrency import generate_program
+from tests.lexer import generate_corpus
+from tests.trace import RecordingTracer
+
+PROGRAM = """
+TO SQUARE :SIZE
+  I = 0
+  WHILE ( :I < 4 )
+    FORWARD :SIZE
+    RIGHT 90
+    I = :I + 1
+  END
+END
+
+X = 3 * 2 ^ 2
+B = :X > 1 AND NOT :X == 2 OR FALSE
+IF ( :B ) THEN
+  SQUARE :X
+ELSE
+  WRITE 'no square'
+END
+"""
+
+
+def compile_program(program) -> str:
+    code_gen = CodeGenerator()
+    code_gen.visit(DeclareFunction('MAIN', None, program))
+
+    return print_program(code_gen, 'MAIN')
+
+
+def analysis_events(source: str, arena: bool) -> list:
+    """Events of the analysis of the source, and the error it raised, from the node objects or the arena"""
+    tracer = RecordingTracer()
+    analyzer = SemanticAnalyzer(tracer)
+    error = None
+
+    try:
+        if arena:
+            analyzer.analyze_arena(parse_arena(source))
+        else:
+            analyzer.visit(DeclareFunction('MAIN', None, parse_source(source)))
+    except Exception as e:
+        error = (type(e), str(e))
+
+    # The arena has no node for the function that holds the program
+    events = tracer.events if arena else tracer.events[1:]
+
+    return events + [error]
+
+
+def preorder(program) -> list:
+    """Classes of the node objects of the program, parents first in source order"""
+    classes = []
+    pending = [program]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, AstNode):
+            classes.append(type(value))
+
+        if isinstance(value, (list, AstNode)):
+            pending.extend(reversed(list(value)))
+
+    return classes
+
+
+class ArenaTestSpec(unittest.TestCase):
+
+    def test_same_program(self):
+        # Only the valid programs of the corpus
+        sources = [source for index, source in enumerate(generate_corpus()) if index in [0, 1, 2, 4]] + [PROGRAM]
+
+        for backend in LEXER_BACKENDS:
+            for source in sources:
+                with self.subTest(backend=backend, source=source[:40]):
+                    self.assertEqual(parse_arena(source, backend).program, parse_source(source, backend))
+
+    def test_positions(self):
+        expected = parse_source(PROGRAM)
+        actual = parse_arena(PROGRAM).program
+
+        self.assertEqual([statement.position for statement in actual], [statement.position for statement in expected])
+        self.assertEqual(actual[0].body[1].condition.position, expected[0].body[1].condition.position)
+
+    def test_compile(self):
+        self.assertEqual(compile_program(parse_arena(PROGRAM).program), compile_program(parse_source(PROGRAM)))
+
+    def test_semantic_analysis(self):
+        SemanticAnalyzer().visit(DeclareFunction('main', None, parse_arena(PROGRAM).program))
+
+        with self.assertRaises(RedeclaredSymbolException):
+            SemanticAnalyzer().visit(DeclareFunction('main', None, parse_arena(PROGRAM + 'SQUARE = 1').program))
+
+    def test_analyze_arena(self):
+        valid = [source for index, source in enumerate(generate_corpus()) if index in [0, 1, 2, 4]]
+        invalid = [PROGRAM + 'SQUARE = 1', 'X = :Y', 'SQUARE 1', PROGRAM + 'SQUARE 1 2', 'TO F :A \n END \n F = 1']
+        sources = valid + invalid + [PROGRAM, '\n'] + [generate_program(seed) for seed in range(7)]
+
+        for source in sources:
+            with self.subTest(source=source[:40]):
+                self.assertEqual(analysis_events(source, arena=True), analysis_events(source, arena=False))
+
+        with self.assertRaises(RedeclaredSymbolException):
+            SemanticAnalyzer().analyze_arena(parse_arena(PROGRAM + 'SQUARE = 1'))
+
+    def test_storage(self):
+        arena = parse_arena("X = 1 \n Y = :X + 1 \n X = :Y")
+
+        # Assignment and identifiers by statement, plus the sum
+        self.assertEqual(len(arena), 6)
+        self.assertEqual(arena.strings, ['X', 'Y'])
+        self.assertEqual(list(arena.numbers), [1.0, 1.0])
+        self.assertEqual(arena.node(0), Assignment('X', 1.0))
+
+    def test_invalid_program(self):
+        with self.assertRaisesRegex(Exception, "Unexpected math operator"):
+            parse_arena("IF ( :X + 1 ) THEN \n END")
+
+        with self.assertRaises(Exception):
+            parse_arena("X = ")
+
+        # The parser goes back to creating node objects after an error
+        self.assertIsInstance(parse_source("X = 1")[0], Assignment)
+        self.assertNotIsInstance(parser.nodes, Arena)
+
+    def test_empty_program(self):
+        self.assertIsNone(parse_arena("\n\n").program)
+
+    def test_walk(self):
+        arena = parse_arena(PROGRAM)
+        expected = preorder(parse_source(PROGRAM))
+
+        for walked in [arena, load(dumps(arena))]:
+            self.assertEqual([walked.kind_of(index) for index in walked.walk()], expected)
+
+        self.assertEqual(list(Arena().walk()), [])
+
+    def test_index_accessors(self):
+        arena = parse_arena("X = 1 \n WRITE :X 2")
+        write = arena.list_items[arena.item_range(arena.root)[1]] >> TAG_BITS
+        args = arena.child(write, 1)
+
+        self.assertEqual(arena.value(arena.child(write, 0)), 'WRITE')
+        self.assertEqual(len(arena.item_range(args)), 2)
+
+        identifier = arena.list_items[arena.item_range(args)[0]]
+
+        self.assertEqual(identifier & TAG_MASK, NODE)
+        self.assertIs(arena.kind_of(identifier >> TAG_BITS), Identifier)
+        self.assertEqual(list(arena.walk(args)), [identifier >> TAG_BITS])
+
+    def test_pickle_views(self):
+        program = parse_arena(PROGRAM).program
+        actual = pickle.loads(pickle.dumps(program))
+
+        self.assertEqual(actual, parse_source(PROGRAM))
+        self.assertIs(type(actual[0]), DeclareFunction)
+        self.assertTrue(re.match(r"DeclareFunction\(name='SQUARE'", repr(program[0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+from logo.arena import parse_arena
+from logo.binary import dump, dumps, load, MappedProgram, FORMAT_VERSION
+from logo.lexer import TokenType
+from logo.parse import parse_source, BinaryOperation, Identifier, IfStatement
+from tests.arena import compile_program
+from tests.lexer import generate_corpus
+
+PROGRAM = """
+TO SQUARE :SIZE
+  I = 0
+  WHILE ( :I < 4 )
+    FORWARD :SIZE
+    RIGHT 90
+    I = :I + 1
+  END
+END
+
+TO GREET
+  WRITE 'héllo wörld'
+END
+
+X = 3.25 * 2 ^ 2
+B = :X > 1 AND NOT :X == 2 OR FALSE
+IF ( :B ) THEN
+  SQUARE :X
+ELSE
+  GREET
+END
+"""
+
+
+class BinaryTestSpec(unittest.TestCase):
+
+    def test_round_trip(self):
+        sources = [source for index, source in enumerate(generate_corpus()) if index in [0, 1, 2, 4]] + [PROGRAM]
+
+        for source in sources:
+            with self.subTest(source=source[:40]):
+                expected = parse_source(source)
+
+                self.assertEqual(load(dumps(expected)).program, expected)
+                self.assertEqual(load(dumps(parse_arena(source))).program, expected)
+
+    def test_positions(self):
+        expected = parse_source(PROGRAM)
+        actual = load(dumps(expected)).program
+
+        self.assertEqual([statement.position for statement in actual], [statement.position for statement in expected])
+        self.assertEqual(actual[4].condition.position, expected[4].condition.position)
+
+    def test_empty_program(self):
+        self.assertIsNone(load(dumps(parse_arena(""))).program)
+
+    def test_deep_expression(self):
+        condition = BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0)
+
+        for i in range(5000):
+            condition = BinaryOperation(TokenType.AND, BinaryOperation(TokenType.LESS_THAN, Identifier('X'), float(i)),
+                                        condition)
+
+        data = dumps([IfStatement(condition, None, None)])
+        node = load(data).program[0].condition
+
+        for _ in range(5000):
+            node = node.right
+
+        self.assertEqual(node, BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0))
+
+    def test_compile(self):
+        self.assertEqual(compile_program(load(dumps(parse_source(PROGRAM))).program),
+                         compile_program(parse_source(PROGRAM)))
+
+    def test_mapped_procedure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'library.ast')
+
+            with open(path, 'wb') as f:
+                dump(parse_source(PROGRAM), f)
+
+            with MappedProgram(path) as arena:
+                self.assertEqual(sorted(arena.procedures()), ['GREET', 'SQUARE'])
+
+                procedure = arena.procedure('greet')
+
+                self.assertEqual(procedure, parse_source(PROGRAM)[1])
+                self.assertEqual(procedure.body[0].args, ['héllo wörld'])
+
+            with self.assertRaises(ValueError):
+                procedure.body
+
+    def test_invalid_data(self):
+        data = dumps(parse_source(PROGRAM))
+        version = struct.pack('<I', FORMAT_VERSION + 1)
+
+        for name, invalid in [
+            ('empty', b''),
+            ('magic', b'NOTLOGO\0' + data[8:]),
+            ('version', data[:8] + version + data[12:]),
+            ('schema', data[:12] + bytes(4) + data[16:]),
+            ('truncated', data[:-8]),
+        ]:
+            with self.subTest(name):
+                with self.assertRaises(ValueError):
+                    load(invalid)
+
+    def test_invalid_file_is_closed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'invalid.ast')
+
+            with open(path, 'wb') as f:
+                f.write(dumps(parse_source(PROGRAM))[:-8])
+
+            with self.assertRaisesRegex(ValueError, "Truncated"):
+                MappedProgram(path)
+
+    def test_file_object(self):
+        buffer = io.BytesIO()
+        dump(parse_arena(PROGRAM), buffer)
+
+        self.assertEqual(buffer.getvalue(), dumps(parse_source(PROGRAM)))
+
+
+if __name__ == '__main__':
+    unittest.main()
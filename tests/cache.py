@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from logo.cache import ParseCache
+from logo.parse import parse_source
+
+
+def generate_program(seed: int) -> str:
+    return "\n".join(f"X{i} = :Y * {seed} + {i}" for i in range(50))
+
+
+class ParseCacheTestSpec(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_hit_and_miss(self):
+        cache = ParseCache(self.directory.name)
+        source = generate_program(1)
+
+        self.assertEqual(cache.parse(source), parse_source(source))
+        self.assertEqual(cache.parse(source), parse_source(source))
+        self.assertEqual(ParseCache(self.directory.name).parse(source), parse_source(source))
+
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 1})
+
+    def test_grammar_version(self):
+        cache = ParseCache(self.directory.name)
+        source = generate_program(1)
+
+        cache.parse(source)
+
+        with mock.patch('logo.cache.grammar_version', return_value='changed'):
+            cache.parse(source)
+
+        self.assertEqual(cache.stats, {'hits': 0, 'misses': 2})
+
+    def test_corrupted_entry(self):
+        cache = ParseCache(self.directory.name)
+        source = generate_program(1)
+
+        cache.parse(source)
+
+        with open(os.path.join(self.directory.name, cache.key(source) + '.ast'), 'wb') as f:
+            f.write(b'corrupted')
+
+        self.assertEqual(cache.parse(source), parse_source(source))
+        self.assertEqual(cache.stats, {'hits': 0, 'misses': 2})
+
+    def entry_path(self, cache: ParseCache, seed: int) -> str:
+        return os.path.join(self.directory.name, cache.key(generate_program(seed)) + '.ast')
+
+    def test_eviction(self):
+        cache = ParseCache(self.directory.name)
+        cache.parse(generate_program(0))
+
+        entry_size = os.path.getsize(self.entry_path(cache, 0))
+        cache.clear()
+
+        cache = ParseCache(self.directory.name, max_size=entry_size * 3)
+
+        for seed in [1, 2, 3]:
+            cache.parse(generate_program(seed))
+
+        # The least recently used entry is the one with the oldest modification time
+        for seed, mtime in [(2, 1000), (1, 2000), (3, 3000)]:
+            os.utime(self.entry_path(cache, seed), (mtime, mtime))
+
+        cache.parse(generate_program(4))
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         sorted(os.path.basename(self.entry_path(cache, seed)) for seed in [1, 3, 4]))
+
+    def test_scan_only_over_the_limit(self):
+        cache = ParseCache(self.directory.name, max_size=2 ** 20)
+
+        with mock.patch('logo.cache.os.scandir', wraps=os.scandir) as scandir:
+            for seed in range(5):
+                cache.parse(generate_program(seed))
+
+        self.assertEqual(scandir.call_count, 1)
+
+        cache.max_size = 0
+
+        with mock.patch('logo.cache.os.scandir', wraps=os.scandir) as scandir:
+            cache.parse(generate_program(5))
+
+        self.assertEqual(scandir.call_count, 1)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_stale_temporary_files(self):
+        stale = os.path.join(self.directory.name, 'stale.tmp')
+        writing = os.path.join(self.directory.name, 'writing.tmp')
+
+        for path in [stale, writing]:
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+
+        os.utime(stale, (1000, 1000))
+
+        ParseCache(self.directory.name).parse(generate_program(1))
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(writing))
+
+    def test_concurrent_access(self):
+        sources = [generate_program(seed % 10) for seed in range(200)]
+
+        def parse(source):
+            return ParseCache(self.directory.name).parse(source)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            actual = list(executor.map(parse, sources))
+
+        self.assertEqual(actual, [parse_source(source) for source in sources])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+from ddt import ddt, data, unpack
+
+from logo.vm.cfg import ControlFlowGraph, build_cfg, verify_cfg, lower_cfg, dump_cfg
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label, Push, Store, Compare, Jump, JumpZ, JumpMore, Return, DefineFunction
+from logo.vm.peephole import optimize, O2
+from tests.concurrency import generate_program
+from tests.temps import generate, typed
+from tests.trace import PROGRAM
+
+# `X = 1`, then `IF ( :X > 0 ) THEN WRITE :X END`, at -O2
+DUMP = (
+    "CFG MAIN: \n"
+    "B0  <- entry\n    PUSH 1.0\n    STOR global_var_X\n    LOAD global_var_X\n    CMP 0.0\n"
+    "    JMORE :global_label_body_5\n  -> B2, B1\n"
+    "B1  <- B0\n    JP :global_label_else_body_6\n  -> B3\n"
+    "B2 :global_label_body_5  <- B0\n    LOAD global_var_X\n    PUSH 1\n    CALL WRITE\n  -> B3\n"
+    "B3 :global_label_else_body_6  <- B1, B2\n    RET\n  -> exit\n\n"
+)
+
+
+def build_main(instructions) -> ControlFlowGraph:
+    return build_cfg(DefineFunction('MAIN', instructions))
+
+
+def without_labels(instructions) -> list:
+    return typed(instruction for instruction in instructions if type(instruction) is not Label)
+
+
+@ddt
+class ControlFlowGraphTestSpec(unittest.TestCase):
+
+    @data(
+        # Straight code is a single block
+        ([Push(1), Store('x'), Return()], [[]], [[]]),
+        # Labels start blocks, jumps and RET end them
+        ([Push(1), Label('a', 3), Compare(1), JumpZ('a'), Push(2), Return()], [[], ['a'], []], [[1], [1, 2], []]),
+        # Labels in the same place name the same block
+        ([Jump('b'), Label('a', 3), Label('b', 3), Return()], [[], ['a', 'b']], [[1], []]),
+        # The block after a RET isn't run by falling through it
+        ([Return(), Push(1), Jump('a'), Label('a', 4), Return()], [[], [], ['a']], [[], [2], []]),
+    )
+    @unpack
+    def test_blocks(self, instructions, labels, successors):
+        cfg = build_main(instructions)
+        verify_cfg(cfg)
+
+        self.assertEqual([block.labels for block in cfg.blocks], labels)
+        self.assertEqual([[successor.id for successor in block.successors] for block in cfg.blocks], successors)
+
+    def test_dump(self):
+        code_gen = generate("X = 1\nIF ( :X > 0 ) THEN\n  WRITE :X\nEND")
+        cfg = build_cfg(optimize(code_gen.functions, O2)['MAIN'])
+
+        self.assertEqual(dump_cfg(cfg), DUMP)
+
+    def test_unknown_label(self):
+        with self.assertRaises(Exception):
+            build_main([Jump('a'), Return()])
+
+    @data(
+        # The block that would fall through is the last one
+        lambda cfg: cfg.blocks.pop(),
+        # A jump with the wrong number of successors
+        lambda cfg: cfg.entry.successors.pop(),
+        # A successor that isn't in the graph
+        lambda cfg: cfg.blocks.remove(cfg.blocks[2]),
+        # A jump to a block without its label
+        lambda cfg: cfg.blocks[2].labels.clear(),
+        # A label in two blocks
+        lambda cfg: cfg.blocks[1].labels.append('a'),
+        # A jump in the middle of a block
+        lambda cfg: cfg.blocks[1].instructions.append(Jump('a')),
+        # A graph without blocks, not even the entry
+        lambda cfg: cfg.blocks.clear(),
+    )
+    def test_verify(self, corrupt):
+        cfg = build_main([Compare(1), JumpMore('a'), Push(1), Label('a', 4), Return()])
+        verify_cfg(cfg)
+        corrupt(cfg)
+
+        with self.assertRaises(Exception):
+            verify_cfg(cfg)
+
+    def test_round_trip(self):
+        for source in [PROGRAM] + [generate_program(seed) for seed in range(50)]:
+            for function in generate(source).functions.values():
+                cfg = build_cfg(function)
+                verify_cfg(cfg)
+                lowered = lower_cfg(cfg)
+
+                self.assertEqual(without_labels(lowered.instructions), without_labels(function.instructions))
+                verify_cfg(build_cfg(lowered))
+
+    def test_remove_unreachable(self):
+        cfg = build_main([Jump('b'), Label('a', 3), Push(1), Label('b', 4), Return(), Push(2), Jump('a')])
+
+        self.assertEqual(cfg.remove_unreachable(), 2)
+        self.assertEqual([block.id for block in cfg.blocks], [0, 2])
+        self.assertEqual(cfg.remove_unreachable(), 0)
+        self.assertEqual(typed(lower_cfg(cfg).instructions), typed([Jump('b'), Label('b', 3), Return()]))
+
+    def test_layout(self):
+        # The entry falls through to B1 and B1 to B2, which are listed in the opposite order
+        cfg = build_main([Compare(1), JumpZ('a'), Push(1), Label('a', 4), Push(2), Return()])
+        cfg.blocks = [cfg.blocks[0], cfg.blocks[2], cfg.blocks[1]]
+        verify_cfg(cfg)
+
+        self.assertEqual(typed(lower_cfg(cfg).instructions), typed([
+            Compare(1), JumpZ('a'), Jump('MAIN_block_1'),
+            Label('a', 6), Push(2), Return(),
+            Label('MAIN_block_1', 9), Push(1), Jump('a'),
+        ]))
+
+    def test_layout_keeps_jumps(self):
+        code_gen = generate(PROGRAM)
+
+        for function in code_gen.functions.values():
+            cfg = build_cfg(function)
+            cfg.blocks = cfg.blocks[:1] + cfg.blocks[:0:-1]
+            lowered = lower_cfg(cfg)
+            labels = {instruction.name for instruction in lowered.instructions if type(instruction) is Label}
+
+            verify_cfg(build_cfg(lowered))
+            self.assertTrue(all(instruction.label in labels
+                                for instruction in lowered.instructions if type(instruction) in JUMPS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from logo.parse import parse_source
+from logo.vm.codegen import compile_source
+
+
+def generate_program(seed: int) -> str:
+    statements = [f"X{seed} = {seed}"]
+
+    for i in range(seed % 7 + 1):
+        statements.extend([
+            f"Y{i} = :X{seed} * {i} + 2 ^ 3",
+            f"IF ( :Y{i} > {i} AND :X{seed} < 10 ) THEN \n FORWARD :Y{i} \n ELSE \n RIGHT 90 \n END",
+            f"WHILE ( :Y{i} < {seed} ) \n Z = :Y{i} \n END",
+        ])
+
+    return "\n".join(statements)
+
+
+def generate_invalid_program(seed: int) -> str:
+    return "\n" * seed + "X = = 1"
+
+
+class ConcurrencyTestSpec(unittest.TestCase):
+
+    def test_parse_source(self):
+        sources = [generate_program(seed) for seed in range(50)]
+        expected = [parse_source(source) for source in sources]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            actual = list(executor.map(parse_source, sources * 5))
+
+        self.assertEqual(actual, expected * 5)
+
+    def test_compile_source(self):
+        sources = [generate_program(seed) for seed in range(50)]
+        expected = [compile_source(source) for source in sources]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            actual = list(executor.map(compile_source, sources * 5))
+
+        self.assertEqual(actual, expected * 5)
+
+    def test_error_line_numbers(self):
+        def parse_error(seed):
+            try:
+                parse_source(generate_invalid_program(seed))
+            except Exception as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            actual = list(executor.map(parse_error, list(range(50)) * 10))
+
+        self.assertEqual(actual, [f"Unexpected token:{seed + 1}: EQUAL:'='" for seed in range(50)] * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator, compile_source
+from logo.vm.emitter import Emitter, JUMPS
+from logo.vm.isa import Label, Push, Jump, Return
+from tests.concurrency import generate_program
+from tests.trace import PROGRAM
+
+# Listing of `X = 1`, then `IF ( :X > 0 OR :X == 0 ) THEN WRITE :X END`
+LISTING = (
+    "DEF MAIN: \n  PUSH 1.0\n  JP :global_label_assign_store_1\n  \n:global_label_assign_true_2\n  PUSH 1\n"
+    "  JP :global_label_assign_store_1\n\n  \n:global_label_assign_false_3\n  PUSH 0\n"
+    "  JP :global_label_assign_store_1\n\n  \n:global_label_assign_store_1\n  STOR global_var_X\n\n"
+    "  LOAD global_var_X\n  CMP 0.0\n  JMORE :global_label_body_5\n"
+    "  JP :global_label_or_false_7\n  \n:global_label_or_false_7\n  LOAD global_var_X\n"
+    "  CMP 0.0\n  JZ :global_label_body_5\n  JP :global_label_or_false_7\n\n"
+    "  \n:global_label_body_5\n  LOAD global_var_X\n  PUSH 1\n  CALL WRITE\n  JP :global_label_end_if_4\n\n"
+    "  \n:global_label_else_body_6\n\n  \n:global_label_end_if_4\n\n  RET\n\n\n"
+)
+
+# Program whose full listing, in data/baseline_listing.txt, was printed by the code generator before the emitter
+BASELINE_PROGRAM = """
+X = TRUE
+Y = :X OR :X
+IF ( :X AND :Y ) THEN
+  WHILE ( :Y OR :X )
+    Y = :X AND :Y
+  END
+END
+"""
+
+
+class EmitterTestSpec(unittest.TestCase):
+
+    def test_labels(self):
+        emitter = Emitter()
+        emitter.emit(Push(1))
+        position = emitter.open()
+        emitter.label('inner', Push(2))
+        emitter.close(position, 'outer')
+        emitter.label('empty')
+
+        self.assertEqual(emitter.instructions, [
+            Push(1), Label('outer', 4), Label('inner', 4), Push(2), Label('empty', 5),
+        ])
+
+    def test_resolve(self):
+        emitter = Emitter()
+        emitter.extend([Jump(1), Push(0), Jump('named')])
+        emitter.label(0)
+        emitter.resolve(['first', 'second'], 0, 3)
+
+        self.assertEqual(emitter.instructions, [Jump('second'), Push(0), Jump('named'), Label(0, 4)])
+
+    def test_splice(self):
+        emitter = Emitter()
+        emitter.emit(Push(1))
+        emitter.splice([Label('f', 2), Push(2), Return()])
+
+        self.assertEqual(emitter.instructions, [Push(1), Label('f', 3), Push(2), Return()])
+
+    def test_listing(self):
+        code = compile_source("X = 1\nIF ( :X > 0 OR :X == 0 ) THEN\n  WRITE :X\nEND")
+
+        self.assertEqual(code[code.index("DEF MAIN"):], LISTING)
+
+    def test_baseline_listing(self):
+        path = os.path.join(os.path.dirname(__file__), 'data', 'baseline_listing.txt')
+
+        with open(path) as f:
+            expected = f.read()
+
+        self.assertEqual(compile_source(BASELINE_PROGRAM), expected)
+
+    def test_flat_functions(self):
+        sources = [generate_program(seed) for seed in range(7)] + [PROGRAM]
+
+        for source in sources:
+            with self.subTest(source=source[:40]):
+                code_gen = CodeGenerator()
+                code_gen.visit(DeclareFunction('MAIN', None, parse_source(source)))
+
+                for function in code_gen.functions.values():
+                    instructions = function.instructions
+                    labels = {instruction.name for instruction in instructions if isinstance(instruction, Label)}
+                    ends = [len(instructions)]
+
+                    for position, instruction in enumerate(instructions):
+                        while ends[-1] == position:
+                            ends.pop()
+
+                        self.assertIsInstance(instruction, tuple)
+
+                        if isinstance(instruction, Label):
+                            self.assertIsInstance(instruction.name, str)
+                            # Labels are nested in the labels that list them
+                            self.assertLessEqual(instruction.end, ends[-1])
+                            ends.append(instruction.end)
+                        elif type(instruction) in JUMPS:
+                            self.assertIn(instruction.label, labels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+
+from ddt import ddt, data, unpack
+
+from logo.folding import parse_folded, fold_program
+from logo.lexer import TokenType
+from logo.parse import parse_source, DeclareFunction, BinaryOperation, NotOperation, Identifier
+from logo.vm.cfg import build_cfg
+from logo.vm.codegen import CodeGenerator, compile_source
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label, Call
+from logo.vm.peephole import O0, O1
+
+PROGRAM = """
+X = 1
+C = true and false
+D = 2 ^ 3 * 4
+IF ( :X > 1 AND 2 > 1 ) THEN
+  WRITE :X
+END
+WHILE ( :X < 3 AND 1 > 2 )
+  X = :X + 1
+END
+"""
+
+
+def body_loops(program) -> bool:
+    """Whether the code of the program can run its call again after running it"""
+    code_gen = CodeGenerator()
+    code_gen.visit(DeclareFunction('MAIN', None, program))
+    cfg = build_cfg(code_gen.functions['MAIN'])
+
+    body = next(block for block in cfg.blocks if any(type(instruction) is Call for instruction in block.instructions))
+    seen = set()
+    pending = list(body.successors)
+
+    while pending:
+        block = pending.pop()
+
+        if block.id not in seen:
+            seen.add(block.id)
+            pending.extend(block.successors)
+
+    return body.id in seen
+
+
+@ddt
+class FoldingTestSpec(unittest.TestCase):
+
+    @data(
+        ("X = 2 ^ 3 * 4", 32.0, 2),
+        ("X = 1 + 2 - 3 / 4", 2.25, 3),
+        ("X = 1 + 1 == 2", True, 2),
+        ("X = 1 < 2 AND 3 < 2", False, 3),
+        ("X = 1 >= 2 OR 3 <= 3", True, 3),
+        # The code of a false OR jumps back to its right operand
+        ("X = 1 > 2 OR 3 < 2",
+         BinaryOperation(TokenType.OR, BinaryOperation(TokenType.GREATER_THAN, 1.0, 2.0),
+                         BinaryOperation(TokenType.LESS_THAN, 3.0, 2.0)), 0),
+        # The code of TRUE, FALSE and NOT doesn't jump
+        ("X = TRUE AND FALSE", BinaryOperation(TokenType.AND, True, False), 0),
+        ("X = FALSE OR TRUE", BinaryOperation(TokenType.OR, False, True), 0),
+        ("X = NOT 2 > 1", NotOperation(BinaryOperation(TokenType.GREATER_THAN, 2.0, 1.0)), 0),
+        # Not a finite number
+        ("X = 1 / 0", BinaryOperation(TokenType.DIVIDE, 1.0, 0.0), 0),
+        ("X = ( 0 - 2 ) ^ 0.5", BinaryOperation(TokenType.POW, -2.0, 0.5), 1),
+        ("X = 10 ^ 400", BinaryOperation(TokenType.POW, 10.0, 400.0), 0),
+        # The code of NOT_EQUAL doesn't compare as the operator
+        ("X = 2 <> 3", BinaryOperation(TokenType.NOT_EQUAL, 2.0, 3.0), 0),
+        ("X = :Y * 2 + 1", BinaryOperation(TokenType.PLUS, BinaryOperation(TokenType.TIMES, Identifier('Y'), 2.0), 1.0), 0),
+    )
+    @unpack
+    def test_assignment(self, source, value, folded):
+        program, count = parse_folded(source)
+
+        self.assertEqual(program[0].value, value)
+        self.assertIs(type(program[0].value), type(value))
+        self.assertEqual(count, folded)
+
+    @data(
+        ("IF ( 1 + 1 == 2 ) THEN\n  WRITE 1\nEND", True, 2),
+        ("WHILE ( 3 < 2 )\n  WRITE 1\nEND", False, 1),
+        # The code of a literal TRUE condition runs the body once
+        ("WHILE ( 9 == 9 )\n  WRITE 1\nEND", BinaryOperation(TokenType.IS_EQUAL, 9.0, 9.0), 0),
+        # The literal operand of AND and OR that leaves the other one
+        ("IF ( :X > 1 AND 2 > 1 ) THEN\n  WRITE 1\nEND", BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0), 2),
+        ("IF ( TRUE AND :X > 1 ) THEN\n  WRITE 1\nEND", BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0), 1),
+        ("IF ( FALSE OR :X > 1 ) THEN\n  WRITE 1\nEND",
+         BinaryOperation(TokenType.OR, False, BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0)), 0),
+        ("IF ( :X > 1 AND TRUE ) THEN\n  WRITE 1\nEND",
+         BinaryOperation(TokenType.AND, BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0), True), 0),
+        # The comparison still jumps when the value of AND depends on it
+        ("IF ( :X > 1 AND 1 > 2 ) THEN\n  WRITE 1\nEND",
+         BinaryOperation(TokenType.AND, BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0),
+                         BinaryOperation(TokenType.GREATER_THAN, 1.0, 2.0)), 0),
+        ("IF ( TRUE AND :X ) THEN\n  WRITE 1\nEND", BinaryOperation(TokenType.AND, True, Identifier('X')), 0),
+    )
+    @unpack
+    def test_condition(self, source, condition, folded):
+        program, count = parse_folded(source)
+
+        self.assertEqual(program[0].condition, condition)
+        self.assertEqual(count, folded)
+
+    @data(
+        ("WHILE ( 9 == 9 )\n  WRITE 1\nEND", True),
+        ("WHILE ( 1 < 2 AND 2 < 3 )\n  WRITE 1\nEND", True),
+        ("X = 1\nWHILE ( TRUE AND :X > 1 )\n  WRITE 1\nEND", True),
+        ("WHILE ( TRUE )\n  WRITE 1\nEND", False),
+    )
+    @unpack
+    def test_loops(self, source, loops):
+        folded, _ = parse_folded(source)
+
+        self.assertEqual(body_loops(parse_source(source)), loops)
+        self.assertEqual(body_loops(folded), loops)
+
+    @data(
+        "X = NOT 2 > 1",
+        "X = NOT ( 1 == 2 )",
+        "X = TRUE AND FALSE",
+        "X = FALSE AND TRUE",
+        "X = TRUE OR FALSE",
+        "X = FALSE OR TRUE",
+        "X = 2 > 1 AND FALSE",
+        "X = 1 > 2 OR TRUE",
+        "IF ( FALSE OR :X > 1 ) THEN\n  WRITE 1\nEND",
+        "IF ( :X > 1 AND TRUE ) THEN\n  WRITE 1\nEND",
+        "IF ( TRUE AND :X ) THEN\n  WRITE 1\nEND",
+        "WHILE ( TRUE OR FALSE )\n  WRITE 1\nEND",
+        "WHILE ( FALSE AND TRUE )\n  WRITE 1\nEND",
+    )
+    def test_unfolded_operators(self, source):
+        # The code of TRUE, FALSE and NOT doesn't jump, so NOT and AND and OR of literals are kept as they are
+        program, count = parse_folded(source)
+
+        self.assertEqual(program, parse_source(source))
+        self.assertEqual(count, 0)
+
+    def test_invalid_conditions(self):
+        with self.assertRaises(Exception):
+            parse_folded("IF ( NOT TRUE ) THEN\n  WRITE 1\nEND")
+
+    def test_fold_program(self):
+        self.assertEqual(fold_program(parse_source(PROGRAM)), parse_folded(PROGRAM))
+
+    def test_code(self):
+        unfolded = compile_source(PROGRAM, level=O0)
+        folded = compile_source(PROGRAM, level=O1)
+
+        self.assertIn("  PUSH 32.0\n  STOR global_var_D\n", folded)
+        self.assertNotIn("POW", folded)
+        self.assertIn("POW", unfolded)
+        self.assertLess(len(folded), len(unfolded))
+
+    def test_constant_conditions(self):
+        program, _ = parse_folded("IF ( 1 < 2 ) THEN\n  WRITE 1\nELSE\n  WRITE 2\nEND\nIF ( 2 < 1 ) THEN\n  WRITE 3\nEND")
+
+        code_gen = CodeGenerator()
+        code_gen.visit(DeclareFunction('MAIN', None, program))
+        instructions = code_gen.functions['MAIN'].instructions
+
+        # Only the body of the condition is listed, without labels to jump to
+        self.assertFalse([instruction for instruction in instructions if type(instruction) in JUMPS + (Label,)])
+        self.assertEqual(len(instructions), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import random
+import unittest
+
+from logo.incremental import IncrementalParser
+from logo.nodes import AstNode
+from logo.parse import parse_source
+
+
+def generate_statement(i: int) -> str:
+    return [
+        f"TO P{i} :A :B \n X = :A * {i} + :B \n IF ( :X > 10 ) THEN \n FORWARD :X \n END \nEND\n",
+        f"P{i} 1 2\n",
+        f"Y{i} = {i} ^ 2\n",
+        f"WHILE ( :Y{i} < 2 ) \n RIGHT 90 \nEND\n",
+        f"PRINT 'text {i}' \"more\"\n",
+    ][i % 5]
+
+
+def generate_program(statements: int) -> str:
+    return "".join(generate_statement(i) for i in range(statements))
+
+
+def positions(program) -> list:
+    """Positions of the nodes of the program, as node equality ignores them"""
+    found = []
+    pending = [program]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, AstNode):
+            found.append((type(value).__name__, value.position))
+
+        if isinstance(value, (list, AstNode)):
+            pending.extend(reversed(list(value)))
+
+    return found
+
+
+def parse_or_error(source: str):
+    try:
+        return parse_source(source)
+    except Exception as e:
+        return type(e)
+
+
+class IncrementalParserTestSpec(unittest.TestCase):
+
+    def test_initial_parse(self):
+        for source in ['', '\n  \n', generate_program(1), generate_program(20)]:
+            self.assertEqual(IncrementalParser(source).program, parse_source(source) or [])
+
+    def test_edit_one_block(self):
+        source = generate_program(100)
+        parser = IncrementalParser(source)
+
+        changed = source.replace("Y52 = 52 ^ 2", "Y52 = 53 * :Y1")
+        parser.update(changed)
+
+        self.assertEqual(parser.program, parse_source(changed))
+        self.assertLessEqual(parser.reparsed_blocks, 3)
+
+    def test_merge_blocks(self):
+        source = "RR 1\nX = 2\nY = 3\n"
+        parser = IncrementalParser(source)
+
+        parser.edit(source.index("X"), source.index("2"), "")
+
+        self.assertEqual(parser.source, "RR 1\n2\nY = 3\n")
+        self.assertEqual(parser.program, parse_source(parser.source))
+
+    def test_unclosed_block(self):
+        source = generate_program(10)
+        parser = IncrementalParser(source)
+
+        changed = source.replace("WHILE ( :Y3", "IF ( :Y3 > 1 ) THEN \n WHILE ( :Y3") + "END\n"
+        parser.update(changed)
+
+        self.assertEqual(parser.program, parse_source(changed))
+
+    def test_positions(self):
+        source = "X = 1\nY = 2\nZ = 3"
+        parser = IncrementalParser(source)
+
+        self.assertEqual([statement.position for statement in parser.program], [65537, 131073, 196609])
+
+        for changed in [
+            "X = 1\nY = 2\nZ = 4",
+            "X = 1\n\nY = 2 W = 2\nZ = 3",
+            "X = 1\nW = 4\n  Y = 2\nZ = 3",
+            "X = 1\nY = 2\n\nZ = 3",
+            "Y = 2\nZ = 3",
+        ]:
+            parser.update(changed)
+
+            self.assertEqual(positions(parser.program), positions(parse_source(changed)), changed)
+
+    def test_close_quote(self):
+        source = 'X = 1\nFD "A\nY = 2\nZ = 3\n'
+        parser = IncrementalParser(source)
+
+        changed = source.replace('Z = 3', 'Z = 3 "')
+        parser.update(changed)
+
+        self.assertEqual(parser.program, parse_source(changed))
+
+    def test_illegal_characters_only(self):
+        parser = IncrementalParser('@')
+
+        self.assertEqual(parser.program, [])
+        self.assertEqual(parser.update('@\nX = 1'), parse_source('@\nX = 1'))
+        self.assertEqual(parser.update('@'), [])
+
+    def test_error_line(self):
+        source = generate_program(10)
+        parser = IncrementalParser(source)
+        changed = source.replace("Y7 = 7", "Y7 = = 7")
+
+        with self.assertRaises(Exception) as expected:
+            parse_source(changed)
+
+        with self.assertRaises(Exception) as error:
+            parser.update(changed)
+
+        self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_error_keeps_program(self):
+        source = generate_program(10)
+        parser = IncrementalParser(source)
+
+        with self.assertRaises(Exception):
+            parser.update(source.replace("Y2 = 2", "Y2 = = 2"))
+
+        self.assertEqual(parser.source, source)
+        self.assertEqual(parser.program, parse_source(source))
+
+    def test_random_edits(self):
+        rng = random.Random(42)
+        fragments = ['', 'X', ' ', '\n', ':', '1', 'END', 'END\n', 'TO Q ', 'IF ( :A ) THEN ', "'", '"', ' "', '@', 'Z = 2\n']
+        source = generate_program(30)
+        parser = IncrementalParser(source)
+
+        for _ in range(300):
+            start = rng.randrange(len(source) + 1)
+            end = min(start + rng.randrange(8), len(source))
+            edited = source[:start] + rng.choice(fragments) + source[end:]
+
+            expected = parse_or_error(edited)
+
+            try:
+                parser.update(edited)
+            except Exception:
+                self.assertIsInstance(expected, type, edited)
+                self.assertEqual(parser.source, source)
+                continue
+
+            if isinstance(expected, type):
+                self.fail(f"Expected an error parsing: {edited}")
+            else:
+                self.assertEqual(parser.program, expected or [], edited)
+                self.assertEqual(positions(parser.program), positions(expected or []), edited)
+                source = edited
+
+
+if __name__ == '__main__':
+    unittest.main()
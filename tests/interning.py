@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+from logo.interning import parse_interned, intern_program, InterningNodes
+from logo.lexer import TokenType
+from logo.parse import parse_source, DeclareFunction, BinaryOperation, Identifier
+from logo.semantic import SemanticAnalyzer
+from tests.arena import compile_program
+
+PROGRAM = """
+X = 1
+Y = 2
+A = :X * 2 + :Y
+B = :X * 2 + :Y
+IF ( :X * 2 + :Y > 1 AND TRUE ) THEN
+  C = :X * 2 + :Y
+  WHILE ( :X * 2 + :Y > 1 )
+    C = :X * 2 + :Y
+  END
+END
+WRITE 1
+"""
+
+
+class InterningTestSpec(unittest.TestCase):
+
+    def test_same_program(self):
+        expected = parse_source(PROGRAM)
+
+        self.assertEqual(parse_interned(PROGRAM), expected)
+        self.assertEqual(intern_program(expected), expected)
+
+    def test_shared_expressions(self):
+        for program in [parse_interned(PROGRAM), intern_program(parse_source(PROGRAM))]:
+            expression = program[2].value
+
+            self.assertIs(program[3].value, expression)
+            self.assertIs(program[4].condition.left.left, expression)
+            self.assertIs(program[4].body[1].body[0].value, expression)
+            self.assertIs(program[0].value, program[5].args[0])
+
+    def test_literal_types_are_kept(self):
+        program = parse_interned("A = TRUE \n B = 1 \n C = TRUE AND FALSE \n D = 1 \n WRITE 1 TRUE")
+
+        self.assertIs(program[0].value, True)
+        self.assertIsInstance(program[1].value, float)
+        self.assertIs(program[1].value, program[3].value)
+        self.assertEqual([type(arg) for arg in program[4].args], [float, bool])
+
+    def test_signed_zeros_are_kept(self):
+        program = parse_interned("X = 0 \n Y = -0 \n Z = :X + 0 \n W = :X + -0")
+
+        self.assertEqual([str(statement.value) for statement in program[:2]], ['0.0', '-0.0'])
+        self.assertEqual(str(program[3].value.right), '-0.0')
+        self.assertIsNot(program[2].value, program[3].value)
+
+    def test_statements_are_not_shared(self):
+        program = parse_interned("X = 1 \n X = 1")
+
+        self.assertIsNot(program[0], program[1])
+
+    def test_deep_expression(self):
+        size = 5000
+        condition = BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0)
+
+        for _ in range(size):
+            condition = BinaryOperation(TokenType.AND, BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), 1.0),
+                                        condition)
+
+        nodes = InterningNodes()
+        intern_program([condition], nodes)
+
+        # One comparison, its identifier and literal, and one AND per level
+        self.assertEqual(len([key for key in nodes.table if key[0] is BinaryOperation]), size + 1)
+
+    def test_compile(self):
+        self.assertEqual(compile_program(parse_interned(PROGRAM)), compile_program(parse_source(PROGRAM)))
+
+    def test_analysis_once_per_scope(self):
+        analyzer = SemanticAnalyzer()
+
+        with mock.patch.object(analyzer, '_expect_symbol_', wraps=analyzer._expect_symbol_) as expect_symbol:
+            analyzer.visit(DeclareFunction('main', None, parse_interned(PROGRAM)))
+
+        # :X and :Y are only checked in the global scope, where the first expression using them is found
+        self.assertEqual([call.args[0] for call in expect_symbol.call_args_list], ['X', 'Y', 'WRITE'])
+
+    def test_analysis_of_shared_expression_in_other_scope(self):
+        program = parse_interned("IF ( TRUE ) THEN \n Y = 1 \n X = :Y + 1 \n END \n Z = :Y + 1")
+
+        self.assertIs(program[0].body[1].value, program[1].value)
+
+        # Checked in the IF scope, where Y exists, so it must be checked again in the global scope
+        with self.assertRaises(Exception):
+            SemanticAnalyzer().visit(DeclareFunction('main', None, program))
+
+
+if __name__ == '__main__':
+    unittest.main()
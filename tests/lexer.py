@@ -0,0 +1,95 @@
+import unittest
+
+from logo.lexer import get_lexer, new_lexer
+from logo.parse import parse_source, Assignment, IfStatement, WhileStatement, DeclareFunction
+from logo.printer import print_program
+from logo.scanner import Scanner
+from logo.tokenbuffer import tokenize_to_buffer, parse_buffer
+from tests.parser import generate_statements, generate_math_expressions, generate_bool_expressions, \
+    generate_invalid_conditions
+
+
+def generate_corpus():
+    statements = generate_statements()
+
+    programs = [
+        print_program(statements),
+        print_program([Assignment('X', op) for op in generate_math_expressions()]),
+        print_program([IfStatement(op, statements, statements) for op in generate_bool_expressions()]),
+        print_program([WhileStatement(op, statements) for op in generate_invalid_conditions()]),
+        print_program([DeclareFunction('FUNC', ['A', 'B'], statements)]),
+        "x = 3-5 + -2.25 * 1.0\n\n\n y = :x <> 2 AND :x <= 1 OR :x >= 3",
+        "If ( TrUe ) tHeN \n wHiLe (false) \n END eLsE SeT_1 = 'multi \n line' END",
+        'A = "unterminated \n B = 1 \n',
+        "C = 1 # 2 \t $ \n D = 'A\"B' \n E = \"C'D\"",
+        "",
+        "\n\n\n",
+    ]
+
+    return programs
+
+
+def tokenize(lexer, source: str):
+    lexer.lineno = 1
+    lexer.input(source)
+
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+
+
+class ScannerTestSpec(unittest.TestCase):
+
+    def test_same_tokens(self):
+        for source in generate_corpus():
+            with self.subTest(source=source):
+                expected = tokenize(get_lexer().clone(), source)
+
+                actual = tokenize(Scanner(), source)
+
+                self.assertEqual(actual, expected)
+
+    def test_same_program(self):
+        for index in [0, 1, 2, 4]:
+            source = generate_corpus()[index]
+
+            self.assertEqual(parse_source(source, backend='scanner'), parse_source(source, backend='ply'))
+
+    def test_lines_in_strings(self):
+        for lexer in [get_lexer().clone(), Scanner()]:
+            tokens = tokenize(lexer, "A = 'multi \n line' \n B = 1")
+
+            self.assertEqual([line for kind, _, line, _ in tokens if kind == 'ID'], [1, 3])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            new_lexer('unknown')
+
+
+class TokenBufferTestSpec(unittest.TestCase):
+
+    def test_same_tokens(self):
+        for source in generate_corpus():
+            with self.subTest(source=source):
+                expected = tokenize(get_lexer().clone(), source)
+
+                buffer = tokenize_to_buffer(source)
+
+                self.assertEqual(len(buffer), len(expected))
+                self.assertEqual([(t.type, t.value, t.lineno, t.lexpos) for t in buffer], expected)
+
+    def test_lazy_values(self):
+        buffer = tokenize_to_buffer("X = 'AB' + 1.5")
+
+        self.assertEqual(
+            [(buffer.type(i), buffer.text(i), buffer.value(i)) for i in range(len(buffer))],
+            [('ID', 'X', 'X'), ('EQUAL', '=', '='), ('STRING', "'AB'", 'AB'), ('PLUS', '+', '+'), ('NUMBER', '1.5', 1.5)]
+        )
+
+    def test_parse_buffer(self):
+        for index in [0, 1, 2, 4]:
+            source = generate_corpus()[index]
+
+            self.assertEqual(parse_buffer(tokenize_to_buffer(source)), parse_source(source))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import io
 import os
+import pickle
 import unittest
 from itertools import combinations
 from json import JSONEncoder
@@ -8,8 +9,12 @@ from ddt import ddt, data, unpack
 from ply import yacc
 
 from logo.parse import IfStatement, parser, BinaryOperation, WhileStatement, DeclareFunction, Assignment, \
-    InvokeFunction, NotOperation, Identifier
+    InvokeFunction, NotOperation, Identifier, parse_source
+from logo.lexer import LEXER_BACKENDS
+from logo.stream import parse_stream
+from logo.tokenbuffer import tokenize_to_buffer, parse_buffer
 from logo.lexer import lexer, TokenType, COMPARISON_OPERATORS, BOOL_CONDITION_OPERATORS
+from logo.nodes import pack_position
 from logo.printer import print_program
 
 
@@ -306,6 +311,103 @@ class ParserTestSpec(unittest.TestCase):
 
         self.assertEqual(actual, expression)
 
+    def test_long_statement_list(self):
+        size = 20000
+        program = "\n".join(f"X{i} = {i}" for i in range(size))
+
+        actual = parser.parse(program, lexer=lexer)
+
+        self.assertEqual(actual, [Assignment(f"X{i}", float(i)) for i in range(size)])
+
+    def test_long_function_args(self):
+        size = 20000
+        program = "TO FUNC " + " ".join(f":A{i}" for i in range(size)) + " END \n" + \
+                  "FUNC " + " ".join(str(i) for i in range(size))
+
+        actual = parser.parse(program, lexer=lexer)
+
+        self.assertEqual(actual, [
+            DeclareFunction('FUNC', [f"A{i}" for i in range(size)], None),
+            InvokeFunction('FUNC', [float(i) for i in range(size)]),
+        ])
+
+    def test_deep_condition(self):
+        size = 5000
+        condition = " AND ".join(f":X{i} > {i}" for i in range(size))
+
+        actual = parser.parse(f"IF ( {condition} ) THEN \n END", lexer=lexer)
+
+        depth = 0
+        node = actual[0].condition
+
+        while node.op is TokenType.AND:
+            depth += 1
+            node = node.right
+
+        self.assertEqual(depth, size - 1)
+
+    def test_deep_invalid_condition(self):
+        condition = " OR ".join(f":X{i} > {i}" for i in range(5000)) + " OR :X + 1"
+
+        with self.assertRaisesRegex(Exception, "Unexpected math operator"):
+            parser.parse(f"WHILE ( {condition} ) \n END", lexer=lexer)
+
+    @data(
+        ("( :X + 1 )", Exception,
+         "Unexpected math operator in bool expression: Line BinaryOperation(op=<TokenType.PLUS: '+'>, "
+         "left=Identifier(value='X'), right=1.0)"),
+        ("( :A AND NOT ( :X * 2 ) )", Exception,
+         "Unexpected math operator in bool expression: Line BinaryOperation(op=<TokenType.TIMES: '*'>, "
+         "left=Identifier(value='X'), right=2.0)"),
+        ("( :A OR 1 > 2 AND 'x' )", Exception, "Unexpected token for boolean expression: x"),
+        ("( NOT :X )", AttributeError, "'Identifier' object has no attribute 'op'"),
+        ("( NOT TRUE )", AttributeError, "'bool' object has no attribute 'op'"),
+    )
+    @unpack
+    def test_invalid_condition_messages(self, condition, exception, message):
+        with self.assertRaises(exception) as error:
+            parse_source(f"IF {condition} THEN \n WRITE 1 \nEND")
+
+        self.assertEqual(str(error.exception), message)
+
+    def test_positions(self):
+        program = "TO FUNC :A\n  X = :A + 1\nEND\nWHILE ( NOT :X > 2 ) FUNC :X END"
+
+        parsers = {f"backend {backend}": lambda backend=backend: parse_source(program, backend) for backend in LEXER_BACKENDS}
+        parsers['stream'] = lambda: parse_stream(io.StringIO(program), chunk_size=7)
+        parsers['buffer'] = lambda: parse_buffer(tokenize_to_buffer(program))
+
+        for name, parse in parsers.items():
+            with self.subTest(name):
+                function, loop = parse()
+                assignment = function.body[0]
+                invoke = loop.body[0]
+
+                self.assertEqual((function.line, function.column), (1, 1))
+                self.assertEqual((assignment.line, assignment.column), (2, 3))
+                self.assertEqual((assignment.value.line, assignment.value.column), (2, 10))
+                self.assertEqual((assignment.value.left.line, assignment.value.left.column), (2, 7))
+                self.assertEqual((loop.line, loop.column), (4, 1))
+                self.assertEqual((loop.condition.line, loop.condition.column), (4, 9))
+                self.assertEqual((invoke.line, invoke.column), (4, 22))
+                self.assertEqual((invoke.args[0].line, invoke.args[0].column), (4, 27))
+
+    def test_position_is_ignored_by_equality(self):
+        actual = parse_source("\n\n   X = :Y")
+
+        self.assertEqual(actual, [Assignment('X', Identifier('Y'))])
+        self.assertEqual(hash(actual[0]), hash(Assignment('X', Identifier('Y'))))
+        self.assertEqual(actual[0].position, pack_position(3, 4))
+        self.assertEqual(actual[0]._replace(variable='Z').position, actual[0].position)
+
+    def test_node_pickle(self):
+        expected = parse_source("TO FUNC :A \n IF ( :A > 1 ) THEN \n X = NOT :A < 2 \n END \n END")
+
+        actual = pickle.loads(pickle.dumps(expected))
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual[0].body[0].condition.position, expected[0].body[0].condition.position)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+from ddt import ddt, data, unpack
+
+from logo.parse import parse_source, DeclareFunction
+from logo.trace import CountingTracer
+from logo.vm.codegen import CodeGenerator, compile_source
+from logo.vm.emitter import JUMPS
+from logo.vm.isa import Label, Push, Load, Store, Compare, Jump, JumpZ, JumpNZ, JumpMore, Return, DefineFunction
+from logo.vm.peephole import optimize, ProgramFacts, O0, O1, O2
+from tests.concurrency import generate_program
+from tests.temps import typed
+from tests.trace import PROGRAM
+
+# `X = 1`, then `IF ( :X > 0 ) THEN WRITE :X END`, at -O2
+LISTING = (
+    "DEF MAIN: \n  PUSH 1.0\n  STOR global_var_X\n  LOAD global_var_X\n  CMP 0.0\n  JMORE :global_label_body_5\n"
+    "  JP :global_label_else_body_6\n  \n:global_label_body_5\n  LOAD global_var_X\n  PUSH 1\n  CALL WRITE\n\n"
+    "  \n:global_label_else_body_6\n\n  RET\n\n\n"
+)
+
+
+def optimize_main(instructions, level=O2):
+    return optimize({'MAIN': DefineFunction('MAIN', instructions)}, level)['MAIN'].instructions
+
+
+@ddt
+class PeepholeTestSpec(unittest.TestCase):
+
+    @data(
+        # Unused label
+        ([Push(1), Label('a', 2), Return()], O1, [Push(1), Return()]),
+        # Jump to the next label
+        ([Jump('a'), Label('a', 3), Push(1), JumpMore('a')], O1, [Label('a', 2), Push(1), JumpMore('a')]),
+        # Jump to a label after other labels
+        ([Jump('b'), Label('a', 4), Label('b', 4), Push(1), JumpZ('a'), JumpZ('b')], O1,
+         [Label('a', 3), Label('b', 3), Push(1), JumpZ('a'), JumpZ('b')]),
+        # Unreachable code, then the jump to the next label
+        ([Jump('a'), Push(1), Push(2), Label('a', 5), JumpZ('a')], O1, [Label('a', 2), JumpZ('a')]),
+        # Jump to a jump
+        ([JumpZ('a'), Return(), Label('b', 4), Return(), Label('a', 6), Jump('b')], O1,
+         [JumpZ('a'), Return(), Label('b', 4), Return(), Label('a', 6), Jump('b')]),
+        ([JumpZ('a'), Return(), Label('b', 4), Return(), Label('a', 6), Jump('b')], O2,
+         [JumpZ('b'), Return(), Label('b', 4), Return(), Jump('b')]),
+        # Branch over a jump
+        ([JumpZ('a'), Jump('b'), Label('a', 4), Return(), Label('b', 6), Return()], O2,
+         [JumpNZ('b'), Return(), Label('b', 4), Return()]),
+        # Compare with the operand
+        ([Load('x'), Push(0.0), Store('cmp'), Compare('cmp')], O1, [Load('x'), Push(0.0), Store('cmp'), Compare('cmp')]),
+        ([Load('x'), Push(0.0), Store('cmp'), Compare('cmp')], O2, [Load('x'), Compare(0.0)]),
+        ([Push(1), Load('y'), Store('cmp'), Compare('cmp')], O2, [Push(1), Compare('y')]),
+        # The scratch variable is read elsewhere
+        ([Load('x'), Push(0.0), Store('cmp'), Compare('cmp'), Load('cmp')], O2,
+         [Load('x'), Push(0.0), Store('cmp'), Compare('cmp'), Load('cmp')]),
+        # Strings are compared through the variable
+        ([Load('x'), Push('"A"'), Store('cmp'), Compare('cmp')], O2,
+         [Load('x'), Push('"A"'), Store('cmp'), Compare('cmp')]),
+    )
+    @unpack
+    def test_rules(self, instructions, level, expected):
+        self.assertEqual(typed(optimize_main(instructions, level)), typed(expected))
+
+    def test_no_optimization(self):
+        functions = {'MAIN': DefineFunction('MAIN', [Jump('a'), Label('a', 2), Return()])}
+
+        self.assertIs(optimize(functions, O0), functions)
+
+    def test_labels_are_moved(self):
+        instructions = [Label('a', 4), Jump('b'), Push(1), Label('c', 4), Label('b', 6), Push(2), Jump('b')]
+
+        self.assertEqual(typed(optimize_main(instructions, O1)), typed([Label('b', 2), Push(2), Jump('b')]))
+
+    def test_jump_loops(self):
+        facts = ProgramFacts({'MAIN': DefineFunction('MAIN', [
+            JumpZ('a'), Label('a', 3), Jump('b'), Label('b', 5), Jump('a'), Label('c', 7), Jump('a'),
+        ])})
+
+        self.assertEqual(facts.final_target('c'), 'c')
+        self.assertEqual(facts.final_target('a'), 'a')
+
+    def test_listing(self):
+        code = compile_source("X = 1\nIF ( :X > 0 ) THEN\n  WRITE :X\nEND", level=O2)
+
+        self.assertEqual(code[code.index("DEF MAIN"):], LISTING)
+
+    def test_tracer(self):
+        tracer = CountingTracer()
+        code_gen = CodeGenerator()
+        code_gen.visit(DeclareFunction('MAIN', None, parse_source(PROGRAM)))
+
+        functions = optimize(code_gen.functions, O2, tracer)
+
+        self.assertEqual(tracer.phases['peephole'].functions, len(functions))
+        self.assertEqual(
+            tracer.phases['peephole'].instructions, sum(len(function.instructions) for function in functions.values())
+        )
+
+    def test_default_level(self):
+        self.assertEqual(compile_source(PROGRAM, level=O0), compile_source(PROGRAM))
+
+    def test_optimized_functions(self):
+        sources = [generate_program(seed) for seed in range(7)] + [PROGRAM]
+
+        for source, level in [(source, level) for source in sources for level in (O1, O2)]:
+            with self.subTest(source=source[:40], level=level):
+                code_gen = CodeGenerator()
+                code_gen.visit(DeclareFunction('MAIN', None, parse_source(source)))
+
+                functions = optimize(code_gen.functions, level)
+                lengths = [len(function.instructions) for function in code_gen.functions.values()]
+
+                for function, length in zip(functions.values(), lengths):
+                    instructions = function.instructions
+                    labels = {instruction.name for instruction in instructions if isinstance(instruction, Label)}
+                    ends = [len(instructions)]
+
+                    self.assertLessEqual(len(instructions), length)
+
+                    for position, instruction in enumerate(instructions):
+                        while ends[-1] == position:
+                            ends.pop()
+
+                        if isinstance(instruction, Label):
+                            self.assertLessEqual(instruction.end, ends[-1])
+                            ends.append(instruction.end)
+                        elif type(instruction) in JUMPS:
+                            self.assertIn(instruction.label, labels)
+
+
+if __name__ == '__main__':
+    unittest.main()
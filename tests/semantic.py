@@ -5,7 +5,7 @@ from ddt import ddt, data, unpack
 from logo.parse import IfStatement, BinaryOperation, WhileStatement, DeclareFunction, Assignment, \
     InvokeFunction, Identifier
 from logo.lexer import TokenType
-from logo.semantic import SemanticAnalyzer
+from logo.semantic import SemanticAnalyzer, ScopedSymbolTable, VariableSymbol, BUILT_IN_SCOPE
 
 
 @ddt
@@ -207,6 +207,60 @@ class SemanticTestSpec(unittest.TestCase):
         with self.assertRaises(Exception):
             analyzer.visit(expression)
 
+    def test_built_in_scope_is_shared(self):
+        global_scope = ScopedSymbolTable('global', 1)
+        scope = ScopedSymbolTable('if', 2, global_scope)
+
+        symbol, name = scope.lookup('FORWARD', current_scope_only=True)
+
+        self.assertIs(symbol, BUILT_IN_SCOPE.lookup('FORWARD'))
+        self.assertEqual(name, scope.full_name())
+        self.assertEqual(global_scope.lookup('FORWARD'), (symbol, 'global'))
+
+        with self.assertRaises(Exception):
+            BUILT_IN_SCOPE.insert(VariableSymbol('X'))
+
+        with self.assertRaises(TypeError):
+            BUILT_IN_SCOPE.symbols['X'] = VariableSymbol('X')
+
+    def test_built_in_can_be_declared(self):
+        global_scope = ScopedSymbolTable('global', 1)
+        scope = ScopedSymbolTable('if', 2, global_scope)
+        variable = VariableSymbol('XCOR')
+        global_scope.insert(variable)
+
+        self.assertIs(global_scope.lookup('XCOR')[0], variable)
+        self.assertIs(scope.lookup('XCOR')[0], BUILT_IN_SCOPE.lookup('XCOR'))
+        self.assertIsNot(ScopedSymbolTable('global', 1).lookup('XCOR')[0], variable)
+
+    def test_full_name(self):
+        scope = ScopedSymbolTable('global', 1)
+
+        for name in ['if', 'while', 'if']:
+            scope = ScopedSymbolTable(name, scope.scope_level + 1, scope)
+
+        self.assertEqual(scope.full_name(), 'global_if_while_if')
+        self.assertIs(scope.full_name(), scope.full_name())
+
+    def test_resolution_cache(self):
+        global_scope = ScopedSymbolTable('global', 1)
+        scope = ScopedSymbolTable('if', 2, global_scope)
+        nested = ScopedSymbolTable('while', 3, scope)
+        variable = VariableSymbol('X')
+        global_scope.insert(variable)
+
+        self.assertEqual(nested.lookup('X'), (variable, 'global'))
+        self.assertEqual(nested.resolve('X'), (variable, global_scope))
+
+        # Declaring the name in a scope in between must hide the cached symbol
+        shadow = VariableSymbol('X')
+        scope.insert(shadow)
+
+        self.assertEqual(nested.lookup('X'), (shadow, 'global_if'))
+        self.assertEqual(nested.lookup('Y'), None)
+        self.assertEqual(nested.resolve('Y'), (None, None))
+        self.assertEqual(nested.lookup('X', current_scope_only=True), (None, None))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import tempfile
+import unittest
+
+from ddt import ddt, data
+
+from logo.lexer import get_lexer
+from logo.parse import parse_source
+from logo.stream import StreamLexer, tokenize_file, parse_stream
+
+
+PROGRAM = """
+TO RR :AABB
+ B = :AABB ^ 2
+END
+
+RR 1234
+
+
+B = -13.5
+C = true and false
+Z = 'AB
+C'
+W = "multi
+
+line ' string"
+
+BB = :X < 2 AND :X * 2 + :Y < 4 OR :X == 1
+IF ( NOT :AB > 2 OR :B < 2 ) THEN
+  PRINT "A"
+ELSE
+  PRINT 'B'
+END
+"""
+
+
+def tokenize(source: str):
+    lexer = get_lexer().clone()
+    lexer.lineno = 1
+    lexer.input(source)
+
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+
+
+def as_tuples(tokens):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in tokens]
+
+
+@ddt
+class StreamTestSpec(unittest.TestCase):
+
+    @data(1, 2, 3, 7, 64, 1 << 16)
+    def test_text_stream(self, chunk_size):
+        actual = as_tuples(StreamLexer(io.StringIO(PROGRAM), chunk_size))
+
+        self.assertEqual(actual, tokenize(PROGRAM))
+
+    @data(1, 5, 1 << 16)
+    def test_binary_stream(self, chunk_size):
+        source = PROGRAM + "S = 'ação'\n"
+
+        actual = as_tuples(StreamLexer(io.BytesIO(source.encode()), chunk_size))
+
+        self.assertEqual(actual, tokenize(source))
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'program.logo')
+
+            with open(path, 'w') as f:
+                f.write(PROGRAM * 10)
+
+            self.assertEqual(as_tuples(tokenize_file(path, chunk_size=100)), tokenize(PROGRAM * 10))
+
+            open(path, 'w').close()
+
+            self.assertEqual(list(tokenize_file(path)), [])
+
+    def test_parse_stream(self):
+        source = "\n".join(f"X{i} = {i} * :Y" for i in range(1000))
+
+        self.assertEqual(parse_stream(io.StringIO(source), chunk_size=128), parse_source(source))
+
+
+if __name__ == '__main__':
+    unittest.main()
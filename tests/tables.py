@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+
+import logo.lexer
+import logo.parse
+from logo import tables
+from logo.lextab import _grammar_hash as lextab_hash
+from logo.parsetab import _grammar_hash as parsetab_hash
+
+
+PROGRAM = """
+TO RR :AABB
+ B = :AABB ^ 2
+END
+
+RR 1234
+C = true and false
+BB = :X < 2 AND :X * 2 + :Y < 4 OR :X == 1
+
+WHILE (TRUE OR :AB < 2)
+END
+"""
+
+
+class TablesTestSpec(unittest.TestCase):
+
+    def test_tables_up_to_date(self):
+        self.assertEqual(lextab_hash, tables.lexer_hash(logo.lexer), "Run 'python -m logo.tables'")
+        self.assertEqual(parsetab_hash, tables.parser_hash(logo.parse), "Run 'python -m logo.tables'")
+
+    def test_optimized_tables(self):
+        lexer = tables.build_lexer(logo.lexer, optimize=False)
+        parser = tables.build_parser(logo.parse, optimize=False)
+
+        optimized_lexer = tables.build_lexer(logo.lexer, optimize=True)
+        optimized_parser = tables.build_parser(logo.parse, optimize=True)
+
+        self.assertEqual(
+            parser.parse(PROGRAM, lexer=lexer),
+            optimized_parser.parse(PROGRAM, lexer=optimized_lexer)
+        )
+
+    def test_lazy_construction(self):
+        script = "import sys, logo.vm.codegen, logo.printer; print('ply.lex' in sys.modules, 'ply.yacc' in sys.modules)"
+
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+
+        self.assertEqual(output.stdout.strip(), 'False False')
+
+    def test_grammar_hash(self):
+        expected = tables.parser_hash(logo.parse)
+
+        original = logo.parse.p_assignment.__doc__
+
+        try:
+            logo.parse.p_assignment.__doc__ = """assignment : ID EQUAL math_expression"""
+
+            self.assertNotEqual(expected, tables.parser_hash(logo.parse))
+        finally:
+            logo.parse.p_assignment.__doc__ = original
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from ddt import ddt, data, unpack
+
+from logo.parse import parse_source, DeclareFunction
+from logo.vm.codegen import CodeGenerator
+from logo.vm.isa import Load, Push, Store, Compare, Add, Random, Multiply, Truncate
+from logo.vm.temps import TempAllocator
+
+
+def generate(source: str) -> CodeGenerator:
+    code_gen = CodeGenerator()
+    code_gen.visit(DeclareFunction('MAIN', None, parse_source(source)))
+
+    return code_gen
+
+
+def typed(instructions) -> list:
+    """The instructions with their types, as instructions of different types with the same fields are equal"""
+    return [(type(instruction), *instruction) for instruction in instructions]
+
+
+@ddt
+class TempAllocatorTestSpec(unittest.TestCase):
+
+    def test_slots_are_reused(self):
+        variables = {}
+        temps = TempAllocator(variables, 'global')
+
+        first = temps.acquire()
+        second = temps.acquire()
+        temps.release(first)
+
+        self.assertEqual([first, second], ['global_tmp_0', 'global_tmp_1'])
+        self.assertEqual(temps.acquire(), first)
+        self.assertEqual(variables, {'global_tmp_0': 0, 'global_tmp_1': 0})
+
+    @data(
+        (":X > 1", [Load('global_var_X'), Compare(1.0)]),
+        ("1 < :X", [Push(1.0), Compare('global_var_X')]),
+        (":X == :X + 1", [
+            Load('global_var_X'), Load('global_var_X'), Push(1.0), Add(), Store('global_tmp_0'), Compare('global_tmp_0'),
+        ]),
+        (":X == :RANDOM", [
+            Load('global_var_X'), Random(), Push(9), Multiply(), Truncate(), Store('global_tmp_0'),
+            Compare('global_tmp_0'),
+        ]),
+    )
+    @unpack
+    def test_comparison(self, condition, expected):
+        code_gen = generate(f"X = 1\nIF ( {condition} ) THEN\n  WRITE 1\nEND")
+        instructions = typed(code_gen.functions['MAIN'].instructions)
+        start = instructions.index((Store, 'global_var_X')) + 1
+
+        self.assertEqual(instructions[start:start + len(expected)], typed(expected))
+
+    def test_bounded_data(self):
+        conditions = " AND ".join(f":X + {i} > :X * {i}" for i in range(50))
+        code_gen = generate(f"X = 1\nIF ( {conditions} ) THEN\n  WRITE 1\nEND\nWHILE ( {conditions} )\n  X = :X + 1\nEND")
+
+        self.assertEqual([name for name in code_gen.variables if '_tmp_' in name], ['global_tmp_0'])
+
+    def test_program_variables_are_kept_apart(self):
+        code_gen = generate("cmp = 1\nIF ( :cmp > :cmp + 1 ) THEN\n  WRITE :cmp\nEND")
+        instructions = typed(code_gen.functions['MAIN'].instructions)
+
+        self.assertEqual(instructions.count((Store, 'global_var_cmp')), 1)
+        self.assertIn((Store, 'global_tmp_0'), instructions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from logo.parse import parse_source, DeclareFunction
+from logo.semantic import SemanticAnalyzer, NodeVisitor, ScopedSymbolTable
+from logo.trace import Tracer, CountingTracer
+from logo.vm.codegen import CodeGenerator, compile_source
+
+PROGRAM = """
+TO SQUARE :SIZE
+  I = 0
+  WHILE ( :I < 4 )
+    FORWARD :SIZE
+    I = :I + 1
+  END
+END
+
+X = 2
+IF ( :X > 1 ) THEN
+  SQUARE :X
+END
+"""
+
+
+class RecordingTracer(Tracer):
+
+    def __init__(self):
+        self.events = []
+
+    def visit(self, phase, node):
+        self.events.append(('visit', phase, type(node).__name__))
+
+    def lookup(self, scope, name, symbol):
+        self.events.append(('lookup', scope.full_name(), name, symbol is not None))
+
+    def enter_scope(self, phase, scope):
+        self.events.append(('enter', phase, scope.full_name()))
+
+    def exit_scope(self, phase, scope):
+        self.events.append(('exit', phase, scope.full_name()))
+
+    def emit(self, phase, function):
+        self.events.append(('emit', phase, function.id))
+
+
+class TraceTestSpec(unittest.TestCase):
+
+    def test_disabled(self):
+        analyzer = SemanticAnalyzer()
+
+        self.assertIsNone(analyzer.tracer)
+        self.assertEqual(type(analyzer).visit, NodeVisitor.visit)
+        self.assertNotIn('visit', vars(analyzer))
+        self.assertNotIn('lookup', vars(analyzer.current_scope))
+
+    def test_events(self):
+        tracer = RecordingTracer()
+        SemanticAnalyzer(tracer).visit(DeclareFunction('MAIN', None, parse_source(PROGRAM)))
+
+        self.assertEqual(tracer.events[0], ('visit', 'analysis', 'DeclareFunction'))
+        self.assertIn(('enter', 'analysis', 'global_MAIN_SQUARE_WHILE'), tracer.events)
+        self.assertIn(('exit', 'analysis', 'global_MAIN_SQUARE_WHILE'), tracer.events)
+        self.assertIn(('lookup', 'global_MAIN_SQUARE_WHILE', 'I', True), tracer.events)
+        self.assertIn(('lookup', 'global_MAIN_IF', 'SQUARE', True), tracer.events)
+
+    def test_nested_scopes_are_traced(self):
+        tracer = RecordingTracer()
+        scope = ScopedSymbolTable('if', 2, ScopedSymbolTable('global', 1, tracer=tracer))
+
+        scope.lookup('X')
+
+        self.assertEqual(tracer.events, [('lookup', 'global_if', 'X', False)])
+
+    def test_counters(self):
+        tracer = CountingTracer()
+        main = DeclareFunction('MAIN', None, parse_source(PROGRAM))
+
+        SemanticAnalyzer(tracer).visit(main)
+        output = compile_source(PROGRAM, tracer=tracer)
+
+        self.assertEqual(output, compile_source(PROGRAM))
+        self.assertEqual(list(tracer.phases), ['analysis', 'codegen'])
+
+        analysis, codegen = tracer.phases['analysis'], tracer.phases['codegen']
+
+        self.assertEqual(analysis.visits['DeclareFunction'], 2)
+        self.assertEqual(analysis.scopes, 5)
+        # Declarations look the name up first and don't find it
+        self.assertEqual(analysis.missing_symbols, analysis.inserts - 1)
+        self.assertGreater(analysis.lookups, analysis.missing_symbols)
+        self.assertGreater(analysis.time, 0)
+        self.assertEqual(codegen.functions, 2)
+        self.assertGreater(codegen.instructions, 0)
+        self.assertGreater(codegen.time, 0)
+        self.assertIn('codegen', str(tracer))
+
+    def test_code_generator(self):
+        tracer = RecordingTracer()
+        code_gen = CodeGenerator(tracer)
+        code_gen.visit(DeclareFunction('MAIN', None, parse_source(PROGRAM)))
+
+        self.assertEqual([event for event in tracer.events if event[0] == 'emit'],
+                         [('emit', 'codegen', 'SQUARE'), ('emit', 'codegen', 'MAIN')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from logo.lexer import TokenType
+from logo.parse import parse_source, DeclareFunction, BinaryOperation, IfStatement, WhileStatement, Assignment, \
+    InvokeFunction, Identifier
+from logo.printer import print_program
+from logo.semantic import SemanticAnalyzer
+from logo.trace import CountingTracer
+from logo.vm.codegen import CodeGenerator, print_program as print_code
+
+DEPTH = 100000
+
+
+def nested_program(depth: int) -> list:
+    """IF and WHILE statements nested `depth` times, around a chain of `depth` additions"""
+    value = Identifier('X')
+
+    for _ in range(depth):
+        value = BinaryOperation(TokenType.PLUS, value, 1.0)
+
+    body = [Assignment('Y', value)]
+
+    for level in range(depth):
+        condition = BinaryOperation(TokenType.GREATER_THAN, Identifier('X'), float(level))
+        body = [WhileStatement(condition, body) if level % 2 else IfStatement(condition, body, None)]
+
+    return [Assignment('X', 1.0)] + body
+
+
+class TraversalTestSpec(unittest.TestCase):
+
+    def test_same_output(self):
+        source = "X = 2 \n IF ( NOT :X == 3 ) THEN \n WHILE ( :X < 10 AND :X > 1 ) \n X = :X + 1 * 2 \n END \n END"
+        main = DeclareFunction('MAIN', None, parse_source(source))
+
+        code_gen = CodeGenerator()
+        code_gen.visit(main)
+
+        self.assertEqual(print_program(main.body), "X = 2.0 \nIF (NOT (:X == 3.0 ) ) THEN \n"
+                                                   "WHILE ( :X < 10.0 AND :X > 1.0  )X = :X + 1.0 * 2.0 \nEND\nEND\n")
+        self.assertIn("\n:global_label_body_while_", print_code(code_gen, 'MAIN'))
+
+    def test_deep_nesting(self):
+        program = nested_program(DEPTH)
+        main = DeclareFunction('MAIN', None, program)
+
+        SemanticAnalyzer().visit(main)
+
+        code_gen = CodeGenerator()
+        code_gen.visit(main)
+        code = print_code(code_gen, 'MAIN')
+        code = code[code.index("DEF MAIN"):]
+
+        self.assertEqual(code.count("\n:global_label_body_"), DEPTH)
+        self.assertEqual(code.count("  ADD\n"), DEPTH)
+
+        source = print_program(program)
+
+        self.assertTrue(source.startswith("X = 1.0 \nWHILE ( :X > 99999.0  )IF (:X > 99998.0 ) THEN \n"))
+        self.assertEqual(source.count("END"), DEPTH)
+        self.assertIn("Y = :X + 1.0 + 1.0 ", source)
+
+    def test_deep_error(self):
+        program = nested_program(DEPTH)
+        body = program
+
+        while not isinstance(body[0], Assignment) or body[0].variable != 'Y':
+            body = body[-1].body
+
+        body.append(InvokeFunction('MISSING', None))
+        tracer = CountingTracer()
+
+        with self.assertRaisesRegex(Exception, 'MISSING'):
+            SemanticAnalyzer(tracer).visit(DeclareFunction('MAIN', None, program))
+
+        # Every visit in progress was closed by the error
+        self.assertEqual(tracer._active_, [])
+        self.assertGreater(tracer.phases['analysis'].time, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()